@@ -8,7 +8,8 @@ from sqlalchemy import engine_from_config, pool
 # Add the backend directory to sys.path so app modules can be imported
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from app.database import Base  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import Base, engine  # noqa: E402
 from app.models import (  # noqa: E402
     Client,
     ClientUpdate,
@@ -59,13 +60,21 @@ def run_migrations_online() -> None:
     In this scenario we need to create an Engine and associate a
     connection with the context.
     """
-    configuration = config.get_section(config.config_ini_section, {})
-    configuration["sqlalchemy.url"] = get_url()
-    connectable = engine_from_config(
-        configuration,
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
+    url = get_url()
+    if url == settings.DATABASE_URL:
+        # Same database as the app: reuse its pooled engine
+        connectable = engine
+    else:
+        configuration = config.get_section(config.config_ini_section, {})
+        configuration["sqlalchemy.url"] = url
+        connectable = engine_from_config(
+            configuration,
+            prefix="sqlalchemy.",
+            poolclass=pool.QueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_pre_ping=True,
+        )
 
     with connectable.connect() as connection:
         context.configure(
@@ -0,0 +1,47 @@
+"""Add composite indexes for trust-score, inference-history and client-update lookups
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tables are created by scripts/init_db.py via metadata.create_all, which
+    # may already have built these indexes; if_not_exists keeps this idempotent.
+    op.create_index(
+        "ix_trust_scores_client_id_computed_at",
+        "trust_scores",
+        ["client_id", sa.text("computed_at DESC")],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_inference_logs_user_id_created_at",
+        "inference_logs",
+        ["user_id", sa.text("created_at DESC")],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_client_updates_round_id_client_id",
+        "client_updates",
+        ["round_id", "client_id"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_client_updates_round_id_client_id", table_name="client_updates")
+    op.drop_index("ix_inference_logs_user_id_created_at", table_name="inference_logs")
+    op.drop_index("ix_trust_scores_client_id_computed_at", table_name="trust_scores")
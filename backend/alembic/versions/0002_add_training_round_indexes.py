@@ -0,0 +1,60 @@
+"""Make round_number unique and index training-round status and history filters
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rebuild the plain round_number index as unique so report_round can
+    # upsert on it; fails loudly if duplicate round numbers already exist.
+    op.drop_index("ix_training_rounds_round_number", table_name="training_rounds", if_exists=True)
+    op.create_index(
+        "ix_training_rounds_round_number",
+        "training_rounds",
+        ["round_number"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_training_rounds_status_round_number",
+        "training_rounds",
+        ["status", "round_number"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_training_rounds_round_number_auc",
+        "training_rounds",
+        ["round_number"],
+        postgresql_where=sa.text("global_auc IS NOT NULL"),
+        sqlite_where=sa.text("global_auc IS NOT NULL"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_training_rounds_round_number_loss",
+        "training_rounds",
+        ["round_number"],
+        postgresql_where=sa.text("global_loss IS NOT NULL"),
+        sqlite_where=sa.text("global_loss IS NOT NULL"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_training_rounds_round_number_loss", table_name="training_rounds")
+    op.drop_index("ix_training_rounds_round_number_auc", table_name="training_rounds")
+    op.drop_index("ix_training_rounds_status_round_number", table_name="training_rounds")
+    op.drop_index("ix_training_rounds_round_number", table_name="training_rounds")
+    op.create_index("ix_training_rounds_round_number", "training_rounds", ["round_number"])
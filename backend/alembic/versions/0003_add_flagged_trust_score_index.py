@@ -0,0 +1,33 @@
+"""Add a partial index over flagged trust scores
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_trust_scores_flagged_client_id",
+        "trust_scores",
+        ["client_id"],
+        postgresql_where=sa.text("is_flagged = true"),
+        sqlite_where=sa.text("is_flagged = 1"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_trust_scores_flagged_client_id", table_name="trust_scores")
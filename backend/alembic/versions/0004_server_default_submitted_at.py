@@ -0,0 +1,45 @@
+"""Stamp client_updates.submitted_at on the database server
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    utcnow = (
+        "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+        if bind.dialect.name == "postgresql"
+        else "CURRENT_TIMESTAMP"
+    )
+    # batch mode lets SQLite, which cannot ALTER a column default, rebuild the table
+    with op.batch_alter_table("client_updates") as batch_op:
+        batch_op.alter_column(
+            "submitted_at",
+            existing_type=sa.DateTime(),
+            existing_nullable=False,
+            server_default=sa.text(utcnow),
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("client_updates") as batch_op:
+        batch_op.alter_column(
+            "submitted_at",
+            existing_type=sa.DateTime(),
+            existing_nullable=False,
+            server_default=None,
+        )
@@ -0,0 +1,66 @@
+import logging
+from typing import Optional
+
+from app.config import settings
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is optional
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+OVERVIEW_CACHE_KEY = "overview:v1"
+OVERVIEW_CACHE_TTL_S = 15
+
+_REDIS_CLIENT = None
+
+
+def get_redis():
+    """Return the shared Redis client, or ``None`` when caching is disabled.
+
+    Caching is enabled by setting ``REDIS_URL``; without it (or without the
+    ``redis`` package) every cache call is a no-op and callers hit the DB.
+    """
+    global _REDIS_CLIENT
+    if _REDIS_CLIENT is None and settings.REDIS_URL and redis is not None:
+        _REDIS_CLIENT = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+    return _REDIS_CLIENT
+
+
+def cache_get(key: str) -> Optional[bytes]:
+    """Return the cached value for *key*, or ``None`` on a miss or error."""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        return client.get(key)
+    except redis.RedisError as e:
+        logger.warning(f"Redis GET {key} failed: {e}")
+        return None
+
+
+def cache_set(key: str, value: str, ttl_s: int) -> None:
+    """Store *value* under *key* with a TTL, ignoring Redis errors."""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.setex(key, ttl_s, value)
+    except redis.RedisError as e:
+        logger.warning(f"Redis SETEX {key} failed: {e}")
+
+
+def cache_delete(*keys: str) -> None:
+    """Invalidate *keys*, ignoring Redis errors."""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.delete(*keys)
+    except redis.RedisError as e:
+        logger.warning(f"Redis DEL failed: {e}")
@@ -1,21 +1,95 @@
-from sqlalchemy import create_engine
+from sqlalchemy import DateTime, create_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
-from typing import Generator
+from sqlalchemy.sql.functions import FunctionElement
+from typing import AsyncGenerator, Generator
 
 from app.config import settings
 
+_IS_SQLITE = settings.DATABASE_URL.startswith("sqlite://")
+
+# The sync engine takes the bursts of concurrent NVFlare /internal posts.
+# SQLite dialects pick their own pool (aiosqlite uses NullPool), which
+# rejects these arguments.
+_POOL_ARGS = (
+    {}
+    if _IS_SQLITE
+    else {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE_S,
+    }
+)
+
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    connect_args={"check_same_thread": False} if _IS_SQLITE else {},
+    **_POOL_ARGS,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+_ASYNC_DRIVERS = {
+    "postgresql://": "postgresql+asyncpg://",
+    "sqlite://": "sqlite+aiosqlite://",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Rewrite a sync database URL to use the matching async driver."""
+    for sync_prefix, async_prefix in _ASYNC_DRIVERS.items():
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+
+# Serves the user-facing async routers; kept smaller than the sync pool so
+# both together stay within PostgreSQL's default max_connections.
+_ASYNC_POOL_ARGS = (
+    {}
+    if _IS_SQLITE
+    else {
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_recycle": settings.DB_POOL_RECYCLE_S,
+    }
+)
+
+async_engine = create_async_engine(
+    to_async_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    **_ASYNC_POOL_ARGS,
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 Base = declarative_base()
 
 
+class utcnow(FunctionElement):
+    """Database-side equivalent of ``datetime.utcnow()``.
+
+    Timestamp columns store naive UTC; plain ``now()`` would store the
+    PostgreSQL session's local time instead.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
 def get_db() -> Generator:
     """FastAPI dependency that yields a SQLAlchemy session and closes it after use."""
     db = SessionLocal()
@@ -23,3 +97,9 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency that yields an async SQLAlchemy session."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,15 +1,22 @@
+import asyncio
 import os
+from typing import Optional
 
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
+from app.cache import get_redis
 from app.config import settings
 from app.routers import auth, clients, inference, internal, metrics, training
+from app.services import heartbeat_service
 
 app = FastAPI(
     title="Federated Learning Healthcare API",
     description="Privacy-Preserving Federated Learning for Healthcare",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -39,3 +46,24 @@ def on_startup():
     """Create required directories on application startup."""
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
     os.makedirs(os.path.dirname(settings.MODEL_PATH) or "./models", exist_ok=True)
+
+
+_heartbeat_flusher: Optional[asyncio.Task] = None
+
+
+@app.on_event("startup")
+async def start_heartbeat_flusher():
+    """Start flushing Redis-buffered heartbeats when Redis is configured."""
+    global _heartbeat_flusher
+    if get_redis() is not None:
+        _heartbeat_flusher = asyncio.create_task(heartbeat_service.run_heartbeat_flusher())
+
+
+@app.on_event("shutdown")
+async def stop_heartbeat_flusher():
+    """Stop the heartbeat flusher and write out anything still buffered."""
+    global _heartbeat_flusher
+    if _heartbeat_flusher is not None:
+        _heartbeat_flusher.cancel()
+        _heartbeat_flusher = None
+        await run_in_threadpool(heartbeat_service.flush_pending_heartbeats)
@@ -16,7 +16,11 @@ class SquareActivation(nn.Module):
 
 
 def replace_relu_with_square(model: nn.Module) -> nn.Module:
-    """Recursively replace all ReLU activations in a model with SquareActivation.
+    """Replace all ReLU activations in a model with SquareActivation.
+
+    The module tree is walked iteratively and every ReLU is swapped for a
+    single shared SquareActivation instance, which is safe because the
+    activation is stateless.
 
     Args:
         model: A PyTorch module whose ReLU layers will be replaced.
@@ -24,11 +28,11 @@ def replace_relu_with_square(model: nn.Module) -> nn.Module:
     Returns:
         The modified model with SquareActivation in place of ReLU.
     """
-    for name, child in model.named_children():
-        if isinstance(child, nn.ReLU):
-            setattr(model, name, SquareActivation())
-        else:
-            replace_relu_with_square(child)
+    square = SquareActivation()
+    for parent in list(model.modules()):
+        for name, child in list(parent.named_children()):
+            if isinstance(child, nn.ReLU):
+                setattr(parent, name, square)
     return model
 
 
@@ -1,16 +1,32 @@
+import asyncio
+import copy
 import logging
 import os
-import random
-from typing import Dict, Optional
+import threading
+from typing import Dict, List, Optional
 
+import numpy as np
 import torch
-import torchvision.transforms as transforms
-from PIL import Image
+import torch.nn as nn
 
 from app.ml.densenet import get_densenet121
+from app.ml.preprocessing import load_image_tensor
+from app.ml.tensorrt_engine import TensorRTEngine
 
 logger = logging.getLogger(__name__)
 
+# Allow TF32 tensor cores for fp32 matmuls/convs on Ampere+ GPUs.
+torch.set_float32_matmul_precision("high")
+
+# Micro-batching: concurrent requests arriving within this window share one
+# forward pass, up to MAX_BATCH_SIZE images.
+MAX_BATCH_SIZE = 32
+BATCH_WINDOW_S = 0.01
+
+# Batch sizes run through a freshly compiled model. torch.compile
+# specializes size 1 separately from the dynamic batch dimension.
+_WARMUP_BATCH_SIZES = (1, MAX_BATCH_SIZE)
+
 CHESTXRAY_PATHOLOGIES = [
     "Atelectasis",
     "Cardiomegaly",
@@ -28,14 +44,19 @@ CHESTXRAY_PATHOLOGIES = [
     "Hernia",
 ]
 
-INFERENCE_TRANSFORM = transforms.Compose([
-    transforms.Resize((224, 224)),
-    transforms.ToTensor(),
-    transforms.Normalize(
-        mean=[0.485, 0.456, 0.406],
-        std=[0.229, 0.224, 0.225],
-    ),
-])
+_PATHOLOGIES_TUPLE = tuple(CHESTXRAY_PATHOLOGIES)
+_RNG = np.random.default_rng()
+
+# DenseNet-121 graph built once; each load copies it and fills in the weights.
+_MODEL_SKELETON: Optional[nn.Module] = None
+
+
+def _get_model_skeleton() -> nn.Module:
+    """Build the DenseNet-121 architecture once and reuse it as a template."""
+    global _MODEL_SKELETON
+    if _MODEL_SKELETON is None:
+        _MODEL_SKELETON = get_densenet121(num_classes=len(CHESTXRAY_PATHOLOGIES), pretrained=False)
+    return _MODEL_SKELETON
 
 
 class ModelPredictor:
@@ -60,9 +81,25 @@ class ModelPredictor:
         self._initialized = True
         self.model_path = model_path
         self.model = None
+        self._eager_model: Optional[nn.Module] = None
+        self.trt_engine: Optional[TensorRTEngine] = None
+        self._batch_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._batch_queue: Optional[asyncio.Queue] = None
+        self._batch_worker: Optional[asyncio.Task] = None
+        self._host_buf: Optional[torch.Tensor] = None
+        self._dev_buf: Optional[torch.Tensor] = None
+        self._staging_lock = threading.Lock()
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self._load_model()
 
+    def reload(self) -> None:
+        """Reload model weights from disk, reusing the cached model graph.
+
+        The new model and engine are built while the current ones keep
+        serving, then swapped in under ``_staging_lock``.
+        """
+        self._load_model()
+
     def _load_model(self) -> None:
         """Attempt to load model weights from disk."""
         if not os.path.exists(self.model_path):
@@ -70,32 +107,126 @@ class ModelPredictor:
                 f"Model file not found at {self.model_path}. "
                 "Predictions will be mocked for demo purposes."
             )
-            self.model = None
+            self._swap_model(None, None, None)
             return
 
         try:
-            self.model = get_densenet121(num_classes=len(CHESTXRAY_PATHOLOGIES), pretrained=False)
-            state_dict = torch.load(self.model_path, map_location=self.device)
-            self.model.load_state_dict(state_dict)
-            self.model.to(self.device)
-            self.model.eval()
+            # Copy the skeleton so the model being served is never mutated,
+            # and copy the weights out of the mapped file into its own tensors.
+            eager_model = copy.deepcopy(_get_model_skeleton())
+            state_dict = torch.load(
+                self.model_path, map_location=self.device, mmap=True, weights_only=True
+            )
+            eager_model.load_state_dict(state_dict)
+            del state_dict
+            eager_model.to(self.device, memory_format=torch.channels_last)
+            eager_model.eval()
+            trt_engine = TensorRTEngine.build(
+                eager_model,
+                self.model_path,
+                num_outputs=len(CHESTXRAY_PATHOLOGIES),
+                max_batch_size=MAX_BATCH_SIZE,
+            )
+            model = eager_model if trt_engine is not None else self._compile_model(eager_model)
+            self._allocate_staging_buffers()
+            self._swap_model(model, eager_model, trt_engine)
             logger.info(f"Model loaded successfully from {self.model_path}")
         except Exception as e:
             logger.error(f"Failed to load model: {e}. Falling back to mock predictions.")
-            self.model = None
+            self._swap_model(None, None, None)
+
+    def _swap_model(
+        self,
+        model: Optional[nn.Module],
+        eager_model: Optional[nn.Module],
+        trt_engine: Optional[TensorRTEngine],
+    ) -> None:
+        """Install a new model and engine between batches."""
+        with self._staging_lock:
+            self.model = model
+            self._eager_model = eager_model
+            self.trt_engine = trt_engine
+
+    def _allocate_staging_buffers(self) -> None:
+        """Allocate reusable pinned host and device input buffers on CUDA."""
+        if self.device.type != "cuda" or self._dev_buf is not None:
+            return
+        shape = (MAX_BATCH_SIZE, 3, 224, 224)
+        self._host_buf = torch.empty(shape, pin_memory=True, memory_format=torch.channels_last)
+        self._dev_buf = torch.empty(shape, device=self.device, memory_format=torch.channels_last)
+
+    def _stage_batch(self, batch: torch.Tensor) -> torch.Tensor:
+        """Move *batch* to the model device, via the staging buffers when possible.
+
+        Must be called with ``_staging_lock`` held; the buffers are reused by
+        the next batch once this one's output has been copied back.
+        """
+        if self._dev_buf is None or batch.is_cuda or batch.size(0) > MAX_BATCH_SIZE:
+            return batch.to(self.device, memory_format=torch.channels_last)
+        n = batch.size(0)
+        host = self._host_buf[:n]
+        host.copy_(batch)
+        device_batch = self._dev_buf[:n]
+        device_batch.copy_(host, non_blocking=True)
+        return device_batch
+
+    def _compile_model(self, model: torch.nn.Module) -> torch.nn.Module:
+        """Compile the model for inference and warm it up.
+
+        Tries ``torch.compile`` with a dynamic batch dimension first and
+        falls back to TorchScript. Dummy forward passes at batch sizes 1 and
+        ``MAX_BATCH_SIZE`` trigger compilation here so the first real
+        request does not pay for it. If both fail, the eager model is
+        returned.
+        """
+        compilers = (
+            ("torch.compile", lambda m: torch.compile(m, dynamic=True)),
+            ("torch.jit.script", torch.jit.script),
+        )
+        for compiler_name, compile_fn in compilers:
+            try:
+                compiled = compile_fn(model)
+                with torch.inference_mode(), self._autocast():
+                    for batch_size in _WARMUP_BATCH_SIZES:
+                        dummy = torch.zeros(batch_size, 3, 224, 224, device=self.device)
+                        compiled(dummy.contiguous(memory_format=torch.channels_last))
+                logger.info(f"Model compiled with {compiler_name}")
+                return compiled
+            except Exception as e:
+                logger.warning(f"{compiler_name} failed: {e}")
+        logger.warning("Running model in eager mode")
+        return model
+
+    def _forward(self, batch: torch.Tensor) -> torch.Tensor:
+        """Run the PyTorch model, dropping to eager mode if the compiled one fails."""
+        try:
+            return self.model(batch)
+        except Exception as e:
+            if self.model is self._eager_model:
+                raise
+            logger.warning(
+                f"Compiled model failed on a batch of {batch.size(0)}: {e}. "
+                "Running model in eager mode"
+            )
+            self.model = self._eager_model
+            return self.model(batch)
 
     def _preprocess_image(self, image_path: str) -> torch.Tensor:
         """Load and preprocess an image for inference."""
-        image = Image.open(image_path).convert("RGB")
-        tensor = INFERENCE_TRANSFORM(image)
-        return tensor.unsqueeze(0)
+        return load_image_tensor(image_path, self.device)
+
+    def _autocast(self) -> torch.autocast:
+        """Return an fp16 autocast context, enabled only on CUDA."""
+        return torch.autocast(
+            device_type=self.device.type,
+            dtype=torch.float16,
+            enabled=self.device.type == "cuda",
+        )
 
     def _mock_predictions(self) -> Dict[str, float]:
         """Generate mock predictions for demo when no model is available."""
-        predictions = {}
-        for pathology in CHESTXRAY_PATHOLOGIES:
-            predictions[pathology] = round(random.uniform(0.01, 0.95), 4)
-        return predictions
+        values = _RNG.uniform(0.01, 0.95, len(_PATHOLOGIES_TUPLE)).round(4)
+        return dict(zip(_PATHOLOGIES_TUPLE, values.tolist()))
 
     def predict(self, image_path: str) -> Dict[str, float]:
         """Run inference on a chest X-ray image.
@@ -112,19 +243,98 @@ class ModelPredictor:
 
         try:
             input_tensor = self._preprocess_image(image_path)
-            input_tensor = input_tensor.to(self.device)
+        except Exception as e:
+            logger.error(f"Preprocessing failed: {e}. Returning mock predictions.")
+            return self._mock_predictions()
+        return self.predict_batch(input_tensor)[0]
 
-            with torch.no_grad():
-                output = self.model(input_tensor)
+    def predict_batch(self, batch: torch.Tensor) -> List[Dict[str, float]]:
+        """Run a single forward pass over a batch of preprocessed images.
+
+        Args:
+            batch: Tensor of shape ``(B, 3, 224, 224)``.
+
+        Returns:
+            One pathology-to-probability dictionary per image in the batch.
+        """
+        try:
+            with self._staging_lock:
+                # Checked under the lock, since a reload may swap the model out.
+                if self.model is None:
+                    return [self._mock_predictions() for _ in range(batch.size(0))]
+                device_batch = self._stage_batch(batch)
 
-            probabilities = output.squeeze().cpu().numpy()
+                with torch.inference_mode(), self._autocast():
+                    if self.trt_engine is not None and batch.size(0) <= MAX_BATCH_SIZE:
+                        output = self.trt_engine(device_batch)
+                    else:
+                        output = self._forward(device_batch)
 
-            predictions = {}
-            for i, pathology in enumerate(CHESTXRAY_PATHOLOGIES):
-                predictions[pathology] = round(float(probabilities[i]), 4)
+                # Round on device, then transfer the batch as nested lists.
+                probabilities = output.float().round(decimals=4).tolist()
 
-            return predictions
+            return [dict(zip(_PATHOLOGIES_TUPLE, row)) for row in probabilities]
 
         except Exception as e:
             logger.error(f"Inference failed: {e}. Returning mock predictions.")
+            return [self._mock_predictions() for _ in range(batch.size(0))]
+
+    async def predict_async(self, image_path: str) -> Dict[str, float]:
+        """Run inference on a chest X-ray image, batched with concurrent calls.
+
+        Requests arriving within ``BATCH_WINDOW_S`` of each other are
+        coalesced into one forward pass of up to ``MAX_BATCH_SIZE`` images.
+
+        Args:
+            image_path: Path to the image file.
+
+        Returns:
+            Dictionary mapping pathology names to probability scores.
+        """
+        if self.model is None:
+            logger.info("Using mock predictions (no model loaded)")
             return self._mock_predictions()
+
+        loop = asyncio.get_running_loop()
+        try:
+            input_tensor = await loop.run_in_executor(None, self._preprocess_image, image_path)
+        except Exception as e:
+            logger.error(f"Preprocessing failed: {e}. Returning mock predictions.")
+            return self._mock_predictions()
+
+        future = loop.create_future()
+        await self._get_batch_queue(loop).put((input_tensor, future))
+        return await future
+
+    def _get_batch_queue(self, loop: asyncio.AbstractEventLoop) -> asyncio.Queue:
+        """Return the request queue for *loop*, starting its batch worker if needed."""
+        if self._batch_loop is not loop:
+            self._batch_loop = loop
+            self._batch_queue = asyncio.Queue()
+            self._batch_worker = loop.create_task(self._run_batch_worker(self._batch_queue))
+        return self._batch_queue
+
+    async def _run_batch_worker(self, queue: asyncio.Queue) -> None:
+        """Drain *queue* in micro-batches and resolve each request's future."""
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await queue.get()]
+            deadline = loop.time() + BATCH_WINDOW_S
+            while len(pending) < MAX_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(queue.get(), timeout=timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                batch = torch.cat([tensor for tensor, _ in pending])
+                results = await loop.run_in_executor(None, self.predict_batch, batch)
+            except Exception as e:
+                logger.error(f"Batched inference failed: {e}. Returning mock predictions.")
+                results = [self._mock_predictions() for _ in pending]
+            for (_, future), predictions in zip(pending, results):
+                if not future.done():
+                    future.set_result(predictions)
@@ -0,0 +1,90 @@
+import logging
+from functools import lru_cache
+from typing import Tuple
+
+import numba
+import numpy as np
+import torch
+import torch.nn.functional as F
+from numba import njit, prange
+from PIL import Image
+from torchvision.io import ImageReadMode, decode_jpeg, read_file
+
+logger = logging.getLogger(__name__)
+
+# Numba's TBB pool deadlocks at interpreter exit next to torch's OpenMP
+# threads; OpenMP also handles concurrent launches from executor threads.
+numba.config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
+
+IMAGE_SIZE = (224, 224)
+
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+IMAGENET_INV_STD = 1.0 / np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+JPEG_EXTENSIONS = (".jpg", ".jpeg")
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _fuse_rescale_norm(u8_hwc, out_chw, mean, inv_std):
+    """Rescale to [0, 1], normalize and transpose HWC -> CHW in one pass."""
+    height, width, channels = u8_hwc.shape
+    for y in prange(height):
+        for x in range(width):
+            for c in range(channels):
+                out_chw[c, y, x] = (u8_hwc[y, x, c] / 255.0 - mean[c]) * inv_std[c]
+
+
+def _load_image_cpu(image_path: str) -> torch.Tensor:
+    """Decode and resize with PIL, then normalize with the fused kernel."""
+    image = Image.open(image_path).convert("RGB").resize(IMAGE_SIZE, Image.BILINEAR)
+    pixels = np.asarray(image)
+    out = np.empty((3, IMAGE_SIZE[1], IMAGE_SIZE[0]), dtype=np.float32)
+    _fuse_rescale_norm(pixels, out, IMAGENET_MEAN, IMAGENET_INV_STD)
+    return torch.from_numpy(out).unsqueeze(0)
+
+
+@lru_cache(maxsize=None)
+def _normalization_tensors(device: torch.device) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Return ``(mean, inv_std)`` broadcastable tensors cached per device."""
+    mean = torch.as_tensor(IMAGENET_MEAN, device=device).view(1, 3, 1, 1)
+    inv_std = torch.as_tensor(IMAGENET_INV_STD, device=device).view(1, 3, 1, 1)
+    return mean, inv_std
+
+
+def _load_jpeg_cuda(image_path: str, device: torch.device) -> torch.Tensor:
+    """Decode a JPEG with nvJPEG and resize/normalize it on the GPU."""
+    data = read_file(image_path)
+    image = decode_jpeg(data, mode=ImageReadMode.RGB, device=device)
+    image = F.interpolate(
+        image.unsqueeze(0).float(),
+        size=(IMAGE_SIZE[1], IMAGE_SIZE[0]),
+        mode="bilinear",
+        align_corners=False,
+        antialias=True,
+    )
+    mean, inv_std = _normalization_tensors(device)
+    return (image / 255.0 - mean).mul_(inv_std)
+
+
+def load_image_tensor(image_path: str, device: torch.device) -> torch.Tensor:
+    """Load an image as a normalized ``(1, 3, 224, 224)`` tensor.
+
+    JPEGs are decoded directly on the GPU when *device* is CUDA; all other
+    inputs (and any GPU decode failure) go through PIL on the CPU.
+
+    Args:
+        image_path: Path to the image file.
+        device: Device the model runs on.
+
+    Returns:
+        An ImageNet-normalized float32 tensor in ``channels_last`` layout.
+    """
+    tensor = None
+    if device.type == "cuda" and image_path.lower().endswith(JPEG_EXTENSIONS):
+        try:
+            tensor = _load_jpeg_cuda(image_path, device)
+        except Exception as e:
+            logger.warning(f"GPU JPEG decode failed: {e}. Falling back to PIL.")
+    if tensor is None:
+        tensor = _load_image_cpu(image_path)
+    return tensor.contiguous(memory_format=torch.channels_last)
@@ -0,0 +1,151 @@
+import logging
+import os
+
+import torch
+import torch.nn as nn
+
+logger = logging.getLogger(__name__)
+
+IMAGE_SHAPE = (3, 224, 224)
+
+
+class TensorRTEngine:
+    """TensorRT engine with a dynamic batch axis, built from an exported ONNX graph.
+
+    The engine accepts any batch of 1 to ``max_batch_size`` images. It is
+    cached next to the model weights (``<model>.b<max_batch_size>.trt``)
+    and is rebuilt whenever the weights file is newer than the cached
+    engine. Input and output buffers are allocated once, at the maximum
+    batch size, and reused across calls.
+
+    TensorRT is an optional dependency; use :meth:`build` which returns
+    ``None`` when it is unavailable so callers can fall back to PyTorch.
+    """
+
+    def __init__(self, engine, num_outputs: int, max_batch_size: int):
+        self.engine = engine
+        self.context = engine.create_execution_context()
+        self.max_batch_size = max_batch_size
+        input_shape = (max_batch_size, *IMAGE_SHAPE)
+        self._host_input = torch.empty(input_shape, dtype=torch.float32).pin_memory()
+        self._device_input = torch.empty(input_shape, dtype=torch.float32, device="cuda")
+        self._device_output = torch.empty(
+            (max_batch_size, num_outputs), dtype=torch.float32, device="cuda"
+        )
+
+    @classmethod
+    def build(cls, model: nn.Module, model_path: str, num_outputs: int, max_batch_size: int):
+        """Load the cached engine for *model_path*, building it if needed.
+
+        Args:
+            model: The eager PyTorch model with weights already loaded.
+            model_path: Path to the ``.pth`` weights file.
+            num_outputs: Size of the model's output vector.
+            max_batch_size: Largest batch the engine must accept.
+
+        Returns:
+            A :class:`TensorRTEngine`, or ``None`` if TensorRT cannot be used.
+        """
+        if not torch.cuda.is_available():
+            return None
+        try:
+            import tensorrt as trt
+        except ImportError:
+            logger.info("TensorRT not installed; using PyTorch inference")
+            return None
+
+        base_path = os.path.splitext(model_path)[0]
+        onnx_path = f"{base_path}.onnx"
+        engine_path = f"{base_path}.b{max_batch_size}.trt"
+        trt_logger = trt.Logger(trt.Logger.WARNING)
+
+        try:
+            if (
+                os.path.exists(engine_path)
+                and os.path.getmtime(engine_path) >= os.path.getmtime(model_path)
+            ):
+                with open(engine_path, "rb") as f:
+                    serialized = f.read()
+                logger.info(f"Loaded cached TensorRT engine from {engine_path}")
+            else:
+                serialized = cls._build_serialized_engine(
+                    trt, trt_logger, model, onnx_path, max_batch_size
+                )
+                with open(engine_path, "wb") as f:
+                    f.write(serialized)
+                logger.info(f"TensorRT engine built and cached at {engine_path}")
+
+            engine = trt.Runtime(trt_logger).deserialize_cuda_engine(serialized)
+            if engine is None:
+                raise RuntimeError("failed to deserialize TensorRT engine")
+            return cls(engine, num_outputs, max_batch_size)
+        except Exception as e:
+            logger.error(f"TensorRT engine unavailable: {e}. Using PyTorch inference.")
+            return None
+
+    @staticmethod
+    def _build_serialized_engine(
+        trt, trt_logger, model: nn.Module, onnx_path: str, max_batch_size: int
+    ) -> bytes:
+        """Export *model* to ONNX and compile it into an FP16 TensorRT engine.
+
+        The batch axis is exported as dynamic and the engine gets a single
+        optimization profile covering batches of 1 to *max_batch_size*,
+        tuned for the full batch.
+        """
+        dummy = torch.zeros((2, *IMAGE_SHAPE), device=next(model.parameters()).device)
+        torch.onnx.export(
+            model,
+            dummy,
+            onnx_path,
+            opset_version=17,
+            input_names=["x"],
+            output_names=["y"],
+            dynamic_axes={"x": {0: "batch"}, "y": {0: "batch"}},
+        )
+
+        builder = trt.Builder(trt_logger)
+        network = builder.create_network(
+            1 << int(trt.NetworkDefinitionCreationFlag.EXPLICIT_BATCH)
+        )
+        parser = trt.OnnxParser(network, trt_logger)
+        with open(onnx_path, "rb") as f:
+            if not parser.parse(f.read()):
+                errors = [str(parser.get_error(i)) for i in range(parser.num_errors)]
+                raise RuntimeError(f"ONNX parse failed: {'; '.join(errors)}")
+
+        config = builder.create_builder_config()
+        config.set_flag(trt.BuilderFlag.FP16)
+        profile = builder.create_optimization_profile()
+        profile.set_shape(
+            "x",
+            (1, *IMAGE_SHAPE),
+            (max_batch_size, *IMAGE_SHAPE),
+            (max_batch_size, *IMAGE_SHAPE),
+        )
+        config.add_optimization_profile(profile)
+        serialized = builder.build_serialized_network(network, config)
+        if serialized is None:
+            raise RuntimeError("TensorRT engine build failed")
+        return bytes(serialized)
+
+    def __call__(self, input_tensor: torch.Tensor) -> torch.Tensor:
+        """Run the engine on a ``(B, 3, 224, 224)`` batch and return the ``(B, N)`` output."""
+        n = input_tensor.size(0)
+        if n > self.max_batch_size:
+            raise ValueError(
+                f"batch of {n} exceeds the engine's maximum of {self.max_batch_size}"
+            )
+        device_input = self._device_input[:n]
+        if input_tensor.is_cuda:
+            device_input.copy_(input_tensor)
+        else:
+            host_input = self._host_input[:n]
+            host_input.copy_(input_tensor)
+            device_input.copy_(host_input)
+        self.context.set_input_shape("x", (n, *IMAGE_SHAPE))
+        self.context.execute_v2([
+            device_input.data_ptr(),
+            self._device_output.data_ptr(),
+        ])
+        return self._device_output[:n].clone()
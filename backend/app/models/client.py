@@ -20,4 +20,10 @@ class Client(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     updates = relationship("ClientUpdate", back_populates="client")
-    trust_scores = relationship("TrustScore", back_populates="client")
+    # Ordered so an eager-loaded collection doubles as the trust timeline;
+    # load with selectinload() rather than lazily per client.
+    trust_scores = relationship(
+        "TrustScore",
+        back_populates="client",
+        order_by="TrustScore.round_id",
+    )
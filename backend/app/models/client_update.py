@@ -1,9 +1,7 @@
-from datetime import datetime
-
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class ClientUpdate(Base):
@@ -17,7 +15,11 @@ class ClientUpdate(Base):
     num_samples = Column(Integer, nullable=True)
     euclidean_distance = Column(Float, nullable=True)
     encryption_status = Column(String(50), nullable=True)
-    submitted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    submitted_at = Column(DateTime, server_default=utcnow(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_client_updates_round_id_client_id", round_id, client_id),
+    )
 
     round = relationship("TrainingRound", back_populates="updates")
     client = relationship("Client", back_populates="updates")
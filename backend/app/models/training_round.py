@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, Integer, String
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -10,7 +10,7 @@ class TrainingRound(Base):
     __tablename__ = "training_rounds"
 
     id = Column(Integer, primary_key=True, index=True)
-    round_number = Column(Integer, nullable=False, index=True)
+    round_number = Column(Integer, nullable=False, index=True, unique=True)
     job_id = Column(String(255), nullable=True)
     status = Column(String(50), default="pending", nullable=False)
     num_clients = Column(Integer, nullable=True)
@@ -19,6 +19,23 @@ class TrainingRound(Base):
     global_loss = Column(Float, nullable=True)
     global_auc = Column(Float, nullable=True)
 
+    __table_args__ = (
+        Index("ix_training_rounds_status_round_number", status, round_number),
+        # Partial indexes backing the AUC / loss history endpoints.
+        Index(
+            "ix_training_rounds_round_number_auc",
+            round_number,
+            postgresql_where=global_auc.isnot(None),
+            sqlite_where=global_auc.isnot(None),
+        ),
+        Index(
+            "ix_training_rounds_round_number_loss",
+            round_number,
+            postgresql_where=global_loss.isnot(None),
+            sqlite_where=global_loss.isnot(None),
+        ),
+    )
+
     updates = relationship("ClientUpdate", back_populates="round")
     metrics = relationship("RoundMetric", back_populates="round")
     trust_scores = relationship("TrustScore", back_populates="round")
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -17,5 +17,16 @@ class TrustScore(Base):
     is_flagged = Column(Boolean, default=False, nullable=False)
     computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        Index("ix_trust_scores_client_id_computed_at", client_id, computed_at.desc()),
+        # Keeps the overview's count(DISTINCT client_id) to flagged rows only.
+        Index(
+            "ix_trust_scores_flagged_client_id",
+            client_id,
+            postgresql_where=is_flagged == True,
+            sqlite_where=is_flagged == True,
+        ),
+    )
+
     client = relationship("Client", back_populates="trust_scores")
     round = relationship("TrainingRound", back_populates="trust_scores")
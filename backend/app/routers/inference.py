@@ -2,38 +2,44 @@ import os
 import uuid
 from typing import List
 
+import aiofiles
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db
 from app.models.inference_log import InferenceLog
 from app.models.user import User
+from app.schemas.adapters import PREDICTION_LIST_ADAPTER, dump_list
 from app.schemas.inference import PredictionResponse
 from app.services import inference_service
 from app.utils.security import get_current_user
 
 router = APIRouter(prefix="/inference", tags=["Inference"])
 
+# Uploads are copied to disk in chunks of this size to bound per-request memory.
+UPLOAD_CHUNK_SIZE = 1 << 20
+
 
 @router.post("/predict", response_model=PredictionResponse)
-def predict(
+async def predict(
     file: UploadFile,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Run inference on an uploaded chest X-ray image."""
     ext = os.path.splitext(file.filename)[1] if file.filename else ".png"
     unique_filename = f"{uuid.uuid4()}{ext}"
+    # UPLOAD_DIR is created once by main.on_startup, not per request.
     file_path = os.path.join(settings.UPLOAD_DIR, unique_filename)
 
-    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-
-    with open(file_path, "wb") as f:
-        contents = file.file.read()
-        f.write(contents)
+    async with aiofiles.open(file_path, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await f.write(chunk)
 
-    log_entry = inference_service.run_inference(
+    log_entry = await inference_service.run_inference(
         db=db,
         user=current_user,
         image_path=file_path,
@@ -44,28 +50,29 @@ def predict(
 
 
 @router.get("/history", response_model=List[PredictionResponse])
-def get_inference_history(
-    db: Session = Depends(get_db),
+async def get_inference_history(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get the inference history for the current user."""
-    logs = (
-        db.query(InferenceLog)
-        .filter(InferenceLog.user_id == current_user.id)
+    result = await db.execute(
+        select(InferenceLog)
+        .where(InferenceLog.user_id == current_user.id)
         .order_by(InferenceLog.created_at.desc())
-        .all()
     )
-    return logs
+    history = result.scalars().all()
+    return ORJSONResponse(dump_list(PREDICTION_LIST_ADAPTER, history, from_attributes=True))
 
 
 @router.get("/{inference_id}", response_model=PredictionResponse)
-def get_inference_detail(
+async def get_inference_detail(
     inference_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get a specific inference log by ID."""
-    log_entry = db.query(InferenceLog).filter(InferenceLog.id == inference_id).first()
+    result = await db.execute(select(InferenceLog).where(InferenceLog.id == inference_id))
+    log_entry = result.scalars().first()
     if not log_entry:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,14 +1,23 @@
-from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
+from sqlalchemy import func, insert, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.cache import OVERVIEW_CACHE_KEY, cache_delete, get_redis
+from app.database import get_db, utcnow
 from app.models.client import Client
 from app.models.client_update import ClientUpdate
 from app.models.training_round import TrainingRound
+from app.services.heartbeat_service import (
+    buffer_heartbeat,
+    heartbeat_timestamp,
+    is_duplicate_heartbeat,
+    lookup_client_pk,
+)
 
 router = APIRouter(prefix="/internal", tags=["Internal"])
 
@@ -25,6 +34,8 @@ class RoundReport(BaseModel):
 class ClientUpdateReport(BaseModel):
     round_number: int
     client_id: str
+    # Primary key of the round; when given it is used instead of round_number.
+    round_id: Optional[int] = None
     local_loss: Optional[float] = None
     local_auc: Optional[float] = None
     num_samples: Optional[int] = None
@@ -37,50 +48,47 @@ class HeartbeatReport(BaseModel):
     status: str
 
 
+def _upsert_insert(db: Session):
+    """Return the dialect's ``insert`` construct supporting ON CONFLICT."""
+    return sqlite_insert if db.get_bind().dialect.name == "sqlite" else pg_insert
+
+
 @router.post("/round")
 def report_round(
     report: RoundReport,
     db: Session = Depends(get_db),
 ):
     """Upsert a training round report from NVFlare."""
-    training_round = (
-        db.query(TrainingRound)
-        .filter(TrainingRound.round_number == report.round_number)
-        .first()
+    stmt = _upsert_insert(db)(TrainingRound).values(
+        round_number=report.round_number,
+        job_id=report.job_id,
+        status=report.status,
+        num_clients=report.num_clients,
+        global_loss=report.global_loss,
+        global_auc=report.global_auc,
+        started_at=utcnow() if report.status == "in_progress" else None,
+        completed_at=utcnow() if report.status == "completed" else None,
     )
+    # On conflict keep existing values for omitted fields and only stamp
+    # started_at / completed_at the first time the round reaches that state.
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TrainingRound.round_number],
+        set_={
+            "status": excluded.status,
+            "job_id": func.coalesce(excluded.job_id, TrainingRound.job_id),
+            "num_clients": func.coalesce(excluded.num_clients, TrainingRound.num_clients),
+            "global_loss": func.coalesce(excluded.global_loss, TrainingRound.global_loss),
+            "global_auc": func.coalesce(excluded.global_auc, TrainingRound.global_auc),
+            "started_at": func.coalesce(TrainingRound.started_at, excluded.started_at),
+            "completed_at": func.coalesce(TrainingRound.completed_at, excluded.completed_at),
+        },
+    ).returning(TrainingRound.id)
 
-    if training_round:
-        training_round.status = report.status
-        if report.job_id is not None:
-            training_round.job_id = report.job_id
-        if report.num_clients is not None:
-            training_round.num_clients = report.num_clients
-        if report.global_loss is not None:
-            training_round.global_loss = report.global_loss
-        if report.global_auc is not None:
-            training_round.global_auc = report.global_auc
-        if report.status == "in_progress" and training_round.started_at is None:
-            training_round.started_at = datetime.utcnow()
-        if report.status == "completed" and training_round.completed_at is None:
-            training_round.completed_at = datetime.utcnow()
-    else:
-        training_round = TrainingRound(
-            round_number=report.round_number,
-            job_id=report.job_id,
-            status=report.status,
-            num_clients=report.num_clients,
-            global_loss=report.global_loss,
-            global_auc=report.global_auc,
-        )
-        if report.status == "in_progress":
-            training_round.started_at = datetime.utcnow()
-        if report.status == "completed":
-            training_round.completed_at = datetime.utcnow()
-        db.add(training_round)
-
+    round_id = db.execute(stmt).scalar_one()
     db.commit()
-    db.refresh(training_round)
-    return {"status": "ok", "round_id": training_round.id}
+    cache_delete(OVERVIEW_CACHE_KEY)
+    return {"status": "ok", "round_id": round_id}
 
 
 @router.post("/client-update")
@@ -89,41 +97,134 @@ def report_client_update(
     db: Session = Depends(get_db),
 ):
     """Record a client update for a training round from NVFlare."""
-    training_round = (
-        db.query(TrainingRound)
-        .filter(TrainingRound.round_number == report.round_number)
-        .first()
+    if report.round_id is not None:
+        round_filter = TrainingRound.id == report.round_id
+    else:
+        round_filter = TrainingRound.round_number == report.round_number
+
+    # INSERT ... SELECT resolves the round and client in the same statement;
+    # no row comes back when either of them does not exist.
+    source = (
+        select(
+            TrainingRound.id,
+            Client.id,
+            literal(report.local_loss, ClientUpdate.local_loss.type),
+            literal(report.local_auc, ClientUpdate.local_auc.type),
+            literal(report.num_samples, ClientUpdate.num_samples.type),
+            literal(report.euclidean_distance, ClientUpdate.euclidean_distance.type),
+            literal(report.encryption_status, ClientUpdate.encryption_status.type),
+        )
+        .select_from(TrainingRound)
+        .join(Client, Client.client_id == report.client_id)
+        .where(round_filter)
+    )
+    stmt = (
+        insert(ClientUpdate)
+        .from_select(
+            [
+                ClientUpdate.round_id,
+                ClientUpdate.client_id,
+                ClientUpdate.local_loss,
+                ClientUpdate.local_auc,
+                ClientUpdate.num_samples,
+                ClientUpdate.euclidean_distance,
+                ClientUpdate.encryption_status,
+            ],
+            source,
+        )
+        .returning(ClientUpdate.id)
     )
-    if not training_round:
+    update_id = db.execute(stmt).scalar_one_or_none()
+
+    if update_id is None:
+        db.rollback()
+        round_exists = db.query(db.query(TrainingRound).filter(round_filter).exists()).scalar()
+        if not round_exists:
+            round_ref = report.round_id if report.round_id is not None else report.round_number
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Training round {round_ref} not found",
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Training round {report.round_number} not found",
+            detail=f"Client with client_id '{report.client_id}' not found",
         )
 
-    client = (
-        db.query(Client)
-        .filter(Client.client_id == report.client_id)
-        .first()
+    db.commit()
+    cache_delete(OVERVIEW_CACHE_KEY)
+    return {"status": "ok", "update_id": update_id}
+
+
+@router.post("/client-updates:batch")
+def report_client_updates_batch(
+    reports: List[ClientUpdateReport],
+    db: Session = Depends(get_db),
+):
+    """Record a batch of client updates from NVFlare in a single transaction."""
+    if not reports:
+        return {"status": "ok", "inserted": 0}
+
+    # Same rule as report_client_update: round_id, when given, wins over
+    # round_number. Both kinds are resolved in one query.
+    round_numbers = {r.round_number for r in reports if r.round_id is None}
+    given_round_ids = {r.round_id for r in reports if r.round_id is not None}
+    found_rounds = (
+        db.query(TrainingRound.round_number, TrainingRound.id)
+        .filter(
+            or_(
+                TrainingRound.round_number.in_(round_numbers),
+                TrainingRound.id.in_(given_round_ids),
+            )
+        )
+        .all()
+    )
+    round_ids = dict(found_rounds)
+    missing_rounds = (round_numbers - round_ids.keys()) | (
+        given_round_ids - {round_id for _, round_id in found_rounds}
     )
-    if not client:
+    if missing_rounds:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Client with client_id '{report.client_id}' not found",
+            detail=f"Training rounds {sorted(missing_rounds)} not found",
         )
 
-    client_update = ClientUpdate(
-        round_id=training_round.id,
-        client_id=client.id,
-        local_loss=report.local_loss,
-        local_auc=report.local_auc,
-        num_samples=report.num_samples,
-        euclidean_distance=report.euclidean_distance,
-        encryption_status=report.encryption_status,
+    client_names = {r.client_id for r in reports}
+    client_ids = dict(
+        db.query(Client.client_id, Client.id)
+        .filter(Client.client_id.in_(client_names))
+        .all()
     )
-    db.add(client_update)
+    missing_clients = client_names - client_ids.keys()
+    if missing_clients:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Clients with client_id {sorted(missing_clients)} not found",
+        )
+
+    rows = [
+        {
+            "round_id": r.round_id if r.round_id is not None else round_ids[r.round_number],
+            "client_id": client_ids[r.client_id],
+            "local_loss": r.local_loss,
+            "local_auc": r.local_auc,
+            "num_samples": r.num_samples,
+            "euclidean_distance": r.euclidean_distance,
+            "encryption_status": r.encryption_status,
+        }
+        for r in reports
+    ]
+    db.execute(insert(ClientUpdate), rows)
     db.commit()
-    db.refresh(client_update)
-    return {"status": "ok", "update_id": client_update.id}
+    cache_delete(OVERVIEW_CACHE_KEY)
+    return {"status": "ok", "inserted": len(rows)}
+
+
+def _client_not_found(client_id: str) -> HTTPException:
+    """Return the 404 raised for a heartbeat from an unregistered client."""
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Client with client_id '{client_id}' not found",
+    )
 
 
 @router.post("/heartbeat")
@@ -131,20 +232,31 @@ def report_heartbeat(
     report: HeartbeatReport,
     db: Session = Depends(get_db),
 ):
-    """Update client heartbeat and status from NVFlare."""
-    client = (
-        db.query(Client)
-        .filter(Client.client_id == report.client_id)
-        .first()
-    )
-    if not client:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Client with client_id '{report.client_id}' not found",
-        )
+    """Update client heartbeat and status from NVFlare.
+
+    With Redis configured the client is looked up through a short-lived
+    cache and the heartbeat is buffered and flushed to the DB every few
+    seconds; repeats of the same status within a few seconds are dropped.
+    Unknown clients get a 404 on every path.
+    """
+    if get_redis() is not None:
+        client_pk = lookup_client_pk(db, report.client_id)
+        if client_pk is None:
+            raise _client_not_found(report.client_id)
+        if is_duplicate_heartbeat(report.client_id, report.status):
+            return {"status": "ok", "client_id": client_pk, "cached": True}
+        if buffer_heartbeat(report.client_id, report.status, heartbeat_timestamp()):
+            return {"status": "ok", "client_id": client_pk}
+
+    client_pk = db.execute(
+        update(Client)
+        .where(Client.client_id == report.client_id)
+        .values(last_heartbeat=utcnow(), status=report.status)
+        .returning(Client.id)
+    ).scalar_one_or_none()
+    if client_pk is None:
+        raise _client_not_found(report.client_id)
 
-    client.last_heartbeat = datetime.utcnow()
-    client.status = report.status
     db.commit()
-    db.refresh(client)
-    return {"status": "ok", "client_id": client.id}
+    return {"status": "ok", "client_id": client_pk}
+
@@ -1,6 +1,8 @@
+import hashlib
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -19,6 +21,86 @@ from app.utils.security import get_current_user
 
 router = APIRouter(prefix="/metrics", tags=["Metrics"])
 
+HISTORY_DEFAULT_LIMIT = 500
+HISTORY_MAX_LIMIT = 5000
+
+
+def _history_etag(column):
+    """Build a dependency that answers unchanged history requests with 304.
+
+    The ETag is derived from the highest round, row count and latest
+    completion time among rounds where *column* is set, which changes
+    whenever a new point is added to that series.
+    """
+
+    def check_etag(
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_db),
+    ) -> None:
+        max_round, count, last_completed = (
+            db.query(
+                func.max(TrainingRound.round_number),
+                func.count(TrainingRound.id),
+                func.max(TrainingRound.completed_at),
+            )
+            .filter(column.isnot(None))
+            .one()
+        )
+        digest = hashlib.sha1(
+            f"{column.name}:{max_round}:{count}:{last_completed}".encode()
+        ).hexdigest()
+        etag = f'"{digest}"'
+
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag},
+            )
+        response.headers["ETag"] = etag
+
+    return check_etag
+
+
+def _history_rows(db: Session, column, skip: int, limit: int, downsample: bool):
+    """Return ``(round_number, value)`` rows for a per-round metric column.
+
+    Rounds without a value are skipped. With *downsample*, ``skip`` is
+    ignored and at most *limit* evenly spaced points spanning the whole
+    history are returned; every ``ceil(total / limit)``-th row is kept.
+    """
+    if not downsample:
+        return (
+            db.query(TrainingRound.round_number, column)
+            .filter(column.isnot(None))
+            .order_by(TrainingRound.round_number)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    numbered = (
+        select(
+            TrainingRound.round_number,
+            column.label("value"),
+            func.row_number().over(order_by=TrainingRound.round_number).label("rn"),
+            func.count().over().label("total"),
+        )
+        .where(column.isnot(None))
+        .cte("numbered")
+    )
+    step = case(
+        (numbered.c.total > limit, (numbered.c.total + limit - 1) // limit),
+        else_=1,
+    )
+    return db.execute(
+        select(numbered.c.round_number, numbered.c.value)
+        .where((numbered.c.rn - 1) % step == 0)
+        .order_by(numbered.c.round_number)
+        .limit(limit)
+    ).all()
+
 
 @router.get("/overview", response_model=OverviewResponse)
 def get_overview(
@@ -31,37 +113,35 @@ def get_overview(
 
 @router.get("/auc-history", response_model=List[AUCHistoryItem])
 def get_auc_history(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(HISTORY_DEFAULT_LIMIT, ge=1, le=HISTORY_MAX_LIMIT),
+    downsample: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    _: None = Depends(_history_etag(TrainingRound.global_auc)),
 ):
-    """Get AUC history across all training rounds."""
-    rounds = (
-        db.query(TrainingRound)
-        .filter(TrainingRound.global_auc.isnot(None))
-        .order_by(TrainingRound.round_number)
-        .all()
-    )
+    """Get AUC history across training rounds, paginated or downsampled."""
+    rows = _history_rows(db, TrainingRound.global_auc, skip, limit, downsample)
     return [
-        AUCHistoryItem(round_number=r.round_number, global_auc=r.global_auc)
-        for r in rounds
+        AUCHistoryItem(round_number=round_number, global_auc=global_auc)
+        for round_number, global_auc in rows
     ]
 
 
 @router.get("/loss-history", response_model=List[LossHistoryItem])
 def get_loss_history(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(HISTORY_DEFAULT_LIMIT, ge=1, le=HISTORY_MAX_LIMIT),
+    downsample: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    _: None = Depends(_history_etag(TrainingRound.global_loss)),
 ):
-    """Get loss history across all training rounds."""
-    rounds = (
-        db.query(TrainingRound)
-        .filter(TrainingRound.global_loss.isnot(None))
-        .order_by(TrainingRound.round_number)
-        .all()
-    )
+    """Get loss history across training rounds, paginated or downsampled."""
+    rows = _history_rows(db, TrainingRound.global_loss, skip, limit, downsample)
     return [
-        LossHistoryItem(round_number=r.round_number, global_loss=r.global_loss)
-        for r in rounds
+        LossHistoryItem(round_number=round_number, global_loss=global_loss)
+        for round_number, global_loss in rows
     ]
 
 
@@ -96,14 +176,18 @@ def get_aggregation_stats(
     ]
 
 
+# Static values, serialized once at import instead of on every request.
+_PRIVACY_JSON = PrivacyMetricsResponse(
+    encryption_coverage_pct=50.0,
+    dp_epsilon=1.0,
+    dp_delta=1e-5,
+    avg_noise_magnitude=0.01,
+).model_dump_json().encode()
+
+
 @router.get("/privacy", response_model=PrivacyMetricsResponse)
 def get_privacy_metrics(
     current_user: User = Depends(get_current_user),
 ):
     """Get privacy-related metrics for the federated learning system."""
-    return PrivacyMetricsResponse(
-        encryption_coverage_pct=50.0,
-        dp_epsilon=1.0,
-        dp_delta=1e-5,
-        avg_noise_magnitude=0.01,
-    )
+    return Response(content=_PRIVACY_JSON, media_type="application/json")
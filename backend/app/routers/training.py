@@ -1,22 +1,50 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from app.database import get_db
 from app.models.client_update import ClientUpdate
-from app.models.round_metric import RoundMetric
 from app.models.training_round import TrainingRound
 from app.models.user import User
+from app.schemas.adapters import ROUND_LIST_ADAPTER, dump_list
 from app.schemas.training import (
     ClientUpdateResponse,
     RoundDetailResponse,
     TrainingRoundResponse,
 )
 from app.utils.security import get_current_user
+from app.utils.streaming import stream_json_array
 
 router = APIRouter(prefix="/training", tags=["Training"])
 
+# Columns needed by the response schemas, so listings skip ORM hydration.
+_ROUND_COLUMNS = (
+    TrainingRound.id,
+    TrainingRound.round_number,
+    TrainingRound.job_id,
+    TrainingRound.status,
+    TrainingRound.num_clients,
+    TrainingRound.started_at,
+    TrainingRound.completed_at,
+    TrainingRound.global_loss,
+    TrainingRound.global_auc,
+)
+
+_UPDATE_COLUMNS = (
+    ClientUpdate.id,
+    ClientUpdate.round_id,
+    ClientUpdate.client_id,
+    ClientUpdate.local_loss,
+    ClientUpdate.local_auc,
+    ClientUpdate.num_samples,
+    ClientUpdate.euclidean_distance,
+    ClientUpdate.encryption_status,
+    ClientUpdate.submitted_at,
+)
+
 
 @router.get("/rounds", response_model=List[TrainingRoundResponse])
 def list_rounds(
@@ -27,13 +55,13 @@ def list_rounds(
 ):
     """List all training rounds with pagination."""
     rounds = (
-        db.query(TrainingRound)
+        db.query(*_ROUND_COLUMNS)
         .order_by(TrainingRound.round_number.desc())
         .offset(skip)
         .limit(limit)
         .all()
     )
-    return rounds
+    return ORJSONResponse(dump_list(ROUND_LIST_ADAPTER, rounds, from_attributes=True))
 
 
 @router.get("/rounds/current", response_model=TrainingRoundResponse)
@@ -63,25 +91,20 @@ def get_round_detail(
     current_user: User = Depends(get_current_user),
 ):
     """Get detailed information about a specific training round."""
-    training_round = db.query(TrainingRound).filter(TrainingRound.id == round_id).first()
+    # Metrics are joined (one row per round); updates come from a single
+    # IN query so the round is never multiplied by its update count.
+    training_round = (
+        db.query(TrainingRound)
+        .options(joinedload(TrainingRound.metrics), selectinload(TrainingRound.updates))
+        .filter(TrainingRound.id == round_id)
+        .first()
+    )
     if not training_round:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Training round not found",
         )
 
-    updates = (
-        db.query(ClientUpdate)
-        .filter(ClientUpdate.round_id == round_id)
-        .all()
-    )
-
-    metric = (
-        db.query(RoundMetric)
-        .filter(RoundMetric.round_id == round_id)
-        .first()
-    )
-
     return RoundDetailResponse(
         id=training_round.id,
         round_number=training_round.round_number,
@@ -92,8 +115,8 @@ def get_round_detail(
         completed_at=training_round.completed_at,
         global_loss=training_round.global_loss,
         global_auc=training_round.global_auc,
-        updates=updates,
-        metric=metric,
+        updates=training_round.updates,
+        metric=training_round.metrics[0] if training_round.metrics else None,
     )
 
 
@@ -103,17 +126,19 @@ def get_round_updates(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get all client updates for a specific training round."""
-    training_round = db.query(TrainingRound).filter(TrainingRound.id == round_id).first()
-    if not training_round:
+    """Get all client updates for a specific training round, streamed in batches."""
+    round_exists = db.query(
+        db.query(TrainingRound).filter(TrainingRound.id == round_id).exists()
+    ).scalar()
+    if not round_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Training round not found",
         )
 
-    updates = (
-        db.query(ClientUpdate)
-        .filter(ClientUpdate.round_id == round_id)
-        .all()
+    stmt = (
+        select(*_UPDATE_COLUMNS)
+        .where(ClientUpdate.round_id == round_id)
+        .order_by(ClientUpdate.id)
     )
-    return updates
+    return stream_json_array(db.get_bind(), stmt)
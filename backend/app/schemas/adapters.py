@@ -0,0 +1,20 @@
+from typing import Any, List
+
+from pydantic import TypeAdapter
+
+from app.schemas.client import ClientWithTrust
+from app.schemas.inference import PredictionResponse
+from app.schemas.training import TrainingRoundResponse
+
+# List validators built once at import time. Routers validate a whole
+# result in one pydantic-core call and return it as an ORJSONResponse,
+# bypassing FastAPI's per-item response_model validation.
+CLIENT_LIST_ADAPTER = TypeAdapter(List[ClientWithTrust])
+PREDICTION_LIST_ADAPTER = TypeAdapter(List[PredictionResponse])
+ROUND_LIST_ADAPTER = TypeAdapter(List[TrainingRoundResponse])
+
+
+def dump_list(adapter: TypeAdapter, items: Any, from_attributes: bool = False) -> List[dict]:
+    """Validate *items* with *adapter* and dump them as JSON-ready dicts."""
+    validated = adapter.validate_python(items, from_attributes=from_attributes)
+    return adapter.dump_python(validated, mode="json")
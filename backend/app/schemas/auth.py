@@ -24,7 +24,7 @@ class UserResponse(BaseModel):
     created_at: datetime
     is_active: bool
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True}
 
 
 class Token(BaseModel):
@@ -14,7 +14,7 @@ class ClientResponse(BaseModel):
     last_heartbeat: Optional[datetime] = None
     created_at: datetime
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True}
 
 
 class ClientStatusUpdate(BaseModel):
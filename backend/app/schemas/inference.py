@@ -14,7 +14,7 @@ class PredictionResponse(BaseModel):
     model_version: Optional[str] = None
     created_at: datetime
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True}
 
 
 class InferenceHistoryResponse(BaseModel):
@@ -11,16 +11,22 @@ class OverviewResponse(BaseModel):
     flagged_clients: int
     current_round_status: Optional[str] = None
 
+    model_config = {"frozen": True}
+
 
 class AUCHistoryItem(BaseModel):
     round_number: int
     global_auc: Optional[float] = None
 
+    model_config = {"frozen": True}
+
 
 class LossHistoryItem(BaseModel):
     round_number: int
     global_loss: Optional[float] = None
 
+    model_config = {"frozen": True}
+
 
 class AggregationStatsResponse(BaseModel):
     round_number: int
@@ -29,6 +35,8 @@ class AggregationStatsResponse(BaseModel):
     aggregation_time_ms: Optional[int] = None
     encryption_overhead_ms: Optional[int] = None
 
+    model_config = {"frozen": True}
+
 
 class RoundMetricResponse(BaseModel):
     id: int
@@ -41,7 +49,7 @@ class RoundMetricResponse(BaseModel):
     poisoned_clients_detected: int
     created_at: datetime
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True}
 
 
 class PrivacyMetricsResponse(BaseModel):
@@ -49,3 +57,5 @@ class PrivacyMetricsResponse(BaseModel):
     dp_epsilon: float
     dp_delta: float
     avg_noise_magnitude: float
+
+    model_config = {"frozen": True}
@@ -17,7 +17,7 @@ class TrainingRoundResponse(BaseModel):
     global_loss: Optional[float] = None
     global_auc: Optional[float] = None
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True}
 
 
 class ClientUpdateResponse(BaseModel):
@@ -31,7 +31,7 @@ class ClientUpdateResponse(BaseModel):
     encryption_status: Optional[str] = None
     submitted_at: datetime
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True}
 
 
 class RoundDetailResponse(BaseModel):
@@ -47,4 +47,4 @@ class RoundDetailResponse(BaseModel):
     updates: List[ClientUpdateResponse] = []
     metric: Optional[RoundMetricResponse] = None
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True}
@@ -1,79 +1,60 @@
-from typing import List, Optional
+from typing import List
 
-from sqlalchemy import desc, func
+from sqlalchemy import desc, distinct, func, select
 from sqlalchemy.orm import Session
 
+from app.cache import OVERVIEW_CACHE_KEY, OVERVIEW_CACHE_TTL_S, cache_get, cache_set
 from app.models.client import Client
 from app.models.round_metric import RoundMetric
 from app.models.training_round import TrainingRound
 from app.models.trust_score import TrustScore
-from app.schemas.metrics import (
-    AggregationStatsResponse,
-    AUCHistoryItem,
-    LossHistoryItem,
-    OverviewResponse,
-)
+from app.schemas.metrics import AggregationStatsResponse, OverviewResponse
 
 
 def get_overview(db: Session) -> OverviewResponse:
-    """Get dashboard overview metrics."""
-    total_rounds = db.query(TrainingRound).count()
-
-    active_clients = db.query(Client).filter(Client.status == "online").count()
-
-    latest_round = (
-        db.query(TrainingRound)
-        .filter(TrainingRound.global_auc.isnot(None))
-        .order_by(desc(TrainingRound.round_number))
-        .first()
-    )
-    latest_auc = latest_round.global_auc if latest_round else None
-
-    flagged_clients = db.query(TrustScore).filter(TrustScore.is_flagged == True).distinct(TrustScore.client_id).count()
-
-    current_round = (
-        db.query(TrainingRound)
-        .filter(TrainingRound.status.in_(["in_progress", "aggregating", "pending"]))
-        .order_by(desc(TrainingRound.round_number))
-        .first()
-    )
-    current_round_status = current_round.status if current_round else None
-
-    return OverviewResponse(
-        total_rounds=total_rounds,
-        active_clients=active_clients,
-        latest_auc=latest_auc,
-        flagged_clients=flagged_clients,
-        current_round_status=current_round_status,
-    )
-
-
-def get_auc_history(db: Session) -> List[AUCHistoryItem]:
-    """Get AUC history across all completed rounds."""
-    rounds = (
-        db.query(TrainingRound)
-        .filter(TrainingRound.global_auc.isnot(None))
-        .order_by(TrainingRound.round_number)
-        .all()
-    )
-    return [
-        AUCHistoryItem(round_number=r.round_number, global_auc=r.global_auc)
-        for r in rounds
-    ]
-
-
-def get_loss_history(db: Session) -> List[LossHistoryItem]:
-    """Get loss history across all completed rounds."""
-    rounds = (
-        db.query(TrainingRound)
-        .filter(TrainingRound.global_loss.isnot(None))
-        .order_by(TrainingRound.round_number)
-        .all()
+    """Get dashboard overview metrics, served from Redis for a few seconds."""
+    cached = cache_get(OVERVIEW_CACHE_KEY)
+    if cached is not None:
+        return OverviewResponse.model_validate_json(cached)
+
+    # All five figures come back as scalar subqueries of one SELECT.
+    row = db.execute(
+        select(
+            select(func.count(TrainingRound.id))
+            .scalar_subquery()
+            .label("total_rounds"),
+            select(func.count(Client.id))
+            .where(Client.status == "online")
+            .scalar_subquery()
+            .label("active_clients"),
+            select(TrainingRound.global_auc)
+            .where(TrainingRound.global_auc.isnot(None))
+            .order_by(desc(TrainingRound.round_number))
+            .limit(1)
+            .scalar_subquery()
+            .label("latest_auc"),
+            select(func.count(distinct(TrustScore.client_id)))
+            .where(TrustScore.is_flagged == True)
+            .scalar_subquery()
+            .label("flagged_clients"),
+            select(TrainingRound.status)
+            .where(TrainingRound.status.in_(["in_progress", "aggregating", "pending"]))
+            .order_by(desc(TrainingRound.round_number))
+            .limit(1)
+            .scalar_subquery()
+            .label("current_round_status"),
+        )
+    ).one()
+
+    overview = OverviewResponse(
+        total_rounds=row.total_rounds,
+        active_clients=row.active_clients,
+        latest_auc=row.latest_auc,
+        flagged_clients=row.flagged_clients,
+        current_round_status=row.current_round_status,
     )
-    return [
-        LossHistoryItem(round_number=r.round_number, global_loss=r.global_loss)
-        for r in rounds
-    ]
+    cache_set(OVERVIEW_CACHE_KEY, overview.model_dump_json(), OVERVIEW_CACHE_TTL_S)
+    return overview
 
 
 def get_aggregation_stats(db: Session) -> List[AggregationStatsResponse]:
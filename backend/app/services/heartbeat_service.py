@@ -0,0 +1,194 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+
+from app.cache import get_redis, redis
+from app.database import SessionLocal
+from app.models.client import Client
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_KEY_PREFIX = "heartbeat:"
+HEARTBEAT_DIRTY_KEY = "heartbeat:dirty"
+HEARTBEAT_TTL_S = 120
+HEARTBEAT_FLUSH_INTERVAL_S = 10
+HEARTBEAT_FLUSH_BATCH = 1000
+HEARTBEAT_DEBOUNCE_PREFIX = "hb:"
+HEARTBEAT_DEBOUNCE_S = 5
+CLIENT_PK_PREFIX = "client_pk:"
+CLIENT_PK_TTL_S = 300
+
+# Core table UPDATE so a list of parameter sets runs as one executemany
+# keyed on client_id (the ORM flavour would require primary keys).
+_FLUSH_STATEMENT = (
+    update(Client.__table__)
+    .where(Client.__table__.c.client_id == bindparam("b_client_id"))
+    .values(last_heartbeat=bindparam("b_last_heartbeat"), status=bindparam("b_status"))
+)
+
+
+def heartbeat_timestamp() -> datetime:
+    """Return the timestamp recorded for a heartbeat buffered now.
+
+    Buffered heartbeats reach the DB up to one flush interval later, so
+    they carry the time they arrived rather than the flush time. Direct
+    writes stamp ``last_heartbeat`` with the database-side ``utcnow()``.
+    """
+    return datetime.utcnow()
+
+
+def lookup_client_pk(db: Session, client_id: str) -> Optional[int]:
+    """Return the primary key of the client with *client_id*, or ``None``.
+
+    Known ids are cached in Redis for a few minutes, so buffered
+    heartbeats can reject unknown clients without querying the DB each
+    time. Unknown ids are not cached.
+    """
+    client = get_redis()
+    key = f"{CLIENT_PK_PREFIX}{client_id}"
+    if client is not None:
+        try:
+            cached = client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Client id lookup for {client_id} failed: {e}")
+            cached = None
+        if cached is not None:
+            return int(cached)
+
+    client_pk = db.execute(
+        select(Client.id).where(Client.client_id == client_id)
+    ).scalar_one_or_none()
+    if client_pk is not None and client is not None:
+        try:
+            client.set(key, client_pk, ex=CLIENT_PK_TTL_S)
+        except redis.RedisError as e:
+            logger.warning(f"Caching client id for {client_id} failed: {e}")
+    return client_pk
+
+
+def is_duplicate_heartbeat(client_id: str, status: str) -> bool:
+    """Return ``True`` if the client's last status, reported recently, was *status*.
+
+    The debounce key holds the client's last reported status. ``SET NX EX``
+    opens a window on the first heartbeat, which always goes through.
+    Within the window ``SET XX KEEPTTL GET`` records the new status and
+    returns the previous one, so only a repeat of the last status is
+    dropped (an A -> B -> A sequence writes all three) and the window
+    still expires on schedule. Without a reachable Redis nothing is
+    treated as a duplicate.
+    """
+    client = get_redis()
+    if client is None:
+        return False
+    key = f"{HEARTBEAT_DEBOUNCE_PREFIX}{client_id}"
+    try:
+        if client.set(key, status, nx=True, ex=HEARTBEAT_DEBOUNCE_S):
+            return False
+        previous = client.set(key, status, xx=True, keepttl=True, get=True)
+    except redis.RedisError as e:
+        logger.warning(f"Heartbeat debounce for {client_id} failed: {e}")
+        return False
+    return previous == status.encode()
+
+
+def buffer_heartbeat(client_id: str, status: str, timestamp: datetime) -> bool:
+    """Record a heartbeat in Redis for the next periodic flush.
+
+    Callers must check that the client exists first (see
+    :func:`lookup_client_pk`); unknown ids would only be flushed into an
+    UPDATE that matches no row.
+
+    Args:
+        client_id: The NVFlare client name (``Client.client_id``).
+        status: The reported client status.
+        timestamp: When the heartbeat was received
+            (:func:`heartbeat_timestamp`).
+
+    Returns:
+        ``True`` if the heartbeat was buffered, ``False`` if Redis is not
+        configured or unreachable and the caller should write to the DB.
+    """
+    client = get_redis()
+    if client is None:
+        return False
+    key = f"{HEARTBEAT_KEY_PREFIX}{client_id}"
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.hset(key, mapping={"ts": timestamp.isoformat(), "status": status})
+        pipe.expire(key, HEARTBEAT_TTL_S)
+        pipe.sadd(HEARTBEAT_DIRTY_KEY, client_id)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Buffering heartbeat for {client_id} failed: {e}")
+        return False
+    return True
+
+
+def flush_heartbeats(db: Session) -> int:
+    """Write buffered heartbeats to the ``clients`` table.
+
+    Args:
+        db: Session used for the batched UPDATE; committed on success.
+
+    Returns:
+        The number of buffered heartbeats processed.
+    """
+    client = get_redis()
+    if client is None:
+        return 0
+
+    # SPOP hands each dirty client to exactly one flusher, even with
+    # several workers; a heartbeat arriving meanwhile re-marks it dirty.
+    client_ids: List[bytes] = client.spop(HEARTBEAT_DIRTY_KEY, HEARTBEAT_FLUSH_BATCH) or []
+    if not client_ids:
+        return 0
+
+    pipe = client.pipeline(transaction=False)
+    for client_id in client_ids:
+        pipe.hgetall(HEARTBEAT_KEY_PREFIX.encode() + client_id)
+    states = pipe.execute()
+
+    rows = [
+        {
+            "b_client_id": client_id.decode(),
+            "b_last_heartbeat": datetime.fromisoformat(state[b"ts"].decode()),
+            "b_status": state[b"status"].decode(),
+        }
+        for client_id, state in zip(client_ids, states)
+        if state
+    ]
+    if rows:
+        try:
+            db.execute(_FLUSH_STATEMENT, rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            client.sadd(HEARTBEAT_DIRTY_KEY, *client_ids)
+            raise
+    return len(rows)
+
+
+def flush_pending_heartbeats() -> int:
+    """Flush buffered heartbeats with a short-lived session, logging failures."""
+    db = SessionLocal()
+    try:
+        return flush_heartbeats(db)
+    except Exception as e:
+        logger.error(f"Heartbeat flush failed: {e}")
+        return 0
+    finally:
+        db.close()
+
+
+async def run_heartbeat_flusher() -> None:
+    """Periodically flush buffered heartbeats until cancelled."""
+    while True:
+        await asyncio.sleep(HEARTBEAT_FLUSH_INTERVAL_S)
+        flushed = await run_in_threadpool(flush_pending_heartbeats)
+        if flushed:
+            logger.debug(f"Flushed {flushed} buffered heartbeats")
@@ -2,8 +2,9 @@ import os
 import time
 from typing import Dict
 
+from fastapi.concurrency import run_in_threadpool
 from PIL import Image
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.ml.predictor import ModelPredictor
@@ -21,8 +22,8 @@ def _get_predictor() -> ModelPredictor:
     return _predictor
 
 
-def run_inference(
-    db: Session,
+async def run_inference(
+    db: AsyncSession,
     user: User,
     image_path: str,
     image_filename: str,
@@ -30,13 +31,13 @@ def run_inference(
     """
     Run inference on a chest X-ray image.
 
-    Loads the model, preprocesses the image, runs prediction,
-    and saves the result to the database.
+    Loads the model, preprocesses the image, runs prediction (batched with
+    any concurrent requests), and saves the result to the database.
     """
-    predictor = _get_predictor()
+    predictor = await run_in_threadpool(_get_predictor)
 
     start_time = time.time()
-    predictions = predictor.predict(image_path)
+    predictions = await predictor.predict_async(image_path)
     elapsed_ms = int((time.time() - start_time) * 1000)
 
     top_finding = max(predictions, key=predictions.get)
@@ -56,7 +57,7 @@ def run_inference(
         inference_time_ms=elapsed_ms,
     )
     db.add(log_entry)
-    db.commit()
-    db.refresh(log_entry)
+    await db.commit()
+    await db.refresh(log_entry)
 
     return log_entry
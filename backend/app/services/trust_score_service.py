@@ -1,13 +1,12 @@
 import math
-from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from sqlalchemy import desc
+from sqlalchemy import desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.client import Client
 from app.models.client_update import ClientUpdate
-from app.models.training_round import TrainingRound
 from app.models.trust_score import TrustScore
 
 
@@ -90,21 +89,48 @@ def compute_trust_score(
     return score_entry
 
 
-def get_trust_timeline(db: Session, client_id: int) -> List[TrustScore]:
-    """Get the trust score history for a specific client, ordered by round."""
-    return (
-        db.query(TrustScore)
-        .filter(TrustScore.client_id == client_id)
-        .order_by(TrustScore.round_id)
-        .all()
+async def get_latest_trust_score(db: AsyncSession, client_id: int) -> Optional[TrustScore]:
+    """Get the most recent trust score for a client."""
+    result = await db.execute(
+        select(TrustScore)
+        .where(TrustScore.client_id == client_id)
+        .order_by(desc(TrustScore.computed_at))
+        .limit(1)
     )
+    return result.scalars().first()
 
 
-def get_latest_trust_score(db: Session, client_id: int) -> Optional[TrustScore]:
-    """Get the most recent trust score for a client."""
-    return (
-        db.query(TrustScore)
-        .filter(TrustScore.client_id == client_id)
-        .order_by(desc(TrustScore.computed_at))
-        .first()
+async def list_clients_with_latest_trust(
+    db: AsyncSession,
+) -> List[Tuple[Client, Optional[float], Optional[bool]]]:
+    """List all clients with their most recent trust score in a single query.
+
+    Each client is LEFT JOINed to its latest ``trust_scores`` row, picked with
+    a ``row_number()`` window so the same SQL runs on PostgreSQL and SQLite.
+
+    Returns:
+        ``(client, score, is_flagged)`` tuples ordered by newest client first;
+        ``score`` and ``is_flagged`` are ``None`` for clients with no scores.
+    """
+    ranked = select(
+        TrustScore.client_id,
+        TrustScore.score,
+        TrustScore.is_flagged,
+        func.row_number()
+        .over(
+            partition_by=TrustScore.client_id,
+            order_by=(desc(TrustScore.computed_at), desc(TrustScore.id)),
+        )
+        .label("rank"),
+    ).subquery()
+    latest = (
+        select(ranked.c.client_id, ranked.c.score, ranked.c.is_flagged)
+        .where(ranked.c.rank == 1)
+        .subquery()
+    )
+    result = await db.execute(
+        select(Client, latest.c.score, latest.c.is_flagged)
+        .outerjoin(latest, latest.c.client_id == Client.id)
+        .order_by(Client.created_at.desc())
     )
+    return [tuple(row) for row in result.all()]
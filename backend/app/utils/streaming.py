@@ -0,0 +1,47 @@
+from typing import Iterator
+
+import orjson
+from fastapi.responses import StreamingResponse
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import Select
+
+STREAM_BATCH_SIZE = 500
+
+
+def _iter_json_array(bind: Engine, stmt: Select, batch_size: int) -> Iterator[bytes]:
+    """Yield the rows of *stmt* as a JSON array, one chunk per fetched batch."""
+    yield b"["
+    first = True
+    with bind.connect() as conn:
+        result = conn.execution_options(yield_per=batch_size).execute(stmt)
+        for partition in result.mappings().partitions():
+            chunk = b",".join(orjson.dumps(dict(row)) for row in partition)
+            yield chunk if first else b"," + chunk
+            first = False
+    yield b"]"
+
+
+def stream_json_array(
+    bind: Engine,
+    stmt: Select,
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> StreamingResponse:
+    """Stream the rows of a Core SELECT as a JSON array of objects.
+
+    Rows are read through a server-side cursor in batches of *batch_size*,
+    so memory stays bounded however large the result is. The generator
+    opens its own connection on *bind* because request-scoped sessions are
+    closed before a streaming body is sent.
+
+    Args:
+        bind: Engine to read from (typically ``db.get_bind()``).
+        stmt: SELECT whose column labels become the JSON object keys.
+        batch_size: Rows fetched and serialized per chunk.
+
+    Returns:
+        A ``StreamingResponse`` with media type ``application/json``.
+    """
+    return StreamingResponse(
+        _iter_json_array(bind, stmt, batch_size),
+        media_type="application/json",
+    )
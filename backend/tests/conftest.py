@@ -1,21 +1,39 @@
+import os
+import tempfile
+import time
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
-from app.database import Base, get_db
+from app import cache as app_cache
+from app.database import Base, get_async_db, get_db
 from app.main import app
+from app.services import heartbeat_service
 
-SQLALCHEMY_TEST_DATABASE_URL = "sqlite://"
+# Sync and async sessions must see the same data, so the test database is a
+# temporary SQLite file rather than an in-memory database.
+_TEST_DB_PATH = os.path.join(tempfile.mkdtemp(), "test.db")
+SQLALCHEMY_TEST_DATABASE_URL = f"sqlite:///{_TEST_DB_PATH}"
+SQLALCHEMY_TEST_ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{_TEST_DB_PATH}"
 
 engine = create_engine(
     SQLALCHEMY_TEST_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
+)
+
+# NullPool: each TestClient runs its own event loop, so async connections
+# must not be pooled across tests.
+async_engine = create_async_engine(
+    SQLALCHEMY_TEST_ASYNC_DATABASE_URL,
+    poolclass=NullPool,
 )
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
 
 
 @pytest.fixture()
@@ -32,7 +50,7 @@ def db():
 
 @pytest.fixture()
 def client(db):
-    """Create a TestClient with the database dependency overridden."""
+    """Create a TestClient with the database dependencies overridden."""
 
     def _override_get_db():
         try:
@@ -40,7 +58,111 @@ def client(db):
         finally:
             pass
 
+    async def _override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_db:
+            yield async_db
+
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_async_db] = _override_get_async_db
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
+
+
+def _to_bytes(value) -> bytes:
+    return value if isinstance(value, bytes) else str(value).encode()
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of ``redis.Redis`` the app uses."""
+
+    def __init__(self):
+        self.store = {}
+        self.expiry = {}
+
+    def _live(self, key):
+        key = _to_bytes(key)
+        deadline = self.expiry.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self.store.pop(key, None)
+            self.expiry.pop(key, None)
+        return key
+
+    def get(self, key):
+        return self.store.get(self._live(key))
+
+    def set(self, key, value, nx=False, xx=False, ex=None, keepttl=False, get=False):
+        key = self._live(key)
+        previous = self.store.get(key)
+        if (nx and previous is not None) or (xx and previous is None):
+            return previous if get else None
+        self.store[key] = _to_bytes(value)
+        if not keepttl:
+            self.expiry.pop(key, None)
+        if ex is not None:
+            self.expire(key, ex)
+        return previous if get else True
+
+    def setex(self, key, ttl_s, value):
+        return self.set(key, value, ex=ttl_s)
+
+    def delete(self, *keys):
+        return sum(self.store.pop(self._live(k), None) is not None for k in keys)
+
+    def expire(self, key, ttl_s):
+        self.expiry[_to_bytes(key)] = time.monotonic() + ttl_s
+        return True
+
+    def hset(self, key, mapping):
+        fields = self.store.setdefault(self._live(key), {})
+        fields.update({_to_bytes(k): _to_bytes(v) for k, v in mapping.items()})
+        return len(mapping)
+
+    def hgetall(self, key):
+        return dict(self.store.get(self._live(key), {}))
+
+    def sadd(self, key, *members):
+        members_set = self.store.setdefault(self._live(key), set())
+        before = len(members_set)
+        members_set.update(_to_bytes(m) for m in members)
+        return len(members_set) - before
+
+    def smembers(self, key):
+        return set(self.store.get(self._live(key), set()))
+
+    def spop(self, key, count):
+        members_set = self.store.get(self._live(key), set())
+        return [members_set.pop() for _ in range(min(count, len(members_set)))]
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis_client):
+        self._redis = redis_client
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((getattr(self._redis, name), args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        results = [fn(*args, **kwargs) for fn, args, kwargs in self._calls]
+        self._calls = []
+        return results
+
+
+@pytest.fixture()
+def fake_redis(monkeypatch):
+    """Enable the Redis code paths against an in-memory fake.
+
+    Background heartbeat flushes use the test database. Request this
+    fixture before ``client`` so the app starts up with Redis enabled.
+    """
+    fake = FakeRedis()
+    monkeypatch.setattr(app_cache, "_REDIS_CLIENT", fake)
+    monkeypatch.setattr(heartbeat_service, "SessionLocal", TestingSessionLocal)
+    return fake
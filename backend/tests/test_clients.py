@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+from app.models.client import Client
+from app.models.training_round import TrainingRound
+from app.models.trust_score import TrustScore
+
+
+def _register_and_login(client):
+    """Helper to register the first user (admin) and return the auth token."""
+    client.post(
+        "/api/auth/register",
+        json={
+            "email": "admin@test.com",
+            "password": "secret123",
+            "full_name": "Admin User",
+        },
+    )
+    login_response = client.post(
+        "/api/auth/login",
+        json={
+            "email": "admin@test.com",
+            "password": "secret123",
+        },
+    )
+    return login_response.json()["access_token"]
+
+
+def _seed_clients(db):
+    """Helper to seed two clients, two rounds and trust scores for one client."""
+    now = datetime.utcnow()
+    scored = Client(name="Trauma Center", client_id="trauma_center", created_at=now)
+    unscored = Client(
+        name="General Hospital",
+        client_id="general_hospital",
+        created_at=now + timedelta(seconds=1),
+    )
+    round_1 = TrainingRound(round_number=1, status="completed")
+    round_2 = TrainingRound(round_number=2, status="completed")
+    db.add_all([scored, unscored, round_1, round_2])
+    db.flush()
+    db.add_all([
+        TrustScore(
+            client_id=scored.id,
+            round_id=round_1.id,
+            score=0.9,
+            is_flagged=False,
+            computed_at=now,
+        ),
+        TrustScore(
+            client_id=scored.id,
+            round_id=round_2.id,
+            score=0.2,
+            is_flagged=True,
+            computed_at=now + timedelta(minutes=5),
+        ),
+    ])
+    db.commit()
+
+
+def test_list_clients_latest_trust(client, db):
+    """Each client should carry only its most recent trust score."""
+    token = _register_and_login(client)
+    _seed_clients(db)
+
+    response = client.get(
+        "/api/clients",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [c["client_id"] for c in data] == ["general_hospital", "trauma_center"]
+
+    unscored, scored = data
+    assert unscored["trust_score"] is None
+    assert unscored["is_flagged"] is False
+    assert scored["trust_score"] == 0.2
+    assert scored["is_flagged"] is True
+
+
+def test_client_trust_timeline(client, db):
+    """The trust timeline should list every score for the client by round."""
+    token = _register_and_login(client)
+    _seed_clients(db)
+    scored = db.query(Client).filter(Client.client_id == "trauma_center").first()
+
+    response = client.get(
+        f"/api/clients/{scored.id}/trust",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert [point["score"] for point in response.json()] == [0.9, 0.2]
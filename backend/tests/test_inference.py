@@ -0,0 +1,55 @@
+import io
+
+from PIL import Image
+
+from app.config import settings
+
+
+def _register_and_login(client):
+    """Helper to register the first user (admin) and return the auth token."""
+    client.post(
+        "/api/auth/register",
+        json={
+            "email": "admin@test.com",
+            "password": "secret123",
+            "full_name": "Admin User",
+        },
+    )
+    login_response = client.post(
+        "/api/auth/login",
+        json={
+            "email": "admin@test.com",
+            "password": "secret123",
+        },
+    )
+    return login_response.json()["access_token"]
+
+
+def _png_bytes():
+    """Helper to build a small in-memory PNG image."""
+    buffer = io.BytesIO()
+    Image.new("RGB", (32, 32), color=(128, 128, 128)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_predict_and_history(client, tmp_path, monkeypatch):
+    """An uploaded image should produce a logged prediction visible in history."""
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    token = _register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.post(
+        "/api/inference/predict",
+        files={"file": ("xray.png", _png_bytes(), "image/png")},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["predictions"]) == 14
+    assert data["top_finding"] in data["predictions"]
+    assert data["image_filename"].endswith(".png")
+    assert (tmp_path / data["image_filename"]).exists()
+
+    history = client.get("/api/inference/history", headers=headers)
+    assert history.status_code == 200
+    assert [item["id"] for item in history.json()] == [data["id"]]
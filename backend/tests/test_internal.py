@@ -0,0 +1,293 @@
+import asyncio
+
+import pytest
+
+from app import main
+from app.models.client import Client
+from app.models.client_update import ClientUpdate
+from app.models.training_round import TrainingRound
+from app.services import heartbeat_service
+
+
+def test_report_round_upsert(client, db):
+    """Re-reporting a round should update it in place and keep its timestamps."""
+    created = client.post(
+        "/api/internal/round",
+        json={"round_number": 1, "status": "in_progress", "job_id": "job-1"},
+    )
+    assert created.status_code == 200
+    round_id = created.json()["round_id"]
+    started_at = db.get(TrainingRound, round_id).started_at
+    assert started_at is not None
+
+    updated = client.post(
+        "/api/internal/round",
+        json={"round_number": 1, "status": "completed", "global_auc": 0.8},
+    )
+    assert updated.json()["round_id"] == round_id
+
+    db.expire_all()
+    rounds = db.query(TrainingRound).all()
+    assert len(rounds) == 1
+    assert rounds[0].status == "completed"
+    assert rounds[0].job_id == "job-1"
+    assert rounds[0].global_auc == 0.8
+    assert rounds[0].started_at == started_at
+    assert rounds[0].completed_at is not None
+
+
+def test_report_client_updates_batch(client, db):
+    """A batch of client updates should be stored in one request."""
+    db.add_all([
+        Client(name="Trauma Center", client_id="trauma_center"),
+        Client(name="General Hospital", client_id="general_hospital"),
+        TrainingRound(round_number=1, status="in_progress"),
+    ])
+    db.commit()
+
+    response = client.post(
+        "/api/internal/client-updates:batch",
+        json=[
+            {"round_number": 1, "client_id": "trauma_center", "local_auc": 0.7},
+            {"round_number": 1, "client_id": "general_hospital", "local_auc": 0.8},
+        ],
+    )
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok", "inserted": 2}
+    assert sorted(u.local_auc for u in db.query(ClientUpdate).all()) == [0.7, 0.8]
+
+    missing = client.post(
+        "/api/internal/client-updates:batch",
+        json=[{"round_number": 1, "client_id": "unknown"}],
+    )
+    assert missing.status_code == 404
+    assert db.query(ClientUpdate).count() == 2
+
+
+def test_report_client_updates_batch_by_round_id(client, db):
+    """A batch entry's round_id wins over its round_number, as for one update."""
+    training_round = TrainingRound(round_number=3, status="in_progress")
+    db.add_all([Client(name="Trauma Center", client_id="trauma_center"), training_round])
+    db.commit()
+
+    response = client.post(
+        "/api/internal/client-updates:batch",
+        json=[
+            {"round_number": 0, "round_id": training_round.id, "client_id": "trauma_center"},
+            {"round_number": 3, "client_id": "trauma_center"},
+        ],
+    )
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok", "inserted": 2}
+    assert {u.round_id for u in db.query(ClientUpdate).all()} == {training_round.id}
+
+    missing = client.post(
+        "/api/internal/client-updates:batch",
+        json=[{"round_number": 3, "round_id": 999, "client_id": "trauma_center"}],
+    )
+    assert missing.status_code == 404
+    assert "999" in missing.json()["detail"]
+    assert db.query(ClientUpdate).count() == 2
+
+
+def test_report_heartbeat(client, db):
+    """A heartbeat should update the client's status and timestamp."""
+    db.add(Client(name="Trauma Center", client_id="trauma_center"))
+    db.commit()
+
+    response = client.post(
+        "/api/internal/heartbeat",
+        json={"client_id": "trauma_center", "status": "online"},
+    )
+    assert response.status_code == 200
+
+    db.expire_all()
+    stored = db.query(Client).filter(Client.client_id == "trauma_center").one()
+    assert response.json() == {"status": "ok", "client_id": stored.id}
+    assert stored.status == "online"
+    assert stored.last_heartbeat is not None
+
+    missing = client.post(
+        "/api/internal/heartbeat",
+        json={"client_id": "unknown", "status": "online"},
+    )
+    assert missing.status_code == 404
+
+
+def test_report_client_update(client, db):
+    """A client update should resolve its round by number or by id."""
+    training_round = TrainingRound(round_number=3, status="in_progress")
+    db.add_all([Client(name="Trauma Center", client_id="trauma_center"), training_round])
+    db.commit()
+
+    by_number = client.post(
+        "/api/internal/client-update",
+        json={"round_number": 3, "client_id": "trauma_center", "local_auc": 0.7},
+    )
+    by_id = client.post(
+        "/api/internal/client-update",
+        json={
+            "round_number": 0,
+            "round_id": training_round.id,
+            "client_id": "trauma_center",
+            "num_samples": 10,
+        },
+    )
+    assert by_number.status_code == 200
+    assert by_id.status_code == 200
+    updates = db.query(ClientUpdate).order_by(ClientUpdate.id).all()
+    assert [u.id for u in updates] == [by_number.json()["update_id"], by_id.json()["update_id"]]
+    assert all(u.round_id == training_round.id for u in updates)
+    assert updates[0].local_auc == 0.7
+    assert updates[1].num_samples == 10
+    assert updates[0].submitted_at is not None
+
+    missing_round = client.post(
+        "/api/internal/client-update",
+        json={"round_number": 99, "client_id": "trauma_center"},
+    )
+    missing_client = client.post(
+        "/api/internal/client-update",
+        json={"round_number": 3, "client_id": "unknown"},
+    )
+    assert missing_round.status_code == 404
+    assert "round 99" in missing_round.json()["detail"]
+    assert missing_client.status_code == 404
+    assert "unknown" in missing_client.json()["detail"]
+
+
+def test_buffered_heartbeat_is_flushed(fake_redis, client, db):
+    """With Redis, a heartbeat is buffered and lands in clients on flush."""
+    db.add(Client(name="Trauma Center", client_id="trauma_center"))
+    db.commit()
+    client_pk = db.query(Client.id).filter(Client.client_id == "trauma_center").scalar()
+
+    response = client.post(
+        "/api/internal/heartbeat",
+        json={"client_id": "trauma_center", "status": "online"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok", "client_id": client_pk}
+    assert fake_redis.smembers(heartbeat_service.HEARTBEAT_DIRTY_KEY) == {b"trauma_center"}
+
+    assert heartbeat_service.flush_heartbeats(db) == 1
+    db.expire_all()
+    stored = db.query(Client).filter(Client.client_id == "trauma_center").one()
+    assert stored.status == "online"
+    assert stored.last_heartbeat is not None
+    assert not fake_redis.smembers(heartbeat_service.HEARTBEAT_DIRTY_KEY)
+
+
+def test_buffered_heartbeat_unknown_client(fake_redis, client, db):
+    """Unknown clients get a 404 and are never buffered."""
+    response = client.post(
+        "/api/internal/heartbeat",
+        json={"client_id": "unknown", "status": "online"},
+    )
+    assert response.status_code == 404
+    assert not fake_redis.smembers(heartbeat_service.HEARTBEAT_DIRTY_KEY)
+    assert fake_redis.get(b"heartbeat:unknown") is None
+
+
+def test_failed_flush_marks_clients_dirty_again(fake_redis, db, monkeypatch):
+    """A failed commit puts the popped client ids back in the dirty set."""
+    db.add(Client(name="Trauma Center", client_id="trauma_center"))
+    db.commit()
+    heartbeat_service.buffer_heartbeat(
+        "trauma_center", "online", heartbeat_service.heartbeat_timestamp()
+    )
+
+    def failing_commit():
+        raise RuntimeError("commit failed")
+
+    with monkeypatch.context() as m:
+        m.setattr(db, "commit", failing_commit)
+        with pytest.raises(RuntimeError):
+            heartbeat_service.flush_heartbeats(db)
+    assert fake_redis.smembers(heartbeat_service.HEARTBEAT_DIRTY_KEY) == {b"trauma_center"}
+
+    assert heartbeat_service.flush_heartbeats(db) == 1
+
+
+def test_run_heartbeat_flusher(fake_redis, db, monkeypatch):
+    """The background flusher writes buffered heartbeats every interval."""
+    db.add(Client(name="Trauma Center", client_id="trauma_center"))
+    db.commit()
+    heartbeat_service.buffer_heartbeat(
+        "trauma_center", "training", heartbeat_service.heartbeat_timestamp()
+    )
+    monkeypatch.setattr(heartbeat_service, "HEARTBEAT_FLUSH_INTERVAL_S", 0)
+
+    async def run_briefly():
+        task = asyncio.create_task(heartbeat_service.run_heartbeat_flusher())
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if not fake_redis.smembers(heartbeat_service.HEARTBEAT_DIRTY_KEY):
+                break
+        task.cancel()
+
+    asyncio.run(run_briefly())
+    db.expire_all()
+    assert db.query(Client.status).filter(Client.client_id == "trauma_center").scalar() == "training"
+
+
+def test_shutdown_flushes_buffered_heartbeats(fake_redis, db):
+    """Stopping the app writes out heartbeats still buffered in Redis."""
+    db.add(Client(name="Trauma Center", client_id="trauma_center"))
+    db.commit()
+
+    async def lifecycle():
+        await main.start_heartbeat_flusher()
+        assert main._heartbeat_flusher is not None
+        heartbeat_service.buffer_heartbeat(
+            "trauma_center", "online", heartbeat_service.heartbeat_timestamp()
+        )
+        await main.stop_heartbeat_flusher()
+        assert main._heartbeat_flusher is None
+
+    asyncio.run(lifecycle())
+    db.expire_all()
+    assert db.query(Client.status).filter(Client.client_id == "trauma_center").scalar() == "online"
+
+
+def test_duplicate_heartbeat_within_window(fake_redis, client, db):
+    """A repeated status inside the debounce window is dropped; a status
+    change still goes through.
+    """
+    db.add(Client(name="Trauma Center", client_id="trauma_center"))
+    db.commit()
+    client_pk = db.query(Client.id).filter(Client.client_id == "trauma_center").scalar()
+    payload = {"client_id": "trauma_center", "status": "online"}
+
+    first = client.post("/api/internal/heartbeat", json=payload)
+    assert first.json() == {"status": "ok", "client_id": client_pk}
+    heartbeat_service.flush_heartbeats(db)
+
+    repeat = client.post("/api/internal/heartbeat", json=payload)
+    assert repeat.json() == {"status": "ok", "client_id": client_pk, "cached": True}
+    assert not fake_redis.smembers(heartbeat_service.HEARTBEAT_DIRTY_KEY)
+
+    changed = client.post(
+        "/api/internal/heartbeat",
+        json={"client_id": "trauma_center", "status": "training"},
+    )
+    assert changed.json() == {"status": "ok", "client_id": client_pk}
+    assert fake_redis.smembers(heartbeat_service.HEARTBEAT_DIRTY_KEY) == {b"trauma_center"}
+
+
+def test_status_return_within_window_is_not_dropped(fake_redis, client, db):
+    """Switching A -> B -> A inside the debounce window writes every change."""
+    db.add(Client(name="Trauma Center", client_id="trauma_center"))
+    db.commit()
+    client_pk = db.query(Client.id).filter(Client.client_id == "trauma_center").scalar()
+
+    for status in ("online", "training", "online"):
+        response = client.post(
+            "/api/internal/heartbeat",
+            json={"client_id": "trauma_center", "status": status},
+        )
+        assert response.json() == {"status": "ok", "client_id": client_pk}
+        heartbeat_service.flush_heartbeats(db)
+
+    db.expire_all()
+    assert db.query(Client.status).filter(Client.client_id == "trauma_center").scalar() == "online"
@@ -1,3 +1,9 @@
+from app.cache import OVERVIEW_CACHE_KEY
+from app.models.client import Client
+from app.models.training_round import TrainingRound
+from app.models.trust_score import TrustScore
+
+
 def _register_and_login(client):
     """Helper to register the first user (admin) and return the auth token."""
     client.post(
@@ -38,6 +44,36 @@ def test_overview_empty(client):
     assert data["active_clients"] == 0
 
 
+def test_overview_populated(client, db):
+    """Overview should aggregate rounds, online clients and flagged clients."""
+    token = _register_and_login(client)
+    online = Client(name="Trauma Center", client_id="trauma_center", status="online")
+    offline = Client(name="General Hospital", client_id="general_hospital")
+    round_1 = TrainingRound(round_number=1, status="completed", global_auc=0.71)
+    round_2 = TrainingRound(round_number=2, status="in_progress")
+    db.add_all([online, offline, round_1, round_2])
+    db.flush()
+    db.add_all([
+        TrustScore(client_id=online.id, round_id=round_1.id, score=0.2, is_flagged=True),
+        TrustScore(client_id=online.id, round_id=round_2.id, score=0.1, is_flagged=True),
+        TrustScore(client_id=offline.id, round_id=round_1.id, score=0.9, is_flagged=False),
+    ])
+    db.commit()
+
+    response = client.get(
+        "/api/metrics/overview",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "total_rounds": 2,
+        "active_clients": 1,
+        "latest_auc": 0.71,
+        "flagged_clients": 1,
+        "current_round_status": "in_progress",
+    }
+
+
 def test_auc_history_empty(client):
     """AUC history on an empty database should return an empty list."""
     token = _register_and_login(client)
@@ -49,6 +85,43 @@ def test_auc_history_empty(client):
     assert response.json() == []
 
 
+def test_auc_history_pagination_and_downsample(client, db):
+    """AUC history should honour skip/limit and evenly downsample on request."""
+    token = _register_and_login(client)
+    db.add_all([
+        TrainingRound(round_number=n, status="completed", global_auc=n / 10)
+        for n in range(1, 12)
+    ])
+    db.commit()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    page = client.get("/api/metrics/auc-history?skip=2&limit=3", headers=headers)
+    assert [p["round_number"] for p in page.json()] == [3, 4, 5]
+
+    sampled = client.get("/api/metrics/auc-history?limit=3&downsample=true", headers=headers)
+    assert [p["round_number"] for p in sampled.json()] == [1, 5, 9]
+
+
+def test_auc_history_etag(client, db):
+    """AUC history should return 304 until a new point is added."""
+    token = _register_and_login(client)
+    db.add(TrainingRound(round_number=1, status="completed", global_auc=0.6))
+    db.commit()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = client.get("/api/metrics/auc-history", headers=headers)
+    etag = first.headers["etag"]
+    cached = client.get("/api/metrics/auc-history", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    db.add(TrainingRound(round_number=2, status="completed", global_auc=0.7))
+    db.commit()
+    refreshed = client.get("/api/metrics/auc-history", headers={**headers, "If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+
+
 def test_privacy(client):
     """Privacy metrics should return the expected static values."""
     token = _register_and_login(client)
@@ -62,3 +135,29 @@ def test_privacy(client):
     assert data["dp_delta"] == 1e-5
     assert data["encryption_coverage_pct"] == 50.0
     assert data["avg_noise_magnitude"] == 0.01
+
+
+def test_overview_cache_hit_and_miss(fake_redis, client, db):
+    """The overview is cached after a miss, served from the cache until
+    invalidated, and recomputed after an internal report.
+    """
+    token = _register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = client.get("/api/metrics/overview", headers=headers)
+    assert first.json()["active_clients"] == 0
+    assert fake_redis.get(OVERVIEW_CACHE_KEY) is not None
+
+    db.add(Client(name="Trauma Center", client_id="trauma_center", status="online"))
+    db.commit()
+    cached = client.get("/api/metrics/overview", headers=headers)
+    assert cached.json()["active_clients"] == 0
+
+    client.post(
+        "/api/internal/round",
+        json={"round_number": 1, "status": "in_progress"},
+    )
+    assert fake_redis.get(OVERVIEW_CACHE_KEY) is None
+    fresh = client.get("/api/metrics/overview", headers=headers)
+    assert fresh.json()["active_clients"] == 1
+    assert fresh.json()["total_rounds"] == 1
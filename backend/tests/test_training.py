@@ -0,0 +1,104 @@
+from sqlalchemy import event
+
+from app.models.client import Client
+from app.models.client_update import ClientUpdate
+from app.models.round_metric import RoundMetric
+from app.models.training_round import TrainingRound
+from tests.conftest import engine
+
+
+def _register_and_login(client):
+    """Helper to register the first user (admin) and return the auth token."""
+    client.post(
+        "/api/auth/register",
+        json={
+            "email": "admin@test.com",
+            "password": "secret123",
+            "full_name": "Admin User",
+        },
+    )
+    login_response = client.post(
+        "/api/auth/login",
+        json={
+            "email": "admin@test.com",
+            "password": "secret123",
+        },
+    )
+    return login_response.json()["access_token"]
+
+
+def _seed_round(db):
+    """Helper to seed one round with two client updates and a metric row."""
+    clients = [
+        Client(name="Trauma Center", client_id="trauma_center"),
+        Client(name="General Hospital", client_id="general_hospital"),
+    ]
+    training_round = TrainingRound(round_number=1, status="completed")
+    db.add_all([*clients, training_round])
+    db.flush()
+    db.add_all([
+        *(
+            ClientUpdate(round_id=training_round.id, client_id=c.id, local_auc=0.8)
+            for c in clients
+        ),
+        RoundMetric(round_id=training_round.id, aggregation_method="geometric_median"),
+    ])
+    db.commit()
+    return training_round.id
+
+
+def test_round_detail_loads_relations_eagerly(client, db):
+    """Round detail should fetch the round, metric and updates in two queries."""
+    token = _register_and_login(client)
+    round_id = _seed_round(db)
+    db.expire_all()
+
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "training_rounds" in statement or "client_updates" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        response = client.get(
+            f"/api/training/rounds/{round_id}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["updates"]) == 2
+    assert data["metric"]["aggregation_method"] == "geometric_median"
+    assert len(statements) == 2
+
+
+def test_list_rounds(client, db):
+    """Round listing should return the newest round first."""
+    token = _register_and_login(client)
+    _seed_round(db)
+    db.add(TrainingRound(round_number=2, status="in_progress"))
+    db.commit()
+
+    response = client.get(
+        "/api/training/rounds",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert [r["round_number"] for r in response.json()] == [2, 1]
+    assert response.json()[0]["status"] == "in_progress"
+
+
+def test_round_updates(client, db):
+    """Round updates should list every client update for the round."""
+    token = _register_and_login(client)
+    round_id = _seed_round(db)
+
+    response = client.get(
+        f"/api/training/rounds/{round_id}/updates",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert [u["local_auc"] for u in response.json()] == [0.8, 0.8]
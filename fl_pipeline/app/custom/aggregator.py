@@ -3,8 +3,8 @@ NVFlare Server Controller using Geometric Median aggregation.
 
 This controller orchestrates the federated learning rounds:
 1. Broadcasts the current global model to all clients.
-2. Collects client updates (body in plaintext with DP noise,
-   head encrypted via CKKS).
+2. Collects client updates (body in plaintext with DP noise and
+   int8 quantization, head encrypted via CKKS).
 3. Aggregates body weights using the geometric median (robust
    against Byzantine clients).
 4. Averages head weights (simple mean for encrypted weights).
@@ -13,9 +13,12 @@ This controller orchestrates the federated learning rounds:
 
 import time
 import logging
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict
+from typing import Any, Dict, List, Tuple
 
+import numpy as np
+import torch
 from nvflare.apis.impl.controller import Controller
 from nvflare.apis.controller_spec import Task
 from nvflare.apis.dxo import DXO, DataKind, from_shareable
@@ -25,9 +28,44 @@ from nvflare.apis.fl_constant import ReturnCode
 
 from .geometric_median import GeometricMedianAggregator
 from .db_writer import DBWriter
+from .state_codec import PACKED_BODY_KEY, dequantize_tensor, pack_state_dict
 
 logger = logging.getLogger(__name__)
 
+# Parameter-name prefix of the (encrypted) classification head.
+HEAD_PREFIX = "classifier."
+
+# A client further than this from the median counts as poisoned, and one
+# whose trust score 1 / (1 + distance) falls below the flag threshold is
+# flagged on the dashboard.
+POISON_DISTANCE_THRESHOLD = 2.0
+TRUST_FLAG_THRESHOLD = 0.3
+
+# training_rounds.status values written by the controller.
+STATUS_IN_PROGRESS = "in_progress"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+
+def _trust_from_distances(
+    distances: np.ndarray,
+    poison_threshold: float = POISON_DISTANCE_THRESHOLD,
+    flag_threshold: float = TRUST_FLAG_THRESHOLD,
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Turn per-client distances from the median into trust statistics.
+
+    Args:
+        distances: Euclidean distance of each client from the median.
+        poison_threshold: Distance above which a client counts as poisoned.
+        flag_threshold: Trust score below which a client is flagged.
+
+    Returns:
+        ``(trust_scores, flagged, poisoned_count)``, where trust is
+        ``1 / (1 + distance)``.
+    """
+    trusts = 1.0 / (1.0 + distances)
+    return trusts, trusts < flag_threshold, int((distances > poison_threshold).sum())
+
 
 class GeomMedianController(Controller):
     """Server-side controller that aggregates client updates via geometric median.
@@ -45,8 +83,10 @@ class GeomMedianController(Controller):
         self.aggregator = GeometricMedianAggregator()
         self.db_writer = DBWriter(db_url) if db_url else None
         self.global_model_weights = None
+        self._job_id = None
 
     def start_controller(self, fl_ctx: FLContext):
+        self._job_id = fl_ctx.get_job_id() if hasattr(fl_ctx, 'get_job_id') else None
         logger.info("GeomMedianController starting")
 
     def stop_controller(self, fl_ctx: FLContext):
@@ -55,6 +95,14 @@ class GeomMedianController(Controller):
         logger.info("GeomMedianController stopped")
 
     def control_flow(self, abort_signal: Signal, fl_ctx: FLContext):
+        # Loop-invariant lookups, bound once for all rounds and clients.
+        db_writer = self.db_writer
+        aggregator = self.aggregator
+        min_clients = self.min_clients
+        ok_code = ReturnCode.OK
+        weights_kind = DataKind.WEIGHTS
+        job_id = self._job_id
+
         for round_num in range(1, self.num_rounds + 1):
             if abort_signal.triggered:
                 break
@@ -64,19 +112,19 @@ class GeomMedianController(Controller):
 
             # Report round start to DB
             round_db_id = None
-            if self.db_writer:
-                round_db_id = self.db_writer.write_round(
+            if db_writer:
+                round_db_id = db_writer.write_round(
                     round_number=round_num,
-                    job_id=fl_ctx.get_job_id() if hasattr(fl_ctx, 'get_job_id') else None,
-                    status="in_progress",
-                    num_clients=self.min_clients,
+                    job_id=job_id,
+                    status=STATUS_IN_PROGRESS,
+                    num_clients=min_clients,
                     started_at=round_start,
                 )
 
             # Create train task and broadcast as DXO weights shareable.
             # Trainer uses `from_shareable()` and expects DXO content.
             task_data = DXO(
-                data_kind=DataKind.WEIGHTS,
+                data_kind=weights_kind,
                 data=self.global_model_weights or {},
             ).to_shareable()
             task_data["round_number"] = round_num
@@ -85,19 +133,22 @@ class GeomMedianController(Controller):
             self.broadcast_and_wait(
                 task=task,
                 targets=None,  # all clients
-                min_responses=self.min_clients,
+                min_responses=min_clients,
                 fl_ctx=fl_ctx,
                 abort_signal=abort_signal,
             )
 
-            # Collect results
+            # Collect results. Body weights go straight into per-key lists
+            # that are stacked into (num_clients, *shape) tensors below.
             client_results = []
+            body_stacks: Dict[str, List[torch.Tensor]] = defaultdict(list)
+            head_updates = []
             for client_task in task.client_tasks:
                 result = client_task.result
-                if result and result.get_return_code() == ReturnCode.OK:
+                if result and result.get_return_code() == ok_code:
                     try:
                         dxo = from_shareable(result)
-                        if dxo.data_kind != DataKind.WEIGHTS:
+                        if dxo.data_kind != weights_kind:
                             logger.warning(
                                 "Skipping result from %s: unexpected data_kind=%s",
                                 client_task.client.name,
@@ -114,16 +165,26 @@ class GeomMedianController(Controller):
                         )
                         continue
 
-                    body_weights = {
-                        k: v for k, v in weights.items() if not k.startswith("classifier.")
-                    }
-                    head_weights = {
-                        k: v for k, v in weights.items() if k.startswith("classifier.")
-                    }
+                    if not weights:
+                        # Client had no training data this round
+                        logger.info(
+                            "Skipping empty update from %s", client_task.client.name
+                        )
+                        continue
+
+                    # int8 body tensors are dequantized with their scales
+                    body_scales = meta.get("body_scales") or {}
+                    head_weights = {}
+                    for k, v in weights.items():
+                        if k.startswith(HEAD_PREFIX):
+                            head_weights[k] = v
+                        elif k in body_scales:
+                            body_stacks[k].append(dequantize_tensor(v, body_scales[k]))
+                        else:
+                            body_stacks[k].append(v)
+                    head_updates.append(head_weights)
                     client_results.append({
                         "client_name": client_task.client.name,
-                        "body_weights": body_weights,
-                        "head_weights": head_weights,
                         "meta": {
                             "local_loss": meta.get("local_loss", 0.0),
                             "local_auc": meta.get("local_auc", 0.0),
@@ -132,85 +193,138 @@ class GeomMedianController(Controller):
                         },
                     })
 
-            if len(client_results) < self.min_clients:
-                logger.warning(f"Round {round_num}: only {len(client_results)} responses, need {self.min_clients}")
-                if self.db_writer and round_db_id:
-                    self.db_writer.write_round(round_num, None, "failed", len(client_results))
+            if len(client_results) < min_clients:
+                logger.warning(f"Round {round_num}: only {len(client_results)} responses, need {min_clients}")
+                if db_writer and round_db_id:
+                    db_writer.update_round_completion(
+                        round_db_id, STATUS_FAILED, len(client_results)
+                    )
                 continue
 
             # Aggregate body weights using geometric median
             agg_start = time.time()
-            body_updates = [r["body_weights"] for r in client_results]
-            aggregated_body = self.aggregator.aggregate(body_updates)
-            distances = self.aggregator.compute_distances(body_updates, aggregated_body)
+            body_batch = {k: torch.stack(v) for k, v in body_stacks.items()}
+            aggregated_body = aggregator.aggregate_stacked(body_batch)
+            distances = np.asarray(
+                aggregator.compute_distances_stacked(body_batch, aggregated_body)
+            )
             agg_time_ms = int((time.time() - agg_start) * 1000)
+            # Every collected client contributed one row to each body stack,
+            # so there should be one distance per client result. A mismatch
+            # would misattribute distances, so the round is failed instead.
+            if len(distances) != len(client_results):
+                logger.error(
+                    f"Round {round_num}: aggregator returned {len(distances)} "
+                    f"distances for {len(client_results)} client results"
+                )
+                if db_writer and round_db_id:
+                    db_writer.update_round_completion(
+                        round_db_id, STATUS_FAILED, len(client_results)
+                    )
+                continue
 
             # Aggregate head weights (simple averaging for encrypted weights)
-            head_updates = [r["head_weights"] for r in client_results]
-            aggregated_head = {}
-            if head_updates and head_updates[0]:
-                for key in head_updates[0]:
-                    stacked = [h[key] for h in head_updates if key in h]
-                    if stacked:
-                        # When selective HE is enabled, head values are bytes.
-                        # We can't average ciphertext here without shared HE context,
-                        # so keep the first available encrypted head tensor.
-                        if isinstance(stacked[0], bytes):
-                            aggregated_head[key] = stacked[0]
-                        else:
-                            import torch
-                            aggregated_head[key] = torch.stack(stacked).mean(dim=0)
+            aggregated_head = self._average_heads(head_updates)
 
-            # Update global model
-            self.global_model_weights = {**aggregated_body, **aggregated_head}
+            # Update global model. The body is broadcast as one packed
+            # buffer that clients deserialize directly onto their device.
+            self.global_model_weights = {
+                PACKED_BODY_KEY: pack_state_dict(aggregated_body),
+                **aggregated_head,
+            }
 
             # Compute global metrics (average of client metrics)
-            avg_loss = sum(r["meta"]["local_loss"] for r in client_results) / len(client_results)
-            avg_auc = sum(r["meta"]["local_auc"] for r in client_results) / len(client_results)
+            n_results = len(client_results)
+            losses = np.fromiter(
+                (r["meta"]["local_loss"] for r in client_results), dtype=np.float64, count=n_results
+            )
+            aucs = np.fromiter(
+                (r["meta"]["local_auc"] for r in client_results), dtype=np.float64, count=n_results
+            )
+            avg_loss = float(losses.mean())
+            avg_auc = float(aucs.mean())
 
             round_end = datetime.utcnow()
 
-            # Write metrics to DB
-            if self.db_writer and round_db_id:
-                self.db_writer.write_round(
-                    round_number=round_num, job_id=None, status="completed",
-                    num_clients=len(client_results),
-                    global_loss=avg_loss, global_auc=avg_auc,
-                    started_at=round_start, completed_at=round_end,
-                )
+            # Write metrics to DB in a single transaction
+            if db_writer and round_db_id:
+                trusts, flagged, poisoned = _trust_from_distances(distances)
+                client_rows = [
+                    {
+                        "client_name": cr["client_name"],
+                        "local_loss": cr["meta"]["local_loss"],
+                        "local_auc": cr["meta"]["local_auc"],
+                        "num_samples": cr["meta"]["num_samples"],
+                        "euclidean_distance": dist,
+                        "encryption_status": cr["meta"]["encryption_status"],
+                        "score": trust,
+                        "is_flagged": is_flagged,
+                    }
+                    # tolist() hands the DB driver plain Python scalars.
+                    for cr, dist, trust, is_flagged in zip(
+                        client_results, distances.tolist(), trusts.tolist(), flagged.tolist()
+                    )
+                ]
 
-                weiszfeld_iters = getattr(self.aggregator, '_last_iterations', 0)
-                self.db_writer.write_round_metric(
+                weiszfeld_iters = getattr(aggregator, '_last_iterations', 0)
+                db_writer.write_round_bundle(
                     round_id=round_db_id,
-                    aggregation_method="geometric_median",
-                    weiszfeld_iterations=weiszfeld_iters,
-                    convergence_epsilon=self.aggregator.eps,
-                    encryption_overhead_ms=0,
-                    aggregation_time_ms=agg_time_ms,
-                    poisoned_clients_detected=sum(1 for d in distances if d > 2.0),
+                    round_values={
+                        "status": STATUS_COMPLETED,
+                        "num_clients": len(client_results),
+                        "global_loss": avg_loss,
+                        "global_auc": avg_auc,
+                        "started_at": round_start,
+                        "completed_at": round_end,
+                    },
+                    metric_values={
+                        "aggregation_method": "geometric_median",
+                        "weiszfeld_iterations": weiszfeld_iters,
+                        "convergence_epsilon": aggregator.eps,
+                        "encryption_overhead_ms": 0,
+                        "aggregation_time_ms": agg_time_ms,
+                        "poisoned_clients_detected": poisoned,
+                    },
+                    client_rows=client_rows,
                 )
 
-                for i, cr in enumerate(client_results):
-                    dist = distances[i] if i < len(distances) else 0.0
-                    trust = 1.0 / (1.0 + dist)
-                    self.db_writer.write_client_update(
-                        round_id=round_db_id,
-                        client_name=cr["client_name"],
-                        local_loss=cr["meta"]["local_loss"],
-                        local_auc=cr["meta"]["local_auc"],
-                        num_samples=cr["meta"]["num_samples"],
-                        euclidean_distance=dist,
-                        encryption_status=cr["meta"]["encryption_status"],
-                    )
-                    self.db_writer.write_trust_score(
-                        client_name=cr["client_name"],
-                        round_id=round_db_id,
-                        score=trust,
-                        deviation_avg=dist,
-                        is_flagged=(trust < 0.3),
-                    )
-
             logger.info(f"Round {round_num} completed: loss={avg_loss:.4f}, auc={avg_auc:.4f}")
 
+    @staticmethod
+    def _average_heads(head_updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Average plaintext head tensors key by key.
+
+        Each key is accumulated in place into a single buffer and divided
+        once, instead of stacking every client's tensor per key.
+
+        Args:
+            head_updates: One head state dict per client.
+
+        Returns:
+            The averaged head; encrypted (``bytes``) entries keep the first
+            client's value.
+        """
+        if not head_updates or not head_updates[0]:
+            return {}
+
+        aggregated_head = {}
+        for key, first in head_updates[0].items():
+            # When selective HE is enabled, head values are bytes.
+            # We can't average ciphertext here without shared HE context,
+            # so keep the first available encrypted head tensor.
+            if isinstance(first, bytes):
+                aggregated_head[key] = first
+                continue
+
+            acc = torch.as_tensor(first).clone()
+            count = 1
+            for head in head_updates[1:]:
+                value = head.get(key)
+                if value is not None:
+                    acc.add_(torch.as_tensor(value))
+                    count += 1
+            aggregated_head[key] = acc.div_(count)
+        return aggregated_head
+
     def process_result_of_unknown_task(self, client, task_name, client_task_id, result, fl_ctx):
         logger.warning(f"Unknown task result from {client.name}: {task_name}")
@@ -10,8 +10,11 @@ from the dashboard's own model definitions.
 from __future__ import annotations
 
 import logging
+import queue
+import threading
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from sqlalchemy import (
     create_engine,
@@ -23,15 +26,133 @@ from sqlalchemy import (
     String,
     Boolean,
     DateTime,
-    Text,
+    bindparam,
     select,
     update,
     insert,
 )
-from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import Insert
+from sqlalchemy.sql.functions import FunctionElement
 
 logger = logging.getLogger(__name__)
 
+# How long resolved client name -> id mappings are trusted before the
+# cache is dropped and names are looked up again.
+CLIENT_ID_CACHE_TTL_S = 300.0
+
+# The background writer commits once this many rows are queued, or once
+# the oldest queued row has waited this long.
+ASYNC_FLUSH_ROWS = 500
+ASYNC_FLUSH_INTERVAL_S = 0.25
+
+# Rows per multi-row INSERT statement when executemany is batched.
+EXECUTEMANY_PAGE_SIZE = 500
+
+
+class _utcnow(FunctionElement):
+    """Database-side ``datetime.utcnow()``, matching the dashboard's columns.
+
+    Timestamps are stored as naive UTC; plain ``now()`` would store the
+    PostgreSQL session's local time instead.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(_utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(_utcnow)
+def _default_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+# ----------------------------------------------------------------------
+# Background writer
+# ----------------------------------------------------------------------
+
+class _AsyncWriter(threading.Thread):
+    """Daemon thread that inserts queued rows off the round loop.
+
+    Rows are grouped per INSERT statement and written with one executemany
+    per statement in a single transaction. On PostgreSQL the transaction uses
+    ``synchronous_commit = off``: losing the last few rows on a server
+    crash is acceptable for per-client metrics.
+
+    Args:
+        engine: Engine to take the worker's own connections from.
+        max_rows: Flush once at least this many rows are pending.
+        flush_interval_s: Flush at the latest this long after the first
+            pending row was queued.
+    """
+
+    def __init__(
+        self,
+        engine,
+        max_rows: int = ASYNC_FLUSH_ROWS,
+        flush_interval_s: float = ASYNC_FLUSH_INTERVAL_S,
+    ) -> None:
+        super().__init__(name="DBWriter-async", daemon=True)
+        self.engine = engine
+        self.max_rows = max_rows
+        self.flush_interval_s = flush_interval_s
+        self._queue: "queue.Queue[Tuple[Insert, List[Dict[str, Any]]]]" = queue.Queue()
+        self._shutdown = threading.Event()
+
+    def submit(self, stmt: Insert, rows: List[Dict[str, Any]]) -> None:
+        """Queue *rows* as parameter sets for *stmt* and return immediately."""
+        if rows:
+            self._queue.put((stmt, rows))
+
+    def run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval_s)
+            except queue.Empty:
+                if self._shutdown.is_set():
+                    return
+                continue
+
+            batch = [first]
+            pending = len(first[1])
+            deadline = time.monotonic() + self.flush_interval_s
+            while pending < self.max_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                pending += len(item[1])
+            self._flush(batch, pending)
+
+    def _flush(self, batch: List[Tuple[Insert, List[Dict[str, Any]]]], pending: int) -> None:
+        grouped: Dict[Insert, List[Dict[str, Any]]] = {}
+        for stmt, rows in batch:
+            grouped.setdefault(stmt, []).extend(rows)
+        try:
+            with self.engine.begin() as conn:
+                if conn.dialect.name == "postgresql":
+                    conn.exec_driver_sql("SET LOCAL synchronous_commit TO OFF")
+                for stmt, rows in grouped.items():
+                    conn.execute(stmt, rows)
+        except Exception as exc:
+            logger.error(f"Background write of {pending} rows failed: {exc}", exc_info=True)
+
+    def close(self) -> None:
+        """Stop accepting work once the queue is drained and wait for it."""
+        self._shutdown.set()
+        self.join()
+
 
 class DBWriter:
     """Write FL pipeline metrics into PostgreSQL.
@@ -42,130 +163,188 @@ class DBWriter:
     """
 
     def __init__(self, db_url: str) -> None:
-        self.engine = create_engine(db_url, pool_pre_ping=True, pool_size=5)
+        engine_options: Dict[str, Any] = {}
+        if make_url(db_url).get_dialect().driver == "psycopg2":
+            # Also batch executemany UPDATEs with execute_batch; INSERTs
+            # already go out as multi-row VALUES pages.
+            engine_options["executemany_mode"] = "values_plus_batch"
+        self.engine = create_engine(
+            db_url,
+            pool_pre_ping=True,
+            pool_size=5,
+            insertmanyvalues_page_size=EXECUTEMANY_PAGE_SIZE,
+            **engine_options,
+        )
         self.metadata = MetaData()
-        self._reflect_tables()
+        self._conn: Optional[Connection] = None
+        self._client_id_cache: Dict[str, int] = {}
+        self._client_id_cache_expires = 0.0
+        self._define_tables()
+        self._async_writer = _AsyncWriter(self.engine)
+        self._async_writer.start()
 
     # ------------------------------------------------------------------
-    # Table reflection
+    # Table definitions
     # ------------------------------------------------------------------
 
-    def _reflect_tables(self) -> None:
-        """Reflect (mirror) the tables we need from the existing schema.
+    def _define_tables(self) -> None:
+        """Declare the subset of the dashboard schema the writer touches.
 
-        If a table does not yet exist in the database we define a
-        lightweight stand-in so that writes degrade gracefully.
+        The definitions mirror ``backend/app/models`` and are not
+        reflected, so constructing a writer makes no database round-trips.
+        Only the columns written or filtered on are declared.
         """
-        try:
-            self.metadata.reflect(bind=self.engine)
-        except Exception as exc:
-            logger.warning(f"Could not reflect database schema: {exc}")
-
-        # training_rounds
-        if "training_rounds" in self.metadata.tables:
-            self.training_rounds = self.metadata.tables["training_rounds"]
-        else:
-            self.training_rounds = Table(
-                "training_rounds",
-                self.metadata,
-                Column("id", Integer, primary_key=True, autoincrement=True),
-                Column("round_number", Integer, nullable=False),
-                Column("job_id", String(255)),
-                Column("status", String(50)),
-                Column("num_clients", Integer),
-                Column("global_loss", Float),
-                Column("global_auc", Float),
-                Column("started_at", DateTime),
-                Column("completed_at", DateTime),
-                extend_existing=True,
-            )
-
-        # client_updates
-        if "client_updates" in self.metadata.tables:
-            self.client_updates = self.metadata.tables["client_updates"]
-        else:
-            self.client_updates = Table(
-                "client_updates",
-                self.metadata,
-                Column("id", Integer, primary_key=True, autoincrement=True),
-                Column("round_id", Integer),
-                Column("client_id", Integer),
-                Column("local_loss", Float),
-                Column("local_auc", Float),
-                Column("num_samples", Integer),
-                Column("euclidean_distance", Float),
-                Column("encryption_status", String(50)),
-                Column("submitted_at", DateTime),
-                extend_existing=True,
-            )
-
-        # round_metrics
-        if "round_metrics" in self.metadata.tables:
-            self.round_metrics = self.metadata.tables["round_metrics"]
-        else:
-            self.round_metrics = Table(
-                "round_metrics",
-                self.metadata,
-                Column("id", Integer, primary_key=True, autoincrement=True),
-                Column("round_id", Integer),
-                Column("aggregation_method", String(100)),
-                Column("weiszfeld_iterations", Integer),
-                Column("convergence_epsilon", Float),
-                Column("encryption_overhead_ms", Integer),
-                Column("aggregation_time_ms", Integer),
-                Column("poisoned_clients_detected", Integer),
-                extend_existing=True,
-            )
-
-        # trust_scores
-        if "trust_scores" in self.metadata.tables:
-            self.trust_scores = self.metadata.tables["trust_scores"]
-        else:
-            self.trust_scores = Table(
-                "trust_scores",
-                self.metadata,
-                Column("id", Integer, primary_key=True, autoincrement=True),
-                Column("client_id", Integer),
-                Column("round_id", Integer),
-                Column("score", Float),
-                Column("deviation_avg", Float),
-                Column("is_flagged", Boolean),
-                Column("created_at", DateTime),
-                extend_existing=True,
-            )
-
-        # clients
-        if "clients" in self.metadata.tables:
-            self.clients = self.metadata.tables["clients"]
-        else:
-            self.clients = Table(
-                "clients",
-                self.metadata,
-                Column("id", Integer, primary_key=True, autoincrement=True),
-                Column("client_id", String(255)),
-                Column("name", String(255)),
-                Column("status", String(50)),
-                Column("last_heartbeat", DateTime),
-                extend_existing=True,
-            )
+        self.training_rounds = Table(
+            "training_rounds",
+            self.metadata,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("round_number", Integer, nullable=False, unique=True),
+            Column("job_id", String(255)),
+            Column("status", String(50), nullable=False),
+            Column("num_clients", Integer),
+            Column("global_loss", Float),
+            Column("global_auc", Float),
+            Column("started_at", DateTime),
+            Column("completed_at", DateTime),
+        )
+
+        self.client_updates = Table(
+            "client_updates",
+            self.metadata,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("round_id", Integer, nullable=False),
+            Column("client_id", Integer, nullable=False),
+            Column("local_loss", Float),
+            Column("local_auc", Float),
+            Column("num_samples", Integer),
+            Column("euclidean_distance", Float),
+            Column("encryption_status", String(50)),
+            Column("submitted_at", DateTime, nullable=False),
+        )
+
+        self.round_metrics = Table(
+            "round_metrics",
+            self.metadata,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("round_id", Integer, nullable=False),
+            Column("aggregation_method", String(100)),
+            Column("weiszfeld_iterations", Integer),
+            Column("convergence_epsilon", Float),
+            Column("encryption_overhead_ms", Integer),
+            Column("aggregation_time_ms", Integer),
+            Column("poisoned_clients_detected", Integer, nullable=False),
+            Column("created_at", DateTime, nullable=False),
+        )
+
+        self.trust_scores = Table(
+            "trust_scores",
+            self.metadata,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("client_id", Integer, nullable=False),
+            Column("round_id", Integer, nullable=False),
+            Column("score", Float, nullable=False),
+            Column("deviation_avg", Float),
+            Column("is_flagged", Boolean, nullable=False),
+            Column("computed_at", DateTime, nullable=False),
+        )
+
+        self.clients = Table(
+            "clients",
+            self.metadata,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("client_id", String(255), nullable=False),
+            Column("name", String(255), nullable=False),
+            Column("status", String(50), nullable=False),
+            Column("last_heartbeat", DateTime),
+        )
+
+        # Statements are built once and executed with per-call parameter
+        # dicts. Rows are stamped by the database when they are inserted
+        # rather than carrying a client-side timestamp each.
+        self._client_update_insert = insert(self.client_updates).values(submitted_at=_utcnow())
+        self._trust_score_insert = insert(self.trust_scores).values(computed_at=_utcnow())
+        self._round_metric_insert = insert(self.round_metrics).values(created_at=_utcnow())
+        # SET columns come from the keys of the parameter dict.
+        self._round_update = update(self.training_rounds).where(
+            self.training_rounds.c.id == bindparam("b_round_id")
+        )
+        self._heartbeat_update = (
+            update(self.clients)
+            .where(self.clients.c.client_id == bindparam("b_client_id"))
+            .values(last_heartbeat=_utcnow(), status=bindparam("b_status"))
+        )
 
     # ------------------------------------------------------------------
     # Helper: look up a client by name
     # ------------------------------------------------------------------
 
-    def _get_client_id_by_name(self, session: Session, client_name: str) -> Optional[int]:
-        """Return the primary-key ``id`` for the client with *client_name*.
+    def _connection(self) -> Connection:
+        """Return the writer's long-lived connection, opening it on first use.
 
-        Returns ``None`` if not found.
+        Each write runs in its own ``begin()`` block on this connection
+        instead of checking a fresh Session out of the pool.
         """
-        try:
-            row = session.execute(
-                select(self.clients.c.id).where(self.clients.c.name == client_name)
-            ).first()
-            return row[0] if row else None
-        except Exception as exc:
-            logger.warning(f"Failed to look up client '{client_name}': {exc}")
-            return None
+        if self._conn is None or self._conn.closed:
+            self._conn = self.engine.connect()
+        return self._conn
+
+    def _client_id_cache_view(self) -> Dict[str, int]:
+        """Return the name -> id cache, emptying it once its TTL has passed."""
+        now = time.monotonic()
+        if now >= self._client_id_cache_expires:
+            self._client_id_cache.clear()
+            self._client_id_cache_expires = now + CLIENT_ID_CACHE_TTL_S
+        return self._client_id_cache
+
+    def _get_client_ids_by_name(
+        self, conn: Connection, client_names: Iterable[str]
+    ) -> Dict[str, int]:
+        """Resolve several client names to primary keys.
+
+        Cached names are answered directly; the rest are fetched with one
+        IN query. Names without a matching client are absent from the
+        result.
+        """
+        cache = self._client_id_cache_view()
+        names = set(client_names)
+        resolved = {name: cache[name] for name in names if name in cache}
+        missing = names.difference(resolved)
+        if missing:
+            rows = conn.execute(
+                select(self.clients.c.name, self.clients.c.id).where(
+                    self.clients.c.name.in_(missing)
+                )
+            ).all()
+            fetched = {name: pk for name, pk in rows}
+            cache.update(fetched)
+            resolved.update(fetched)
+        return resolved
+
+    @staticmethod
+    def _upsert_insert(conn: Connection):
+        """Return the dialect's ``insert`` construct supporting ON CONFLICT."""
+        return sqlite_insert if conn.dialect.name == "sqlite" else pg_insert
+
+    def _resolve_client_rows(
+        self, conn: Connection, rows: Iterable[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Swap each row's ``client_name`` for the matching ``client_id``.
+
+        Rows whose client is not in the ``clients`` table are dropped with
+        a warning.
+        """
+        rows = list(rows)
+        client_ids = self._get_client_ids_by_name(conn, (row["client_name"] for row in rows))
+        resolved = []
+        for row in rows:
+            values = dict(row)
+            client_pk = client_ids.get(values.pop("client_name"))
+            if client_pk is None:
+                logger.warning(f"Skipping unknown client '{row['client_name']}'")
+                continue
+            values["client_id"] = client_pk
+            resolved.append(values)
+        return resolved
 
     # ------------------------------------------------------------------
     # Public write methods
@@ -186,101 +365,102 @@ class DBWriter:
 
         If a row with the given *round_number* already exists, it is
         updated (UPSERT behaviour).  Otherwise a new row is inserted.
+        Relies on the unique index on ``training_rounds.round_number``.
 
         Returns:
             The primary-key ``id`` of the upserted row, or ``None`` on
             failure.
         """
-        session = Session(self.engine)
+        values = {
+            "round_number": round_number,
+            "status": status,
+            "num_clients": num_clients,
+        }
+        if job_id is not None:
+            values["job_id"] = job_id
+        if global_loss is not None:
+            values["global_loss"] = global_loss
+        if global_auc is not None:
+            values["global_auc"] = global_auc
+        if started_at is not None:
+            values["started_at"] = started_at
+        if completed_at is not None:
+            values["completed_at"] = completed_at
+
+        conn = self._connection()
+        # INSERT ... ON CONFLICT (round_number) DO UPDATE: one round-trip
+        # and no window between checking for the row and writing it. Only
+        # the fields passed in are overwritten on an existing round.
+        stmt = self._upsert_insert(conn)(self.training_rounds).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.training_rounds.c.round_number],
+            set_={key: stmt.excluded[key] for key in values if key != "round_number"},
+        ).returning(self.training_rounds.c.id)
         try:
-            # Check whether this round already exists
-            existing = session.execute(
-                select(self.training_rounds.c.id).where(
-                    self.training_rounds.c.round_number == round_number
-                )
-            ).first()
-
-            values = {
-                "round_number": round_number,
-                "status": status,
-                "num_clients": num_clients,
-            }
-            if job_id is not None:
-                values["job_id"] = job_id
-            if global_loss is not None:
-                values["global_loss"] = global_loss
-            if global_auc is not None:
-                values["global_auc"] = global_auc
-            if started_at is not None:
-                values["started_at"] = started_at
-            if completed_at is not None:
-                values["completed_at"] = completed_at
-
-            if existing:
-                # Update
-                session.execute(
-                    update(self.training_rounds)
-                    .where(self.training_rounds.c.id == existing[0])
-                    .values(**values)
-                )
-                session.commit()
-                return existing[0]
-            else:
-                # Insert
-                result = session.execute(
-                    insert(self.training_rounds).values(**values)
-                )
-                session.commit()
-                return result.inserted_primary_key[0]
+            with conn.begin():
+                return conn.execute(stmt).scalar_one()
         except Exception as exc:
-            session.rollback()
             logger.error(f"write_round failed: {exc}", exc_info=True)
             return None
-        finally:
-            session.close()
 
-    def write_client_update(
+    def update_round_completion(
         self,
         round_id: int,
-        client_name: str,
-        local_loss: float,
-        local_auc: float,
-        num_samples: int,
-        euclidean_distance: float,
-        encryption_status: str,
-    ) -> Optional[int]:
-        """Record a single client's contribution for a round.
+        status: str,
+        num_clients: int,
+        global_loss: Optional[float] = None,
+        global_auc: Optional[float] = None,
+        completed_at: Optional[datetime] = None,
+    ) -> bool:
+        """Finish a round created by :meth:`write_round`, by primary key.
 
-        The *client_name* is resolved to a ``client.id`` via the
-        ``clients`` table.
+        Unlike :meth:`write_round` this needs no conflict handling: the
+        row already exists, so it is a single UPDATE. Optional fields left
+        as ``None`` keep their stored values.
 
         Returns:
-            The inserted row's ``id``, or ``None`` on failure.
+            ``True`` if the update committed, ``False`` on failure.
         """
-        session = Session(self.engine)
+        values = {"status": status, "num_clients": num_clients}
+        if global_loss is not None:
+            values["global_loss"] = global_loss
+        if global_auc is not None:
+            values["global_auc"] = global_auc
+        if completed_at is not None:
+            values["completed_at"] = completed_at
+
+        conn = self._connection()
         try:
-            client_pk = self._get_client_id_by_name(session, client_name)
-
-            result = session.execute(
-                insert(self.client_updates).values(
-                    round_id=round_id,
-                    client_id=client_pk,
-                    local_loss=local_loss,
-                    local_auc=local_auc,
-                    num_samples=num_samples,
-                    euclidean_distance=euclidean_distance,
-                    encryption_status=encryption_status,
-                    submitted_at=datetime.utcnow(),
-                )
-            )
-            session.commit()
-            return result.inserted_primary_key[0]
+            with conn.begin():
+                conn.execute(self._round_update, {"b_round_id": round_id, **values})
+            return True
         except Exception as exc:
-            session.rollback()
-            logger.error(f"write_client_update failed: {exc}", exc_info=True)
-            return None
-        finally:
-            session.close()
+            logger.error(f"update_round_completion failed: {exc}", exc_info=True)
+            return False
+
+    def write_client_updates(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Record client contributions with a single executemany INSERT.
+
+        Args:
+            rows: One dict per update with ``round_id``, ``client_name``,
+                ``local_loss``, ``local_auc``, ``num_samples``,
+                ``euclidean_distance`` and ``encryption_status``. Each
+                *client_name* is resolved to a ``client.id`` via the
+                ``clients`` table.
+
+        Returns:
+            The number of rows inserted (``0`` on failure).
+        """
+        conn = self._connection()
+        try:
+            with conn.begin():
+                values = self._resolve_client_rows(conn, rows)
+                if values:
+                    conn.execute(self._client_update_insert, values)
+            return len(values)
+        except Exception as exc:
+            logger.error(f"write_client_updates failed: {exc}", exc_info=True)
+            return 0
 
     def write_round_metric(
         self,
@@ -297,63 +477,114 @@ class DBWriter:
         Returns:
             The inserted row's ``id``, or ``None`` on failure.
         """
-        session = Session(self.engine)
+        conn = self._connection()
         try:
-            result = session.execute(
-                insert(self.round_metrics).values(
-                    round_id=round_id,
-                    aggregation_method=aggregation_method,
-                    weiszfeld_iterations=weiszfeld_iterations,
-                    convergence_epsilon=convergence_epsilon,
-                    encryption_overhead_ms=encryption_overhead_ms,
-                    aggregation_time_ms=aggregation_time_ms,
-                    poisoned_clients_detected=poisoned_clients_detected,
+            with conn.begin():
+                result = conn.execute(
+                    self._round_metric_insert,
+                    {
+                        "round_id": round_id,
+                        "aggregation_method": aggregation_method,
+                        "weiszfeld_iterations": weiszfeld_iterations,
+                        "convergence_epsilon": convergence_epsilon,
+                        "encryption_overhead_ms": encryption_overhead_ms,
+                        "aggregation_time_ms": aggregation_time_ms,
+                        "poisoned_clients_detected": poisoned_clients_detected,
+                    },
                 )
-            )
-            session.commit()
-            return result.inserted_primary_key[0]
+                return result.inserted_primary_key[0]
         except Exception as exc:
-            session.rollback()
             logger.error(f"write_round_metric failed: {exc}", exc_info=True)
             return None
-        finally:
-            session.close()
 
-    def write_trust_score(
+    def write_trust_scores(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Write client trust scores with a single executemany INSERT.
+
+        Args:
+            rows: One dict per score with ``client_name``, ``round_id``,
+                ``score``, ``deviation_avg`` and ``is_flagged``.
+
+        Returns:
+            The number of rows inserted (``0`` on failure).
+        """
+        conn = self._connection()
+        try:
+            with conn.begin():
+                values = self._resolve_client_rows(conn, rows)
+                if values:
+                    conn.execute(self._trust_score_insert, values)
+            return len(values)
+        except Exception as exc:
+            logger.error(f"write_trust_scores failed: {exc}", exc_info=True)
+            return 0
+
+    def write_round_bundle(
         self,
-        client_name: str,
         round_id: int,
-        score: float,
-        deviation_avg: float,
-        is_flagged: bool,
-    ) -> Optional[int]:
-        """Write a trust score for a client in a given round.
+        round_values: Dict[str, Any],
+        metric_values: Dict[str, Any],
+        client_rows: List[Dict[str, Any]],
+    ) -> bool:
+        """Write everything produced by a completed round.
+
+        The round row update and its aggregation metrics are committed
+        synchronously in one transaction. The per-client updates and trust
+        scores are handed to the background writer, which batches them
+        into executemany INSERTs, so the round loop does not wait for
+        them. Client names are resolved in a single query; clients not
+        present in the ``clients`` table are skipped with a warning.
+
+        Args:
+            round_id: Primary key of the round (from :meth:`write_round`).
+            round_values: Columns to set on the ``training_rounds`` row.
+            metric_values: Columns for the ``round_metrics`` row, excluding
+                ``round_id``.
+            client_rows: One dict per client with ``client_name``,
+                ``local_loss``, ``local_auc``, ``num_samples``,
+                ``euclidean_distance``, ``encryption_status``, ``score``
+                and ``is_flagged``.
 
         Returns:
-            The inserted row's ``id``, or ``None`` on failure.
+            ``True`` if the round transaction committed and the client rows
+            were queued, ``False`` on failure.
         """
-        session = Session(self.engine)
+        conn = self._connection()
         try:
-            client_pk = self._get_client_id_by_name(session, client_name)
-
-            result = session.execute(
-                insert(self.trust_scores).values(
-                    client_id=client_pk,
-                    round_id=round_id,
-                    score=score,
-                    deviation_avg=deviation_avg,
-                    is_flagged=is_flagged,
-                    created_at=datetime.utcnow(),
-                )
-            )
-            session.commit()
-            return result.inserted_primary_key[0]
+            with conn.begin():
+                resolved = self._resolve_client_rows(conn, client_rows)
+                update_rows = [
+                    {
+                        "round_id": round_id,
+                        "client_id": row["client_id"],
+                        "local_loss": row["local_loss"],
+                        "local_auc": row["local_auc"],
+                        "num_samples": row["num_samples"],
+                        "euclidean_distance": row["euclidean_distance"],
+                        "encryption_status": row["encryption_status"],
+                    }
+                    for row in resolved
+                ]
+                trust_rows = [
+                    {
+                        "client_id": row["client_id"],
+                        "round_id": round_id,
+                        "score": row["score"],
+                        "deviation_avg": row["euclidean_distance"],
+                        "is_flagged": row["is_flagged"],
+                    }
+                    for row in resolved
+                ]
+
+                conn.execute(self._round_update, {"b_round_id": round_id, **round_values})
+                conn.execute(self._round_metric_insert, {"round_id": round_id, **metric_values})
+            # Queued only after the round commit, so the worker never
+            # references a round that was rolled back.
+            self._async_writer.submit(self._client_update_insert, update_rows)
+            self._async_writer.submit(self._trust_score_insert, trust_rows)
+            return True
         except Exception as exc:
-            session.rollback()
-            logger.error(f"write_trust_score failed: {exc}", exc_info=True)
-            return None
-        finally:
-            session.close()
+            logger.error(f"write_round_bundle failed: {exc}", exc_info=True)
+            return False
 
     def update_client_heartbeat(
         self,
@@ -370,30 +601,27 @@ class DBWriter:
                 ``clients`` table.
             status: New status string (e.g. ``"online"``, ``"offline"``).
         """
-        session = Session(self.engine)
+        conn = self._connection()
         try:
-            session.execute(
-                update(self.clients)
-                .where(self.clients.c.client_id == client_id_str)
-                .values(
-                    last_heartbeat=datetime.utcnow(),
-                    status=status,
+            with conn.begin():
+                conn.execute(
+                    self._heartbeat_update,
+                    {"b_client_id": client_id_str, "b_status": status},
                 )
-            )
-            session.commit()
         except Exception as exc:
-            session.rollback()
             logger.error(f"update_client_heartbeat failed: {exc}", exc_info=True)
-        finally:
-            session.close()
 
     # ------------------------------------------------------------------
     # Lifecycle
     # ------------------------------------------------------------------
 
     def close(self) -> None:
-        """Dispose of the SQLAlchemy engine and release all connections."""
+        """Drain queued writes, then close the connection and the engine."""
         try:
+            self._async_writer.close()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
             self.engine.dispose()
             logger.info("DBWriter engine disposed")
         except Exception as exc:
@@ -11,13 +11,23 @@ The model targets ChestX-ray14 multi-label classification (14 pathologies).
 from __future__ import annotations
 
 from collections import OrderedDict
-from typing import Dict, Iterator, Tuple
+from typing import Dict, Iterator, Optional, Tuple
 
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
 import torchvision.models as models
 
+# Allow TF32 tensor cores for fp32 matmuls/convs on Ampere+ GPUs.
+torch.set_float32_matmul_precision("high")
+
+# Classifier outputs are padded to a multiple of this so the head GEMM has
+# tensor-core friendly dimensions (14 ChestX-ray14 labels -> 16 rows).
+HEAD_OUT_ALIGN = 8
+
+_BODY_PREFIX_LEN = len("features.")
+_HEAD_PREFIX_LEN = len("classifier.")
+
 
 class SquareActivation(nn.Module):
     """Polynomial activation function: f(x) = x * x.
@@ -25,18 +35,38 @@ class SquareActivation(nn.Module):
     This activation is compatible with Homomorphic Encryption schemes
     (e.g. CKKS) because it only requires multiplication, which is a
     natively supported operation in HE.
+
+    Args:
+        inplace: Square the input in place, like ``nn.ReLU(inplace=True)``.
+            Only honoured when autograd is not recording the input: the
+            gradient ``2 * x`` needs the original values, so training
+            passes always allocate a new tensor.
     """
 
+    __constants__ = ["inplace"]
+
+    def __init__(self, inplace: bool = False) -> None:
+        super().__init__()
+        self.inplace = inplace
+
     def forward(self, x: torch.Tensor) -> torch.Tensor:
+        if self.inplace and not (torch.is_grad_enabled() and x.requires_grad):
+            return x.mul_(x)
         return x * x
 
+    def extra_repr(self) -> str:
+        return "inplace=True" if self.inplace else ""
+
 
 def replace_relu_with_square(model: nn.Module) -> nn.Module:
-    """Recursively replace every ``nn.ReLU`` (and ``nn.ReLU6``) in *model*
-    with :class:`SquareActivation`.
+    """Replace every ``nn.ReLU`` (and ``nn.ReLU6``) in *model* with
+    :class:`SquareActivation`.
 
-    The replacement is performed **in-place** on the module tree and the
-    mutated model is returned for convenience.
+    The ReLU paths are collected in one ``named_modules`` pass and then
+    swapped iteratively. The replacement is performed **in-place** on the
+    module tree and the mutated model is returned for convenience. The
+    ReLU's ``inplace`` flag carries over, and sites with the same flag share
+    one stateless :class:`SquareActivation` instance.
 
     Args:
         model: Any ``nn.Module`` whose sub-modules may contain ReLU layers.
@@ -44,11 +74,15 @@ def replace_relu_with_square(model: nn.Module) -> nn.Module:
     Returns:
         The same model object with all ReLU layers replaced.
     """
-    for name, module in model.named_children():
-        if isinstance(module, (nn.ReLU, nn.ReLU6)):
-            setattr(model, name, SquareActivation())
-        else:
-            replace_relu_with_square(module)
+    targets = [
+        (name, module.inplace)
+        for name, module in model.named_modules(remove_duplicate=False)
+        if name and isinstance(module, (nn.ReLU, nn.ReLU6))
+    ]
+    squares = {False: SquareActivation(), True: SquareActivation(inplace=True)}
+    for path, inplace in targets:
+        parent_path, _, attr = path.rpartition(".")
+        setattr(model.get_submodule(parent_path), attr, squares[inplace])
     return model
 
 
@@ -64,14 +98,35 @@ class DenseNetSquare(nn.Module):
     head (which is privacy-sensitive) is encrypted, while the much larger
     body is transmitted in plaintext.
 
+    The classifier has ``num_classes`` rounded up to :data:`HEAD_OUT_ALIGN`
+    outputs and :meth:`forward` slices off the extra logits. The padding
+    rows start at zero and receive no gradient, but they are part of the
+    head state dict, so exchanged and encrypted heads carry the padded
+    ``(16, 1024)`` weight.
+
     Args:
         num_classes: Number of output labels (default 14 for ChestX-ray14).
         pretrained: Whether to initialise from ImageNet-pretrained weights.
+        autocast: Run the body and classifier under bf16 autocast on CUDA.
+            Has no effect on CPU inputs.
+        compile_mode: If given, compile the body and the classifier with
+            ``torch.compile`` in this mode (e.g. ``"reduce-overhead"`` for
+            clients, ``"max-autotune"`` for server-side inference).
+            Compilation happens lazily on the first forward pass. Weights
+            are graph inputs, so loading new head or body weights does not
+            trigger a recompile.
     """
 
-    def __init__(self, num_classes: int = 14, pretrained: bool = True) -> None:
+    def __init__(
+        self,
+        num_classes: int = 14,
+        pretrained: bool = True,
+        autocast: bool = True,
+        compile_mode: Optional[str] = None,
+    ) -> None:
         super().__init__()
         self.num_classes = num_classes
+        self.autocast = autocast
 
         # Load the base DenseNet-121
         weights = models.DenseNet121_Weights.DEFAULT if pretrained else None
@@ -85,7 +140,16 @@ class DenseNetSquare(nn.Module):
 
         # Classifier (head) -- replace the original 1000-class head
         num_features = base_model.classifier.in_features
-        self.classifier = nn.Linear(num_features, num_classes)
+        padded_classes = -(-num_classes // HEAD_OUT_ALIGN) * HEAD_OUT_ALIGN
+        self.classifier = nn.Linear(num_features, padded_classes)
+        with torch.no_grad():
+            self.classifier.weight[num_classes:].zero_()
+            self.classifier.bias[num_classes:].zero_()
+
+        # Compile in place so state-dict keys keep their prefixes
+        if compile_mode is not None:
+            self.features.compile(mode=compile_mode)
+            self.classifier.compile(mode=compile_mode)
 
     # ------------------------------------------------------------------
     # Forward pass
@@ -102,12 +166,78 @@ class DenseNetSquare(nn.Module):
         Returns:
             Tensor of shape ``(B, num_classes)`` with values in ``[0, 1]``.
         """
-        features = self.features(x)
-        out = F.adaptive_avg_pool2d(features, (1, 1))
-        out = torch.flatten(out, 1)
-        out = self.classifier(out)
-        out = torch.sigmoid(out)
-        return out
+        return torch.sigmoid(self.logits(x))
+
+    def logits(self, x: torch.Tensor) -> torch.Tensor:
+        """Run the forward pass without the final sigmoid.
+
+        Use this with ``nn.BCEWithLogitsLoss``, which fuses the sigmoid
+        into a numerically stable loss. On CUDA the convolutions and the
+        classifier run under bf16 autocast; the logits are returned in
+        fp32.
+
+        Args:
+            x: Input tensor of shape ``(B, 3, H, W)``.
+
+        Returns:
+            Tensor of shape ``(B, num_classes)`` of unnormalised scores.
+        """
+        with torch.autocast(
+            device_type=x.device.type,
+            dtype=torch.bfloat16,
+            enabled=self.autocast and x.device.type == "cuda",
+        ):
+            features = self.features(x)
+            out = F.adaptive_avg_pool2d(features, (1, 1))
+            out = torch.flatten(out, 1)
+            out = self.classifier(out)[:, : self.num_classes]
+        return out.float()
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def export_onnx(self, path: str, example_input: Optional[torch.Tensor] = None) -> None:
+        """Export the model to an ONNX graph with a dynamic batch axis.
+
+        The graph takes ``x`` of shape ``(batch, 3, H, W)`` and returns the
+        sigmoid probabilities ``y``; every :class:`SquareActivation` becomes
+        a single ``Mul`` node. Export from a model built without
+        ``compile_mode``. The model is exported in eval mode and its
+        previous mode is restored afterwards.
+
+        The graph can be compiled into a TensorRT engine, for example::
+
+            trtexec --onnx=densenet_square.onnx --fp16 \
+                --minShapes=x:1x3x224x224 --optShapes=x:8x3x224x224 \
+                --maxShapes=x:32x3x224x224 --saveEngine=densenet_square.trt
+
+        INT8 engines (``--int8``) additionally need a calibration cache
+        built from representative X-ray batches.
+
+        Args:
+            path: Destination ``.onnx`` file.
+            example_input: Tracing input; defaults to one ``224x224`` image
+                on the model's device.
+        """
+        if example_input is None:
+            example_input = torch.zeros(
+                (1, 3, 224, 224), device=next(self.parameters()).device
+            )
+        was_training = self.training
+        self.eval()
+        try:
+            torch.onnx.export(
+                self,
+                example_input,
+                path,
+                opset_version=17,
+                input_names=["x"],
+                output_names=["y"],
+                dynamic_axes={"x": {0: "batch"}, "y": {0: "batch"}},
+            )
+        finally:
+            self.train(was_training)
 
     # ------------------------------------------------------------------
     # Body / Head property accessors
@@ -143,28 +273,23 @@ class DenseNetSquare(nn.Module):
 
     def get_body_state_dict(self) -> OrderedDict:
         """Return a state dict containing only the body (features) parameters."""
-        return OrderedDict(
-            (f"features.{k}", v)
-            for k, v in self.features.state_dict().items()
-        )
+        # state_dict builds the prefixed keys itself, no second dict needed
+        return self.features.state_dict(prefix="features.")
 
     def get_head_state_dict(self) -> OrderedDict:
         """Return a state dict containing only the head (classifier) parameters."""
-        return OrderedDict(
-            (f"classifier.{k}", v)
-            for k, v in self.classifier.state_dict().items()
-        )
+        return self.classifier.state_dict(prefix="classifier.")
 
     def load_body_state_dict(self, state_dict: Dict[str, torch.Tensor]) -> None:
         """Load parameters into the body only.
 
         Keys in *state_dict* must be prefixed with ``features.``.
         """
-        body_sd = OrderedDict()
-        for k, v in state_dict.items():
-            # Strip the 'features.' prefix if present
-            key = k.replace("features.", "", 1) if k.startswith("features.") else k
-            body_sd[key] = v
+        # Strip the 'features.' prefix if present
+        body_sd = {
+            k[_BODY_PREFIX_LEN:] if k.startswith("features.") else k: v
+            for k, v in state_dict.items()
+        }
         self.features.load_state_dict(body_sd, strict=True)
 
     def load_head_state_dict(self, state_dict: Dict[str, torch.Tensor]) -> None:
@@ -172,8 +297,8 @@ class DenseNetSquare(nn.Module):
 
         Keys in *state_dict* must be prefixed with ``classifier.``.
         """
-        head_sd = OrderedDict()
-        for k, v in state_dict.items():
-            key = k.replace("classifier.", "", 1) if k.startswith("classifier.") else k
-            head_sd[key] = v
+        head_sd = {
+            k[_HEAD_PREFIX_LEN:] if k.startswith("classifier.") else k: v
+            for k, v in state_dict.items()
+        }
         self.classifier.load_state_dict(head_sd, strict=True)
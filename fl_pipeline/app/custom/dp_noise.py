@@ -23,7 +23,7 @@ from __future__ import annotations
 
 import math
 from collections import OrderedDict
-from typing import Dict
+from typing import Dict, List, Tuple
 
 import torch
 
@@ -57,6 +57,7 @@ class DPNoise:
         self.sensitivity = sensitivity
         self.max_grad_norm = max_grad_norm
         self.sigma = self.compute_sigma()
+        self._generators: Dict[torch.device, torch.Generator] = {}
 
     # ------------------------------------------------------------------
     # Core methods
@@ -80,21 +81,25 @@ class DPNoise:
         The clipping is applied *per-tensor*: each tensor is independently
         rescaled if its norm exceeds the threshold.
 
+        Norms and clip factors stay on the tensors' device (no ``.item()``
+        sync), and the whole state dict is handled by multi-tensor
+        ``_foreach`` kernels. Floating-point tensors keep their dtype;
+        integer buffers (e.g. BatchNorm ``num_batches_tracked``) are not
+        gradients and are passed through unchanged.
+
         Args:
             state_dict: Mapping of parameter names to tensors.
 
         Returns:
             A new state dict with clipped tensors.
         """
-        clipped = OrderedDict()
-        for name, tensor in state_dict.items():
-            norm = torch.norm(tensor.float(), p=2)
-            clip_factor = min(1.0, self.max_grad_norm / (norm.item() + 1e-12))
-            clipped[name] = tensor.float() * clip_factor
-        return clipped
+        keys, tensors = self._floating(state_dict)
+        return self._merge(state_dict, keys, self._clip(tensors))
 
     def add_noise(self, state_dict: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
-        """Add Gaussian noise  N(0, sigma^2)  to every parameter tensor.
+        """Add Gaussian noise  N(0, sigma^2)  to every floating-point tensor.
+
+        Integer buffers are passed through unchanged.
 
         Args:
             state_dict: Mapping of parameter names to tensors.
@@ -102,11 +107,11 @@ class DPNoise:
         Returns:
             A new state dict with noise added.
         """
-        noised = OrderedDict()
-        for name, tensor in state_dict.items():
-            noise = torch.randn_like(tensor.float()) * self.sigma
-            noised[name] = tensor.float() + noise
-        return noised
+        keys, tensors = self._floating(state_dict)
+        if not tensors:
+            return OrderedDict(state_dict)
+        noised = torch._foreach_add(tensors, self._noise_like(tensors), alpha=self.sigma)
+        return self._merge(state_dict, keys, noised)
 
     def apply(self, state_dict: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
         """Clip gradients and then add calibrated Gaussian noise.
@@ -115,6 +120,12 @@ class DPNoise:
         1. Clip each tensor to ``max_grad_norm``.
         2. Add  N(0, sigma^2)  noise.
 
+        The noise buffer is the only allocation: it is scaled by sigma and
+        the clipped tensors are accumulated into it in place
+        (``sigma * noise + factor * t``), so the input tensors -- which
+        may alias live model parameters -- are never modified and never
+        copied separately. Integer buffers are passed through unchanged.
+
         Args:
             state_dict: Mapping of parameter names to tensors.
 
@@ -122,8 +133,81 @@ class DPNoise:
             A new state dict that satisfies (epsilon, delta)-DP for this
             round.
         """
-        clipped = self.clip_gradients(state_dict)
-        return self.add_noise(clipped)
+        keys, tensors = self._floating(state_dict)
+        if not tensors:
+            return OrderedDict(state_dict)
+        noised = self._noise_like(tensors)
+        torch._foreach_mul_(noised, self.sigma)
+        torch._foreach_addcmul_(noised, tensors, self._clip_factors(tensors))
+        return self._merge(state_dict, keys, noised)
+
+    # ------------------------------------------------------------------
+    # Multi-tensor helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _floating(state_dict: Dict[str, torch.Tensor]) -> Tuple[List[str], List[torch.Tensor]]:
+        """Return the keys and tensors of the state dict's floating-point entries."""
+        keys = [k for k, t in state_dict.items() if t.is_floating_point()]
+        return keys, [state_dict[k] for k in keys]
+
+    @staticmethod
+    def _merge(
+        state_dict: Dict[str, torch.Tensor],
+        keys: List[str],
+        tensors: List[torch.Tensor],
+    ) -> Dict[str, torch.Tensor]:
+        """Return *state_dict* in its original order with *keys* replaced by *tensors*."""
+        merged = OrderedDict(state_dict)
+        merged.update(zip(keys, tensors))
+        return merged
+
+    def _clip_factors(self, tensors: List[torch.Tensor]) -> List[torch.Tensor]:
+        """Return each tensor's clip factor as a 0-d device tensor."""
+        norms = torch.stack([n.float() for n in torch._foreach_norm(tensors)])
+        factors = (self.max_grad_norm / (norms + 1e-12)).clamp_(max=1.0)
+        return list(factors.unbind())
+
+    def _clip(self, tensors: List[torch.Tensor]) -> List[torch.Tensor]:
+        """Return clipped copies of *tensors* using two multi-tensor kernels."""
+        if not tensors:
+            return []
+        return list(torch._foreach_mul(tensors, self._clip_factors(tensors)))
+
+    def _generator(self, device: torch.device) -> torch.Generator:
+        """Return this mechanism's RNG for *device*, creating it on first use.
+
+        Each generator is seeded once from OS entropy, so the noise does
+        not depend on (or disturb) the global torch seed used for training.
+        """
+        gen = self._generators.get(device)
+        if gen is None:
+            gen = torch.Generator(device=device)
+            gen.seed()
+            self._generators[device] = gen
+        return gen
+
+    def _noise_like(self, tensors: List[torch.Tensor]) -> List[torch.Tensor]:
+        """Draw standard-normal noise matching each tensor, on its device.
+
+        One ``randn`` call fills a flat buffer per ``(device, dtype)``
+        group, which is then split into views shaped like the tensors, so
+        a state dict of hundreds of small tensors costs a single RNG
+        launch in the common single-device case.
+        """
+        groups: Dict[Tuple[torch.device, torch.dtype], List[int]] = {}
+        for i, t in enumerate(tensors):
+            groups.setdefault((t.device, t.dtype), []).append(i)
+
+        noise: List[torch.Tensor] = [None] * len(tensors)  # type: ignore[list-item]
+        for (device, dtype), indices in groups.items():
+            numels = [tensors[i].numel() for i in indices]
+            flat = torch.randn(
+                sum(numels), dtype=dtype, device=device, generator=self._generator(device)
+            )
+            for i, part in zip(indices, flat.split(numels)):
+                noise[i] = part.view(tensors[i].shape)
+        return noise
 
     # ------------------------------------------------------------------
     # Privacy accounting
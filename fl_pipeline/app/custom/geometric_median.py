@@ -25,10 +25,10 @@ coincides with one of the input points.  We handle the degenerate case
 
 from __future__ import annotations
 
+import math
 from collections import OrderedDict
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-import numpy as np
 import torch
 
 
@@ -37,13 +37,32 @@ class GeometricMedianAggregator:
 
     Args:
         max_iter: Maximum number of Weiszfeld iterations.
-        eps: Convergence threshold -- stop when the update moves less
-            than *eps* in L2 norm.
+        eps: Relative convergence threshold -- stop when the update moves
+            less than *eps* times the L2 norm of the current estimate.
+        device: Device the Weiszfeld iterations run on. Defaults to CUDA
+            when available, otherwise CPU. Aggregated tensors are always
+            returned on the CPU.
+
+    Consecutive :meth:`aggregate` calls over the same parameter layout
+    warm-start Weiszfeld from the previous median, which is usually
+    within a few iterations of the new one since the global model drifts
+    slowly between rounds.
     """
 
-    def __init__(self, max_iter: int = 100, eps: float = 1e-5) -> None:
+    def __init__(
+        self,
+        max_iter: int = 100,
+        eps: float = 1e-5,
+        device: Optional[torch.device] = None,
+    ) -> None:
         self.max_iter = max_iter
         self.eps = eps
+        if device is None:
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.device = torch.device(device)
+        # Warm start for the next round, valid only for the same layout
+        self._last_median: Optional[torch.Tensor] = None
+        self._last_shape_sig: Optional[Tuple[Tuple[str, torch.Size], ...]] = None
 
     # ------------------------------------------------------------------
     # Public API
@@ -71,33 +90,38 @@ class GeometricMedianAggregator:
         """
         if not client_updates:
             raise ValueError("client_updates must be a non-empty list")
+        return self.aggregate_stacked(self.stack_state_dicts(client_updates))
+
+    def aggregate_stacked(self, stacked: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+        """Aggregate client parameters given as one stacked tensor per key.
 
-        if len(client_updates) == 1:
+        Args:
+            stacked: Maps each parameter name to a ``(num_clients, *shape)``
+                tensor, as built by :meth:`stack_state_dicts`.
+
+        Returns:
+            An aggregated state dict representing the geometric median.
+        """
+        if not stacked:
+            raise ValueError("stacked must map at least one parameter")
+
+        if next(iter(stacked.values())).shape[0] == 1:
             # Trivial case -- single client, just return a copy
-            return OrderedDict(
-                (k, v.clone()) for k, v in client_updates[0].items()
-            )
+            return OrderedDict((k, v[0].clone()) for k, v in stacked.items())
 
         # Collect the ordered keys and their shapes for reconstruction
-        param_keys: List[str] = list(client_updates[0].keys())
-        param_shapes: List[torch.Size] = [
-            client_updates[0][k].shape for k in param_keys
-        ]
-        param_numels: List[int] = [
-            client_updates[0][k].numel() for k in param_keys
-        ]
-
-        # Flatten each client's parameters into a single numpy vector
-        points = np.stack(
-            [
-                self._flatten_state_dict(sd, param_keys)
-                for sd in client_updates
-            ],
-            axis=0,
-        )  # shape: (num_clients, D)
-
-        # Run Weiszfeld
-        median_flat, _num_iters = self._weiszfeld(points)
+        param_keys: List[str] = list(stacked.keys())
+        param_shapes: List[torch.Size] = [stacked[k].shape[1:] for k in param_keys]
+        param_numels: List[int] = [stacked[k][0].numel() for k in param_keys]
+
+        points = self._flatten_stacked(stacked, param_keys, self.device)  # (num_clients, D)
+
+        # Run Weiszfeld, starting from last round's median when it fits
+        shape_sig = tuple(zip(param_keys, param_shapes))
+        init = self._last_median if shape_sig == self._last_shape_sig else None
+        median_flat, _num_iters = self._weiszfeld(points, init)
+        self._last_median = median_flat
+        self._last_shape_sig = shape_sig
 
         # Reconstruct the state dict from the flat median vector
         aggregated = self._unflatten_to_state_dict(
@@ -120,66 +144,124 @@ class GeometricMedianAggregator:
             client_updates: List of client state dicts.
             median: The aggregated (geometric median) state dict.
 
+        Returns:
+            A list of scalar distances, one per client.
+        """
+        return self.compute_distances_stacked(self.stack_state_dicts(client_updates), median)
+
+    def compute_distances_stacked(
+        self,
+        stacked: Dict[str, torch.Tensor],
+        median: Dict[str, torch.Tensor],
+    ) -> List[float]:
+        """Like :meth:`compute_distances`, for stacked client parameters.
+
+        Args:
+            stacked: Maps each parameter name to a ``(num_clients, *shape)``
+                tensor.
+            median: The aggregated (geometric median) state dict.
+
         Returns:
             A list of scalar distances, one per client.
         """
         param_keys = list(median.keys())
-        median_flat = self._flatten_state_dict(median, param_keys)
+        median_flat = self._flatten_state_dict(median, param_keys, self.device)
+        points = self._flatten_stacked(stacked, param_keys, self.device)
+        return torch.linalg.vector_norm(points - median_flat, dim=1).tolist()
 
-        distances: List[float] = []
-        for sd in client_updates:
-            client_flat = self._flatten_state_dict(sd, param_keys)
-            dist = float(np.linalg.norm(client_flat - median_flat))
-            distances.append(dist)
-        return distances
+    @staticmethod
+    def stack_state_dicts(
+        client_updates: List[Dict[str, torch.Tensor]],
+    ) -> Dict[str, torch.Tensor]:
+        """Stack per-client state dicts into one ``(num_clients, *shape)`` tensor per key."""
+        return {
+            k: torch.stack([sd[k] for sd in client_updates])
+            for k in client_updates[0].keys()
+        }
 
     # ------------------------------------------------------------------
     # Weiszfeld core
     # ------------------------------------------------------------------
 
-    def _weiszfeld(self, points: np.ndarray) -> Tuple[np.ndarray, int]:
+    def _weiszfeld(
+        self,
+        points: torch.Tensor,
+        init: Optional[torch.Tensor] = None,
+    ) -> Tuple[torch.Tensor, int]:
         """Run Weiszfeld's iterative algorithm on a set of points.
 
+        Every iterate after the first is a convex combination
+        ``y = a @ points`` of the inputs, so the iteration is carried out on
+        the ``(n,)`` coefficients ``a`` alone. With the Gram matrix
+        ``G = points @ points.T``, the distances are
+        ``||x_i||^2 - 2 (G a)_i + a @ G @ a`` and the shift between iterates
+        is a quadratic form in ``G`` too. After one GEMM for ``G``, each
+        iteration costs ``O(n^2)`` and is independent of ``D``. The median is
+        formed with a single GEMV at the end. The small ``n``-dimensional
+        loop runs in float64 on the CPU, with no device syncs.
+
+        The points are centred on their mean first. The median is
+        translation-equivariant, and centring keeps the expansion from
+        cancelling catastrophically when the parameters are large relative
+        to their spread.
+
         Args:
-            points: Array of shape ``(num_clients, D)`` where each row
+            points: Tensor of shape ``(num_clients, D)`` where each row
                 is a flattened parameter vector.
+            init: Optional ``(D,)`` starting estimate; defaults to the
+                componentwise mean.
 
         Returns:
             A tuple ``(median_vector, num_iterations)`` where
             *median_vector* has shape ``(D,)`` and *num_iterations* is
             the number of iterations actually performed.
         """
-        # Initialise the estimate as the componentwise mean
-        y = np.mean(points, axis=0)
-
-        for iteration in range(1, self.max_iter + 1):
-            # Compute distances from the current estimate to each point
-            diffs = points - y[np.newaxis, :]  # (n, D)
-            distances = np.linalg.norm(diffs, axis=1)  # (n,)
-
-            # Compute weights = 1 / distance, handling zero distances
-            # If a point coincides with the current estimate, assign a
-            # very large but finite weight (effectively snapping to it).
-            weights = np.where(
-                distances > 1e-12,
-                1.0 / distances,
-                1e12,
-            )  # (n,)
-
-            # Weighted average
-            total_weight = np.sum(weights)
-            y_new = np.sum(
-                weights[:, np.newaxis] * points, axis=0
-            ) / total_weight
-
-            # Check convergence
-            shift = np.linalg.norm(y_new - y)
-            y = y_new
-
-            if shift < self.eps:
-                return y, iteration
-
-        return y, self.max_iter
+        center = points.mean(dim=0)
+        points = points - center
+        gram = (points @ points.T).double().cpu()  # (n, n)
+        sq_norms = gram.diagonal().clone()  # ||x_i||^2
+        x_dot_c = (points @ center).double().cpu()  # <x_i, center>
+        center_sq = (center @ center).item()
+
+        # The current estimate is tracked through <x_i, y> and ||y||^2.
+        # Without a warm start, begin at the componentwise mean, i.e. the
+        # origin of the centred points.
+        if init is None:
+            x_dot_y = torch.zeros_like(sq_norms)
+            y_sq = 0.0
+        else:
+            y0 = init - center
+            x_dot_y = (points @ y0).double().cpu()
+            y_sq = (y0 @ y0).item()
+
+        coeffs: Optional[torch.Tensor] = None
+        num_iters = 0
+        for num_iters in range(1, self.max_iter + 1):
+            # Distances from the current estimate to each point
+            distances = (sq_norms - 2.0 * x_dot_y + y_sq).clamp_min(0.0).sqrt()  # (n,)
+
+            # Weights = 1 / distance. If a point coincides with the current
+            # estimate, clamping gives it a very large but finite weight
+            # (effectively snapping to it).
+            weights = distances.clamp_min(1e-12).reciprocal()  # (n,)
+
+            # Weighted average, as coefficients over the points
+            new_coeffs = weights / weights.sum()
+            new_x_dot_y = gram @ new_coeffs
+            new_y_sq = (new_coeffs @ new_x_dot_y).item()
+
+            # Check convergence relative to ||y_new + center||
+            shift = math.sqrt(max(new_y_sq - 2.0 * (new_coeffs @ x_dot_y).item() + y_sq, 0.0))
+            norm = math.sqrt(max(new_y_sq + 2.0 * (new_coeffs @ x_dot_c).item() + center_sq, 0.0))
+            coeffs, x_dot_y, y_sq = new_coeffs, new_x_dot_y, new_y_sq
+
+            if shift < self.eps * (norm + 1e-12):
+                break
+
+        if coeffs is None:
+            return (center if init is None else init.clone()), num_iters
+        median = coeffs.to(device=points.device, dtype=points.dtype) @ points + center
+        return median, num_iters
 
     # ------------------------------------------------------------------
     # Utility helpers
@@ -189,26 +271,46 @@ class GeometricMedianAggregator:
     def _flatten_state_dict(
         state_dict: Dict[str, torch.Tensor],
         keys: List[str],
-    ) -> np.ndarray:
-        """Flatten a state dict's tensors into a single 1-D numpy array."""
-        parts = [
-            state_dict[k].detach().cpu().float().numpy().ravel()
-            for k in keys
-        ]
-        return np.concatenate(parts)
+        device: Optional[torch.device] = None,
+    ) -> torch.Tensor:
+        """Flatten a state dict's tensors into a single 1-D float32 tensor.
+
+        The tensors are concatenated on their own device first, so the
+        float conversion and any transfer to *device* happen once for the
+        whole dict.
+        """
+        flat = torch.cat([state_dict[k].detach().reshape(-1) for k in keys])
+        return flat.to(device=device, dtype=torch.float32)
+
+    @staticmethod
+    def _flatten_stacked(
+        stacked: Dict[str, torch.Tensor],
+        keys: List[str],
+        device: Optional[torch.device] = None,
+    ) -> torch.Tensor:
+        """Flatten stacked parameters into a ``(num_clients, D)`` float32 tensor.
+
+        Row *i* matches ``_flatten_state_dict`` of client *i*.
+        """
+        flat = torch.cat(
+            [stacked[k].detach().reshape(stacked[k].shape[0], -1) for k in keys], dim=1
+        )
+        return flat.to(device=device, dtype=torch.float32)
 
     @staticmethod
     def _unflatten_to_state_dict(
-        flat: np.ndarray,
+        flat: torch.Tensor,
         keys: List[str],
         shapes: List[torch.Size],
         numels: List[int],
     ) -> OrderedDict:
-        """Reconstruct a state dict from a flat numpy array."""
-        result = OrderedDict()
-        offset = 0
-        for key, shape, numel in zip(keys, shapes, numels):
-            arr = flat[offset : offset + numel].copy()
-            result[key] = torch.tensor(arr, dtype=torch.float32).reshape(shape)
-            offset += numel
-        return result
+        """Reconstruct a CPU state dict from a flat tensor.
+
+        The vector is moved to the host once and split into views, so
+        every returned tensor shares that single buffer.
+        """
+        flat_cpu = flat.to(device="cpu", dtype=torch.float32)
+        return OrderedDict(
+            (key, part.reshape(shape))
+            for key, shape, part in zip(keys, shapes, flat_cpu.split(numels))
+        )
@@ -12,32 +12,82 @@ numbers, making it suitable for neural-network weight aggregation.
 from __future__ import annotations
 
 import io
-from typing import Dict, Optional, Tuple
+import math
+import os
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import tenseal as ts
 import torch
 
 
-def create_ckks_context() -> ts.Context:
+# State-dict key under which :meth:`SelectiveHE.encrypt_head_packed` output
+# travels. It keeps the head prefix so it is routed with the head tensors.
+PACKED_HEAD_KEY = "classifier.__packed__"
+
+# CKKS parameters per supported multiplicative depth:
+# (poly_modulus_degree, coeff_mod_bit_sizes, log2(global_scale)).
+# Every chain stays within SEAL's 128-bit security bound for its degree
+# (109 bits at 4096, 218 bits at 8192).
+_CKKS_PARAMS: Dict[int, Tuple[int, List[int], int]] = {
+    0: (4096, [54, 55], 40),
+    1: (4096, [39, 30, 40], 30),
+    2: (8192, [60, 40, 40, 60], 40),
+}
+
+
+def create_ckks_context(
+    mult_depth: int = 1,
+    n_threads: Optional[int] = None,
+    galois_keys: bool = False,
+) -> ts.Context:
     """Create and return a TenSEAL CKKS encryption context.
 
-    Parameters chosen for a balance between security and performance:
+    The smallest ring that supports *mult_depth* is used:
+
+    * ``mult_depth=0`` -- ``poly_modulus_degree = 4096``, ``[54, 55]``,
+      scale ``2**40``. Ciphertext additions only; averages are formed by
+      dividing after decryption.
+    * ``mult_depth=1`` -- ``poly_modulus_degree = 4096``, ``[39, 30, 40]``,
+      scale ``2**30``. One plaintext/scalar multiply, enough for an
+      encrypted weighted average (~1e-5 absolute error).
+    * ``mult_depth=2`` -- ``poly_modulus_degree = 8192``,
+      ``[60, 40, 40, 60]``, scale ``2**40``.
+
+    All settings give ~128-bit security. Degree 4096 halves the
+    ciphertext size and makes each NTT roughly 4x cheaper than 8192.
 
-    * ``poly_modulus_degree = 8192`` -- ~128-bit security.
-    * ``coeff_mod_bit_sizes = [60, 40, 40, 60]`` -- supports one
-      multiplication depth, sufficient for weighted averaging.
-    * ``global_scale = 2**40`` -- precision for float32 weights.
+    Vectors longer than one ciphertext's slots are split into several
+    ciphertexts, which TenSEAL encrypts and operates on in parallel on
+    its own C++ thread pool. TenSEAL holds the GIL while encrypting, so
+    this is the way to use multiple cores (a Python thread pool is not).
+
+    Args:
+        mult_depth: Number of multiplications the ciphertexts must support.
+        n_threads: Size of TenSEAL's thread pool; defaults to the number
+            of CPUs.
+        galois_keys: Also generate Galois (rotation) keys. Only slot
+            rotations (``sum``, ``dot``, ``matmul``) need them; encrypting,
+            adding and scaling head weights does not, so they are skipped
+            by default to save key generation time and context size.
 
     Returns:
         A ready-to-use :class:`tenseal.Context`.
     """
+    if mult_depth not in _CKKS_PARAMS:
+        raise ValueError(
+            f"Unsupported mult_depth {mult_depth}; expected one of {sorted(_CKKS_PARAMS)}"
+        )
+    poly_modulus_degree, coeff_mod_bit_sizes, log_scale = _CKKS_PARAMS[mult_depth]
     context = ts.context(
         ts.SCHEME_TYPE.CKKS,
-        poly_modulus_degree=8192,
-        coeff_mod_bit_sizes=[60, 40, 40, 60],
+        poly_modulus_degree=poly_modulus_degree,
+        coeff_mod_bit_sizes=coeff_mod_bit_sizes,
+        n_threads=n_threads or os.cpu_count() or 1,
     )
-    context.global_scale = 2**40
-    context.generate_galois_keys()
+    context.global_scale = 2**log_scale
+    if galois_keys:
+        context.generate_galois_keys()
     return context
 
 
@@ -65,7 +115,7 @@ class SelectiveHE:
     def encrypt_head(self, state_dict: Dict[str, torch.Tensor]) -> Dict[str, bytes]:
         """Encrypt every tensor in *state_dict* (the classifier head).
 
-        Each tensor is flattened to a 1-D list, encrypted as a
+        Each tensor is flattened to a 1-D array, encrypted as a
         :class:`tenseal.CKKSVector`, and serialised to ``bytes``.
 
         Args:
@@ -74,12 +124,66 @@ class SelectiveHE:
         Returns:
             A dict mapping the same parameter names to encrypted byte strings.
         """
-        encrypted: Dict[str, bytes] = {}
+        return self.serialize_head(self.encrypt_head_inmem(state_dict))
+
+    def encrypt_head_inmem(
+        self, state_dict: Dict[str, torch.Tensor]
+    ) -> Dict[str, ts.CKKSVector]:
+        """Like :meth:`encrypt_head`, but keep the ciphertexts in memory.
+
+        Use this when the encrypted head is combined locally (see
+        :meth:`aggregate_encrypted`) before it is transmitted, so the
+        vectors are serialised once at the transport boundary rather than
+        round-tripped through bytes.
+
+        Args:
+            state_dict: Mapping of parameter names to ``torch.Tensor`` values.
+
+        Returns:
+            A dict mapping the same parameter names to
+            :class:`tenseal.CKKSVector` objects.
+        """
+        encrypted: Dict[str, ts.CKKSVector] = {}
         for name, tensor in state_dict.items():
             self._shapes[name] = tensor.shape
-            encrypted[name] = self.encrypt_tensor(tensor)
+            encrypted[name] = self._encrypt_vector(tensor)
         return encrypted
 
+    @staticmethod
+    def aggregate_encrypted(
+        encrypted_heads: List[Dict[str, ts.CKKSVector]],
+        average: bool = True,
+    ) -> Dict[str, ts.CKKSVector]:
+        """Combine several in-memory encrypted heads without decrypting.
+
+        Args:
+            encrypted_heads: Outputs of :meth:`encrypt_head_inmem`, all
+                with the same keys and encrypted under the same context.
+            average: Scale the sum by ``1 / len(encrypted_heads)``. This
+                uses the context's single plaintext-multiplication level.
+
+        Returns:
+            A dict mapping each parameter name to the summed (or averaged)
+            :class:`tenseal.CKKSVector`.
+        """
+        if not encrypted_heads:
+            raise ValueError("encrypted_heads must be a non-empty list")
+        scale = 1.0 / len(encrypted_heads)
+        aggregated: Dict[str, ts.CKKSVector] = {}
+        for name, first in encrypted_heads[0].items():
+            acc = first.copy()
+            for head in encrypted_heads[1:]:
+                acc += head[name]
+            if average and len(encrypted_heads) > 1:
+                acc *= scale
+            aggregated[name] = acc
+        return aggregated
+
+    @staticmethod
+    def serialize_head(encrypted: Dict[str, ts.CKKSVector]) -> Dict[str, bytes]:
+        """Serialise in-memory ciphertexts for transmission."""
+        return {name: vector.serialize() for name, vector in encrypted.items()}
+
     def decrypt_head(self, encrypted_dict: Dict[str, bytes]) -> Dict[str, torch.Tensor]:
         """Decrypt an encrypted head back into ``torch.Tensor`` values.
 
@@ -104,6 +208,50 @@ class SelectiveHE:
             decrypted[name] = self.decrypt_tensor(enc_bytes, tuple(shape))
         return decrypted
 
+    def encrypt_head_packed(self, state_dict: Dict[str, torch.Tensor]) -> bytes:
+        """Encrypt the whole head as a single packed CKKS vector.
+
+        All tensors are flattened and concatenated in *state_dict* order,
+        so the head costs one encryption (and one set of NTTs) instead of
+        one per tensor, and small tensors such as the bias share slots
+        with the weight. Shapes are recorded as in :meth:`encrypt_head`.
+
+        Args:
+            state_dict: Mapping of parameter names to ``torch.Tensor`` values.
+
+        Returns:
+            The serialised packed :class:`tenseal.CKKSVector`.
+        """
+        self.register_shapes(state_dict)
+        flat = torch.cat([t.detach().reshape(-1) for t in state_dict.values()])
+        return self.encrypt_tensor(flat)
+
+    def decrypt_head_packed(self, encrypted_bytes: bytes) -> Dict[str, torch.Tensor]:
+        """Decrypt the output of :meth:`encrypt_head_packed`.
+
+        The vector is decrypted once and sliced into tensors following
+        the order and shapes of the shape registry, which must match the
+        encryptor's state dict (e.g. via :meth:`register_shapes` on the
+        same model head).
+
+        Args:
+            encrypted_bytes: Output of :meth:`encrypt_head_packed`.
+
+        Returns:
+            A dict mapping parameter names to reconstructed tensors.
+        """
+        if not self._shapes:
+            raise ValueError(
+                "No recorded shapes to unpack the head with. "
+                "Call encrypt_head_packed() or register_shapes() first."
+            )
+        numels = [math.prod(shape) for shape in self._shapes.values()]
+        flat = self.decrypt_tensor(encrypted_bytes, (sum(numels),))
+        return {
+            name: part.reshape(shape)
+            for (name, shape), part in zip(self._shapes.items(), flat.split(numels))
+        }
+
     def encrypt_tensor(self, tensor: torch.Tensor) -> bytes:
         """Encrypt a single tensor and return the serialised ciphertext.
 
@@ -113,9 +261,7 @@ class SelectiveHE:
         Returns:
             Serialised :class:`tenseal.CKKSVector` as ``bytes``.
         """
-        flat = tensor.detach().cpu().float().flatten().tolist()
-        encrypted_vector = ts.ckks_vector(self.context, flat)
-        return encrypted_vector.serialize()
+        return self._encrypt_vector(tensor).serialize()
 
     def decrypt_tensor(self, encrypted_bytes: bytes, shape: Tuple[int, ...]) -> torch.Tensor:
         """Decrypt serialised bytes back into a ``torch.Tensor``.
@@ -129,12 +275,17 @@ class SelectiveHE:
         """
         encrypted_vector = ts.lazy_ckks_vector_from(encrypted_bytes)
         encrypted_vector.link_context(self.context)
-        decrypted_flat = encrypted_vector.decrypt()
+        # One C-level conversion of the decrypted list, then zero-copy views
+        decrypted_flat = np.asarray(encrypted_vector.decrypt(), dtype=np.float32)
         # Only take the number of elements we need (CKKS may pad)
-        import math
         num_elements = math.prod(shape)
-        decrypted_flat = decrypted_flat[:num_elements]
-        return torch.tensor(decrypted_flat, dtype=torch.float32).reshape(shape)
+        return torch.from_numpy(decrypted_flat[:num_elements]).reshape(shape)
+
+    def _encrypt_vector(self, tensor: torch.Tensor) -> ts.CKKSVector:
+        """Encrypt a tensor as a flat :class:`tenseal.CKKSVector`."""
+        # ckks_vector takes a numpy array directly; no per-element PyObjects
+        flat = tensor.detach().cpu().float().flatten().numpy()
+        return ts.ckks_vector(self.context, flat)
 
     def serialize_context(self) -> bytes:
         """Serialise the TenSEAL context (including secret key).
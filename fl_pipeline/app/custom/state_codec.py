@@ -0,0 +1,111 @@
+"""
+Binary serialization of plaintext state dicts for shareable payloads.
+
+The server broadcasts the aggregated body as one ``torch.save`` byte
+buffer instead of a dict of per-key tensors or numpy arrays. On the
+client, :func:`unpack_state_dict` deserializes straight onto the target
+device, so there is no ndarray -> tensor conversion per key.
+
+Client body updates travel the other way as int8 tensors with one fp32
+scale each (:func:`quantize_state_dict`); the server dequantizes them
+before aggregation.
+"""
+
+from __future__ import annotations
+
+import io
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+import torch
+
+
+# State-dict key under which the packed body travels. It keeps the body
+# prefix so it is routed with the body tensors.
+PACKED_BODY_KEY = "features.__packed__"
+
+
+def pack_state_dict(state_dict: Dict[str, torch.Tensor]) -> bytes:
+    """Serialize *state_dict* into a single byte buffer.
+
+    Tensors that are views of one buffer (as returned by the geometric
+    median aggregator) are written as that buffer once.
+
+    Args:
+        state_dict: Mapping of parameter names to tensors.
+
+    Returns:
+        The ``torch.save`` byte buffer.
+    """
+    buf = io.BytesIO()
+    torch.save(dict(state_dict), buf)
+    return buf.getvalue()
+
+
+def unpack_state_dict(
+    payload: bytes,
+    map_location: Optional[Union[str, torch.device]] = None,
+) -> Dict[str, torch.Tensor]:
+    """Deserialize a buffer produced by :func:`pack_state_dict`.
+
+    The payload is loaded with ``weights_only=True``, so only tensors and
+    plain containers are accepted.
+
+    Args:
+        payload: Bytes from :func:`pack_state_dict`.
+        map_location: Device the tensors are materialised on.
+
+    Returns:
+        The state dict, with tensors on *map_location*.
+    """
+    return torch.load(io.BytesIO(payload), map_location=map_location, weights_only=True)
+
+
+# ----------------------------------------------------------------------
+# int8 quantization of body updates
+# ----------------------------------------------------------------------
+
+# Tensors smaller than this are sent as-is; their fp32 scale and message
+# overhead outweigh the saving.
+QUANT_MIN_NUMEL = 256
+
+
+def quantize_state_dict(
+    state_dict: Dict[str, torch.Tensor],
+    min_numel: int = QUANT_MIN_NUMEL,
+) -> Tuple[OrderedDict, Dict[str, float]]:
+    """Quantize floating-point tensors to int8 with a symmetric per-tensor scale.
+
+    Each tensor with at least *min_numel* elements becomes
+    ``round(t / scale)`` in int8, with ``scale = max|t| / 127``. All
+    scales are gathered to the host in one transfer. Smaller tensors and
+    integer buffers are passed through unchanged.
+
+    Args:
+        state_dict: Mapping of parameter names to tensors.
+        min_numel: Smallest tensor that is quantized.
+
+    Returns:
+        ``(quantized_state_dict, scales)``, where *scales* maps every
+        quantized key to its fp32 scale.
+    """
+    keys = [
+        k for k, t in state_dict.items()
+        if t.is_floating_point() and t.numel() >= min_numel
+    ]
+    if not keys:
+        return OrderedDict(state_dict), {}
+
+    tensors = [state_dict[k].detach() for k in keys]
+    amax = torch.stack([n.float() for n in torch._foreach_norm(tensors, ord=float("inf"))])
+    scales_t = (amax / 127.0).clamp_min_(torch.finfo(torch.float32).tiny)
+
+    quantized = OrderedDict(state_dict)
+    for k, t, scale in zip(keys, tensors, scales_t.unbind()):
+        quantized[k] = torch.round(t / scale).to(torch.int8)
+    return quantized, dict(zip(keys, scales_t.tolist()))
+
+
+def dequantize_tensor(value: Any, scale: float) -> torch.Tensor:
+    """Invert :func:`quantize_state_dict` for one int8 tensor or array."""
+    return torch.as_tensor(value).to(torch.float32).mul_(scale)
@@ -23,7 +23,7 @@ from typing import Any, Dict, Optional
 import numpy as np
 import torch
 import torch.nn as nn
-from sklearn.metrics import roc_auc_score
+from scipy.stats import rankdata
 from torch.utils.data import DataLoader
 
 from nvflare.apis.dxo import DXO, DataKind, MetaKey, from_shareable
@@ -35,7 +35,8 @@ from nvflare.apis.signal import Signal
 
 from .densenet_square import DenseNetSquare
 from .dp_noise import DPNoise
-from .selective_he import SelectiveHE
+from .selective_he import PACKED_HEAD_KEY, SelectiveHE
+from .state_codec import PACKED_BODY_KEY, quantize_state_dict, unpack_state_dict
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +49,33 @@ SITE_NAME_MAP = {
 }
 
 
+def _mean_auc(labels: np.ndarray, preds: np.ndarray) -> float:
+    """Mean ROC AUC over the label columns that contain both classes.
+
+    Uses the Mann-Whitney form ``(R_pos - n_pos (n_pos + 1) / 2) /
+    (n_pos n_neg)`` with tie-averaged ranks, which equals sklearn's
+    ``roc_auc_score`` per column, for all columns in one vectorised pass.
+
+    Args:
+        labels: ``(N, C)`` binary ground-truth matrix.
+        preds: ``(N, C)`` predicted scores.
+
+    Returns:
+        The mean AUC, or ``0.0`` if no column has both classes.
+    """
+    positive = labels == 1
+    n_pos = positive.sum(axis=0)
+    n_neg = labels.shape[0] - n_pos
+    valid = (n_pos > 0) & (n_neg > 0)
+    if not valid.any():
+        return 0.0
+    ranks = rankdata(preds[:, valid], axis=0)
+    n_pos, n_neg = n_pos[valid], n_neg[valid]
+    sum_pos_ranks = (ranks * positive[:, valid]).sum(axis=0)
+    aucs = (sum_pos_ranks - n_pos * (n_pos + 1) / 2.0) / (n_pos * n_neg)
+    return float(aucs.mean())
+
+
 class FedLearnTrainer(Executor):
     """Client-side executor for Privacy-Preserving Federated Learning.
 
@@ -64,6 +92,8 @@ class FedLearnTrainer(Executor):
         batch_size: Mini-batch size for training and validation.
         max_grad_norm: DP gradient clipping norm.
         data_root: Root directory containing local client data.
+        compile_model: Compile the model body with ``torch.compile`` when
+            training on CUDA.
     """
 
     def __init__(
@@ -75,6 +105,7 @@ class FedLearnTrainer(Executor):
         batch_size: int = 32,
         max_grad_norm: float = 1.0,
         data_root: str = "/app/data",
+        compile_model: bool = True,
     ) -> None:
         super().__init__()
 
@@ -86,15 +117,30 @@ class FedLearnTrainer(Executor):
         # Device
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
-        # Model
-        self.model = DenseNetSquare(num_classes=14, pretrained=False)
+        # Model. The body is compiled in place (default mode, no CUDA
+        # graphs, so per-step outputs stay valid across iterations).
+        use_compile = compile_model and self.device.type == "cuda"
+        self.model = DenseNetSquare(
+            num_classes=14,
+            pretrained=False,
+            compile_mode="default" if use_compile else None,
+        )
         self.model.to(self.device)
+        # NHWC lets cuDNN pick tensor-core conv kernels without transposes;
+        # inputs are converted to match in the training/validation loops.
+        self._memory_format = (
+            torch.channels_last if self.device.type == "cuda" else torch.contiguous_format
+        )
+        self.model.to(memory_format=self._memory_format)
+        if self.device.type == "cuda":
+            # Inputs are a fixed 224x224, so autotuned algorithms stay valid
+            torch.backends.cudnn.benchmark = True
 
         # Optimizer and loss
         self.optimizer = torch.optim.SGD(
             self.model.parameters(), lr=lr, momentum=0.9
         )
-        self.criterion = nn.BCELoss()
+        self.criterion = nn.BCEWithLogitsLoss()
 
         # Privacy modules
         self.dp = DPNoise(
@@ -104,6 +150,8 @@ class FedLearnTrainer(Executor):
             max_grad_norm=max_grad_norm,
         )
         self.he = SelectiveHE()
+        # Head shapes never change, so they are registered with self.he once
+        self._shapes_registered = False
 
         # Data loaders (lazy-initialised on first execute call)
         self._train_loader: Optional[DataLoader] = None
@@ -162,30 +210,35 @@ class FedLearnTrainer(Executor):
                 body_weights[k] = v
 
         # -- 2. Load global weights into local model -----------------
-        # Body: always plaintext tensors
-        body_tensors = OrderedDict()
-        for k, v in body_weights.items():
-            if isinstance(v, torch.Tensor):
-                body_tensors[k] = v
-            else:
-                body_tensors[k] = torch.tensor(v, dtype=torch.float32)
+        # Body: always plaintext. The server sends it packed into one byte
+        # buffer that deserializes straight onto self.device; per-key
+        # arrays from older servers are wrapped without a copy instead.
+        packed_body = body_weights.get(PACKED_BODY_KEY)
+        if packed_body is not None:
+            body_tensors = unpack_state_dict(packed_body, map_location=self.device)
+        else:
+            body_tensors = {
+                k: torch.as_tensor(v, dtype=torch.float32) for k, v in body_weights.items()
+            }
 
         # Head: may be encrypted bytes or plain tensors
-        head_tensors = OrderedDict()
+        head_tensors: Dict[str, torch.Tensor] = {}
         head_is_encrypted = False
         for k, v in head_weights_raw.items():
             if isinstance(v, bytes):
                 head_is_encrypted = True
                 break
-            elif isinstance(v, torch.Tensor):
-                head_tensors[k] = v
             else:
-                head_tensors[k] = torch.tensor(v, dtype=torch.float32)
+                head_tensors[k] = torch.as_tensor(v, dtype=torch.float32)
 
         if head_is_encrypted:
             # Register shapes from the current model head before decrypting
-            self.he.register_shapes(self.model.get_head_state_dict())
-            head_tensors = self.he.decrypt_head(head_weights_raw)
+            self._ensure_head_shapes()
+            packed = head_weights_raw.get(PACKED_HEAD_KEY)
+            if packed is not None:
+                head_tensors = self.he.decrypt_head_packed(packed)
+            else:
+                head_tensors = self.he.decrypt_head(head_weights_raw)
 
         # Load into model
         if body_tensors:
@@ -195,6 +248,16 @@ class FedLearnTrainer(Executor):
 
         # -- 3. Local training ---------------------------------------
         self._ensure_data_loaders(fl_ctx)
+        if self._train_loader is None:
+            # Nothing to train on: reply without an update instead of
+            # spending a DP pass and an HE encryption on unchanged weights.
+            logger.warning("No training data; returning an empty update.")
+            return DXO(
+                data_kind=DataKind.WEIGHTS,
+                data={},
+                meta={MetaKey.NUM_STEPS_CURRENT_ROUND: 0, "num_samples": 0},
+            ).to_shareable()
+
         total_loss = 0.0
         num_samples = 0
 
@@ -213,16 +276,31 @@ class FedLearnTrainer(Executor):
         val_loss, val_auc = self._validate(self._val_loader)
 
         # -- 5. Prepare update: DP on body, HE on head ---------------
-        # Compute the *delta* (update - original global) for the body
-        body_update = self.model.get_body_state_dict()
-        body_update_dp = self.dp.apply(body_update)
+        # The head is copied to the host first, so that the only sync it
+        # needs happens before any DP work is queued. DP (clipping and
+        # noise) is then launched asynchronously on self.device and runs
+        # while the CPU encrypts the head. TenSEAL holds the GIL while it
+        # encrypts, so a worker thread would not overlap any better.
+        head_update = OrderedDict(
+            (k, v.cpu()) for k, v in self.model.get_head_state_dict().items()
+        )
+
+        dp_start = time.time()
+        body_update_dp = self.dp.apply(self.model.get_body_state_dict())
+        dp_launch_ms = (time.time() - dp_start) * 1000
 
-        # Encrypt the head
-        head_update = self.model.get_head_state_dict()
+        # Encrypt the head, packed into as few ciphertexts as its size allows
         he_start = time.time()
-        head_encrypted = self.he.encrypt_head(head_update)
+        head_encrypted = {PACKED_HEAD_KEY: self.he.encrypt_head_packed(head_update)}
         he_elapsed_ms = (time.time() - he_start) * 1000
 
+        # int8 quantization (the DP noise dominates its error), then one
+        # copy to the host for packaging; this is where DP is waited on.
+        dp_wait_start = time.time()
+        body_update_q, body_scales = quantize_state_dict(body_update_dp)
+        body_update_dp = OrderedDict((k, v.cpu()) for k, v in body_update_q.items())
+        dp_elapsed_ms = dp_launch_ms + (time.time() - dp_wait_start) * 1000
+
         # -- 6. Package into shareable --------------------------------
         combined_weights: Dict[str, Any] = {}
         combined_weights.update(body_update_dp)
@@ -237,6 +315,8 @@ class FedLearnTrainer(Executor):
                 "local_auc": float(val_auc),
                 "num_samples": num_samples,
                 "encryption_overhead_ms": he_elapsed_ms,
+                "dp_overhead_ms": dp_elapsed_ms,
+                "body_scales": body_scales,
             },
         )
         return out_dxo.to_shareable()
@@ -253,18 +333,21 @@ class FedLearnTrainer(Executor):
         global_weights = dxo.data
 
         # Load all weights (assume plaintext for validation broadcast)
-        model_sd = OrderedDict()
+        model_sd: Dict[str, torch.Tensor] = {}
         for k, v in global_weights.items():
-            if isinstance(v, torch.Tensor):
-                model_sd[k] = v
+            if k == PACKED_BODY_KEY:
+                model_sd.update(unpack_state_dict(v, map_location=self.device))
             elif isinstance(v, bytes):
                 # Encrypted head -- decrypt
-                self.he.register_shapes(self.model.get_head_state_dict())
+                self._ensure_head_shapes()
+                if k == PACKED_HEAD_KEY:
+                    model_sd.update(self.he.decrypt_head_packed(v))
+                    continue
                 shape = self.he.get_shapes().get(k)
                 if shape is not None:
                     model_sd[k] = self.he.decrypt_tensor(v, tuple(shape))
             else:
-                model_sd[k] = torch.tensor(v, dtype=torch.float32)
+                model_sd[k] = torch.as_tensor(v, dtype=torch.float32)
 
         self.model.load_state_dict(model_sd, strict=False)
         self._ensure_data_loaders(fl_ctx)
@@ -289,6 +372,12 @@ class FedLearnTrainer(Executor):
         out_dxo = DXO(data_kind=DataKind.WEIGHTS, data=model_weights)
         return out_dxo.to_shareable()
 
+    def _ensure_head_shapes(self) -> None:
+        """Register the model head's shapes with ``self.he`` on first use."""
+        if not self._shapes_registered:
+            self.he.register_shapes(self.model.get_head_state_dict())
+            self._shapes_registered = True
+
     # ------------------------------------------------------------------
     # Training / validation loops
     # ------------------------------------------------------------------
@@ -308,7 +397,9 @@ class FedLearnTrainer(Executor):
             Tuple of (total_loss, num_samples).
         """
         self.model.train()
-        running_loss = 0.0
+        # Accumulated on the device and read back once per epoch, so the
+        # loop never blocks on a per-batch .item()
+        loss_accum = torch.zeros((), device=self.device)
         total_samples = 0
 
         if dataloader is None:
@@ -319,20 +410,20 @@ class FedLearnTrainer(Executor):
             if abort_signal.triggered:
                 break
 
-            images = images.to(self.device)
+            images = images.to(self.device, memory_format=self._memory_format)
             labels = labels.to(self.device).float()
 
             self.optimizer.zero_grad()
-            outputs = self.model(images)
+            outputs = self.model.logits(images)
             loss = self.criterion(outputs, labels)
             loss.backward()
             self.optimizer.step()
 
             batch_size = images.size(0)
-            running_loss += loss.item() * batch_size
+            loss_accum += loss.detach() * batch_size
             total_samples += batch_size
 
-        return running_loss, total_samples
+        return loss_accum.item(), total_samples
 
     def _validate(
         self, dataloader: Optional[DataLoader]
@@ -352,37 +443,40 @@ class FedLearnTrainer(Executor):
             logger.warning("No validation dataloader available.")
             return 0.0, 0.0
 
-        all_preds = []
-        all_labels = []
-        running_loss = 0.0
+        # Predictions stay on the device in one preallocated buffer and
+        # are copied to the host once; labels are kept from the host batch.
+        capacity = len(dataloader.dataset)
+        num_classes = self.model.num_classes
+        preds_buf = torch.empty((capacity, num_classes), device=self.device)
+        labels_buf = torch.empty((capacity, num_classes))
+        loss_accum = torch.zeros((), device=self.device)
         total_samples = 0
 
-        with torch.no_grad():
+        with torch.inference_mode():
             for images, labels in dataloader:
-                images = images.to(self.device)
-                labels = labels.to(self.device).float()
+                batch_size = images.size(0)
+                end = total_samples + batch_size
+                labels_buf[total_samples:end] = labels
 
-                outputs = self.model(images)
-                loss = self.criterion(outputs, labels)
+                images = images.to(
+                    self.device, non_blocking=True, memory_format=self._memory_format
+                )
+                labels = labels.to(self.device, non_blocking=True).float()
 
-                batch_size = images.size(0)
-                running_loss += loss.item() * batch_size
-                total_samples += batch_size
+                outputs = self.model.logits(images)
+                loss = self.criterion(outputs, labels)
 
-                all_preds.append(outputs.cpu().numpy())
-                all_labels.append(labels.cpu().numpy())
+                loss_accum += loss * batch_size
+                preds_buf[total_samples:end] = torch.sigmoid(outputs)
+                total_samples = end
 
-        avg_loss = running_loss / max(total_samples, 1)
+        avg_loss = loss_accum.item() / max(total_samples, 1)
 
         # Compute mean AUC across all 14 pathology columns
         try:
-            preds = np.concatenate(all_preds, axis=0)
-            labels = np.concatenate(all_labels, axis=0)
-            aucs = []
-            for col in range(labels.shape[1]):
-                if len(np.unique(labels[:, col])) > 1:
-                    aucs.append(roc_auc_score(labels[:, col], preds[:, col]))
-            mean_auc = float(np.mean(aucs)) if aucs else 0.0
+            preds = preds_buf[:total_samples].cpu().numpy()
+            labels = labels_buf[:total_samples].numpy()
+            mean_auc = _mean_auc(labels, preds)
         except Exception:
             mean_auc = 0.0
 
@@ -419,8 +513,18 @@ class FedLearnTrainer(Executor):
         try:
             from data.data_splitter import ChestXrayDataset
             from torchvision import transforms
-            num_workers = int(os.getenv("DATALOADER_NUM_WORKERS", "0"))
-            pin_memory = torch.cuda.is_available()
+            # Decode/resize in background workers so batches are ready
+            # before the GPU asks for them; workers outlive each epoch.
+            num_workers = int(
+                os.getenv("DATALOADER_NUM_WORKERS", str(min(8, os.cpu_count() or 1)))
+            )
+            loader_kwargs: Dict[str, Any] = {
+                "batch_size": self.batch_size,
+                "num_workers": num_workers,
+                "pin_memory": torch.cuda.is_available(),
+            }
+            if num_workers > 0:
+                loader_kwargs.update(persistent_workers=True, prefetch_factor=4)
 
             transform = transforms.Compose([
                 transforms.Resize((224, 224)),
@@ -441,13 +545,7 @@ class FedLearnTrainer(Executor):
                     image_dir=image_dir,
                     transform=transform,
                 )
-                self._train_loader = DataLoader(
-                    train_ds,
-                    batch_size=self.batch_size,
-                    shuffle=True,
-                    num_workers=num_workers,
-                    pin_memory=pin_memory,
-                )
+                self._train_loader = DataLoader(train_ds, shuffle=True, **loader_kwargs)
 
             if os.path.exists(val_csv) and os.path.isdir(image_dir):
                 val_ds = ChestXrayDataset(
@@ -455,13 +553,7 @@ class FedLearnTrainer(Executor):
                     image_dir=image_dir,
                     transform=transform,
                 )
-                self._val_loader = DataLoader(
-                    val_ds,
-                    batch_size=self.batch_size,
-                    shuffle=False,
-                    num_workers=num_workers,
-                    pin_memory=pin_memory,
-                )
+                self._val_loader = DataLoader(val_ds, shuffle=False, **loader_kwargs)
 
             logger.info(
                 f"Loaded data for client '{client_name}': "
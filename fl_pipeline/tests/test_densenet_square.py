@@ -42,6 +42,23 @@ class TestSquareActivation:
         torch.testing.assert_close(x.grad, expected_grad)
 
 
+    def test_square_activation_inplace_without_grad(self):
+        """The in-place variant squares its input buffer when no grad is recorded."""
+        act = SquareActivation(inplace=True)
+        x = torch.tensor([-2.0, 3.0])
+        with torch.no_grad():
+            y = act(x)
+        assert y.data_ptr() == x.data_ptr()
+        torch.testing.assert_close(x, torch.tensor([4.0, 9.0]))
+
+    def test_square_activation_inplace_keeps_autograd(self):
+        """With autograd recording, the in-place variant falls back to x * x."""
+        act = SquareActivation(inplace=True)
+        x = torch.tensor([-2.0, 3.0], requires_grad=True)
+        act(x).sum().backward()
+        torch.testing.assert_close(x.grad, torch.tensor([-4.0, 6.0]))
+
+
 class TestDenseNetSquareModel:
     """Integration tests for the full DenseNetSquare model."""
 
@@ -65,6 +82,17 @@ class TestDenseNetSquareModel:
         assert (out >= 0.0).all(), "Found output values < 0"
         assert (out <= 1.0).all(), "Found output values > 1"
 
+    def test_logits_match_forward(self, model):
+        """forward() is the sigmoid of logits(), which the trainer feeds to
+        BCEWithLogitsLoss.
+        """
+        x = 0.01 * torch.randn(2, 3, 224, 224)
+        with torch.no_grad():
+            logits = model.logits(x)
+            probs = model(x)
+        assert logits.shape == (2, 14)
+        assert torch.allclose(torch.sigmoid(logits), probs)
+
     def test_head_body_split(self, model):
         """get_head_params() and get_body_params() should together cover
         every parameter in the model (no missing, no duplicates).
@@ -92,3 +120,10 @@ class TestDenseNetSquareModel:
         # No overlap between head and body
         overlap = body_names & head_names
         assert len(overlap) == 0, f"Overlapping params: {overlap}"
+
+    def test_head_is_padded(self, model):
+        """The head weight is padded to 16 rows whose extra rows start at zero."""
+        head = model.get_head_state_dict()
+        assert head["classifier.weight"].shape == (16, 1024)
+        assert head["classifier.bias"].shape == (16,)
+        assert not head["classifier.weight"][14:].any()
@@ -0,0 +1,78 @@
+"""
+Tests for the Gaussian-mechanism DP noise.
+
+Covers:
+- Per-tensor clipping to ``max_grad_norm``.
+- Integer buffers are passed through unchanged.
+- Floating-point tensors keep their dtype.
+- ``apply`` never mutates its input.
+- The injected noise has standard deviation ``sigma``.
+"""
+
+import torch
+
+from fl_pipeline.app.custom.dp_noise import DPNoise
+
+
+class TestClipGradients:
+    def test_norm_bounded(self):
+        torch.manual_seed(0)
+        dp = DPNoise(max_grad_norm=1.0)
+        sd = {
+            "big.weight": 10.0 * torch.randn(32, 16),
+            "small.bias": torch.full((4,), 0.01),
+        }
+        clipped = dp.clip_gradients(sd)
+
+        for t in clipped.values():
+            assert t.norm().item() <= dp.max_grad_norm + 1e-5
+        # Tensors already within the bound are left as they were.
+        torch.testing.assert_close(clipped["small.bias"], sd["small.bias"])
+
+
+class TestIntegerPassthrough:
+    def test_same_object(self):
+        dp = DPNoise()
+        count = torch.tensor(42)
+        sd = {"bn.weight": torch.randn(8), "bn.num_batches_tracked": count}
+
+        for method in (dp.clip_gradients, dp.add_noise, dp.apply):
+            assert method(sd)["bn.num_batches_tracked"] is count
+
+
+class TestDtypePreserved:
+    def test_fp16(self):
+        dp = DPNoise()
+        sd = {"w": torch.randn(64, dtype=torch.float16), "b": torch.randn(4)}
+
+        for method in (dp.clip_gradients, dp.add_noise, dp.apply):
+            out = method(sd)
+            assert out["w"].dtype == torch.float16
+            assert out["b"].dtype == torch.float32
+
+
+class TestApplyDoesNotMutate:
+    def test_input_unchanged(self):
+        torch.manual_seed(0)
+        dp = DPNoise(max_grad_norm=0.5)
+        sd = {"w": 5.0 * torch.randn(16, 16), "b": torch.randn(16)}
+        before = {k: t.clone() for k, t in sd.items()}
+
+        out = dp.apply(sd)
+
+        for k in sd:
+            assert torch.equal(sd[k], before[k])
+            assert out[k].data_ptr() != sd[k].data_ptr()
+
+
+class TestNoiseScale:
+    """Noise added to zeros is N(0, sigma^2); its sample std should be
+    within a few percent of sigma for a large tensor.
+    """
+
+    def test_std_matches_sigma(self):
+        dp = DPNoise(epsilon=2.0, delta=1e-5)
+        noised = dp.add_noise({"w": torch.zeros(200_000)})["w"]
+
+        assert abs(noised.mean().item()) < 0.05 * dp.sigma
+        assert abs(noised.std().item() - dp.sigma) < 0.02 * dp.sigma
@@ -6,6 +6,7 @@ Covers:
 - Byzantine outlier resilience.
 - Degenerate case where all points are identical.
 - Aggregation of state-dict-style tensors (layer weights/biases).
+- Packed broadcast of the aggregated state dict.
 """
 
 import numpy as np
@@ -13,6 +14,7 @@ import pytest
 import torch
 
 from fl_pipeline.app.custom.geometric_median import GeometricMedianAggregator
+from fl_pipeline.app.custom.state_codec import pack_state_dict, unpack_state_dict
 
 
 class TestWeiszfeldKnownMedian:
@@ -121,3 +123,42 @@ class TestStateDictAggregation:
         for d in distances:
             assert d >= 0.0
             assert np.isfinite(d)
+
+
+class TestWarmStart:
+    """A second aggregation over the same layout starts from the previous
+    median and should land on the same point as a cold start.
+    """
+
+    def test_warm_start_matches_cold_start(self):
+        torch.manual_seed(0)
+        round1 = [{"w": torch.randn(32)} for _ in range(5)]
+        round2 = [{"w": sd["w"] + 0.01 * torch.randn(32)} for sd in round1]
+
+        warm = GeometricMedianAggregator(max_iter=500, eps=1e-7)
+        warm.aggregate(round1)
+        warm_result = warm.aggregate(round2)
+
+        cold_result = GeometricMedianAggregator(max_iter=500, eps=1e-7).aggregate(round2)
+        np.testing.assert_allclose(
+            warm_result["w"].numpy(), cold_result["w"].numpy(), atol=1e-4
+        )
+
+
+class TestPackedBroadcast:
+    """The aggregated body is broadcast as one packed buffer; its tensors
+    share a single storage and must round-trip unchanged.
+    """
+
+    def test_pack_round_trip(self):
+        torch.manual_seed(0)
+        updates = [
+            {"layer.weight": torch.randn(4, 3), "layer.bias": torch.randn(4)}
+            for _ in range(3)
+        ]
+        result = GeometricMedianAggregator().aggregate(updates)
+
+        restored = unpack_state_dict(pack_state_dict(result), map_location="cpu")
+        assert list(restored.keys()) == list(result.keys())
+        for k in result:
+            assert torch.equal(restored[k], result[k])
@@ -5,6 +5,8 @@ Covers:
 - Encrypt-decrypt round-trip fidelity (within CKKS approximation error).
 - Encrypted ciphertext is not trivially decodable as plain floats.
 - Multi-tensor encrypt/decrypt simulating a head state dict.
+- Packed single-ciphertext encryption of a whole head.
+- In-memory aggregation of encrypted heads.
 
 Note: CKKS is an *approximate* HE scheme.  Decrypted values will not
 be bitwise identical to the originals -- we use atol=0.1 (or 0.5 for
@@ -96,3 +98,50 @@ class TestMultipleTensors:
             torch.testing.assert_close(
                 decrypted[key], head_state_dict[key], atol=0.5, rtol=0.0
             )
+
+
+class TestPackedHead:
+    """The whole head packed into one ciphertext should decrypt back into
+    the original tensors.
+    """
+
+    def test_packed_roundtrip(self):
+        he = SelectiveHE()
+
+        head_state_dict = {
+            "classifier.weight": torch.randn(16, 1024),
+            "classifier.bias": torch.randn(16),
+        }
+
+        encrypted = he.encrypt_head_packed(head_state_dict)
+        assert isinstance(encrypted, bytes)
+
+        # A receiver that only knows the model layout can unpack it
+        receiver = SelectiveHE(context=he.context)
+        receiver.register_shapes(head_state_dict)
+        decrypted = receiver.decrypt_head_packed(encrypted)
+
+        assert list(decrypted) == list(head_state_dict)
+        for key, original in head_state_dict.items():
+            torch.testing.assert_close(decrypted[key], original, atol=0.5, rtol=0.0)
+
+
+class TestEncryptedAggregation:
+    """Averaging in-memory encrypted heads should decrypt to the plaintext
+    average.
+    """
+
+    def test_aggregate_encrypted(self):
+        he = SelectiveHE()
+
+        heads = [
+            {"classifier.bias": torch.randn(16)},
+            {"classifier.bias": torch.randn(16)},
+        ]
+        aggregated = he.aggregate_encrypted([he.encrypt_head_inmem(h) for h in heads])
+
+        decrypted = he.decrypt_head(he.serialize_head(aggregated))
+        expected = (heads[0]["classifier.bias"] + heads[1]["classifier.bias"]) / 2
+        torch.testing.assert_close(
+            decrypted["classifier.bias"], expected, atol=0.1, rtol=0.0
+        )
@@ -0,0 +1,40 @@
+"""
+Tests for int8 quantization of body updates.
+
+Covers:
+- Round-trip error bounded by half a quantization step.
+- Small tensors and integer buffers are passed through unchanged.
+"""
+
+import torch
+
+from fl_pipeline.app.custom.state_codec import (
+    QUANT_MIN_NUMEL,
+    dequantize_tensor,
+    quantize_state_dict,
+)
+
+
+class TestQuantization:
+    def test_round_trip_error(self):
+        torch.manual_seed(0)
+        sd = {"conv.weight": 3.0 * torch.randn(64, 3, 3, 3)}
+        quantized, scales = quantize_state_dict(sd)
+
+        assert quantized["conv.weight"].dtype == torch.int8
+        restored = dequantize_tensor(quantized["conv.weight"].numpy(), scales["conv.weight"])
+        max_err = (restored - sd["conv.weight"]).abs().max().item()
+        assert max_err <= 0.5 * scales["conv.weight"] + 1e-6
+
+    def test_passthrough(self):
+        small = torch.randn(QUANT_MIN_NUMEL - 1)
+        count = torch.tensor(7)
+        zeros = torch.zeros(QUANT_MIN_NUMEL)
+        quantized, scales = quantize_state_dict(
+            {"bn.bias": small, "bn.num_batches_tracked": count, "z": zeros}
+        )
+
+        assert set(scales) == {"z"}
+        assert quantized["bn.bias"] is small
+        assert quantized["bn.num_batches_tracked"] is count
+        assert torch.equal(dequantize_tensor(quantized["z"], scales["z"]), zeros)